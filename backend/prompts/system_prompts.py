@@ -8,6 +8,9 @@ from src.utils.document_summarizer import summarize_document
 
 logger = logging.getLogger(__name__)
 
+# Bump when prompt wording changes so cached LLM responses for the old prompts are not reused
+PROMPT_VERSION = 1
+
 # Readability Guidelines - Applied to all prompts
 READABILITY_GUIDELINES = """
 Writing Requirements for Readability:
@@ -918,12 +921,33 @@ IMPORTANT OUTPUT FORMAT:
 Now, analyze the following project information and generate the work breakdown structure:"""
 
 
+def get_wbs_system_prompt() -> str:
+    """Get the static WBS instructions (identical for every project, so providers can cache them as a prompt prefix)"""
+    return apply_readability_guidelines(WBS_PROMPT)
+
+
 def get_wbs_prompt(
     requirements_summary: dict,
     project_charter_summary: Optional[str] = None,
     pm_summary: Optional[str] = None
 ) -> str:
     """Get full WBS prompt with requirements, project charter, and PM plan summaries"""
+    return f"""{get_wbs_system_prompt()}
+
+{get_wbs_context_prompt(requirements_summary, project_charter_summary, pm_summary)}"""
+
+
+def get_wbs_context_prompt(
+    requirements_summary: dict,
+    project_charter_summary: Optional[str] = None,
+    pm_summary: Optional[str] = None
+) -> str:
+    """
+    Get the per-project part of the WBS prompt
+    
+    The requirements context (largest and shared with the charter and PM plan
+    prompts) comes first; the project charter and PM plan summaries come last.
+    """
     # Get comprehensive requirements context
     user_idea = requirements_summary.get("user_idea", "")
     project_overview = requirements_summary.get("project_overview", "")
@@ -995,10 +1019,7 @@ def get_wbs_prompt(
 {pm_processed}
 """
     
-    wbs_prompt = apply_readability_guidelines(WBS_PROMPT)
-    return f"""{wbs_prompt}
-
-=== REQUIREMENTS CONTEXT ===
+    return f"""=== REQUIREMENTS CONTEXT ===
 {context_text}
 
 CRITICAL: Use BOTH the original project idea and requirements context AND the Project Charter and PM Plan to create a comprehensive work breakdown structure. Base work packages and tasks on the core features from requirements, and align phases, milestones, and timelines with the Project Charter and PM Plan.
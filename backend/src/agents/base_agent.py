@@ -3,27 +3,71 @@ Base Agent Class
 All documentation agents should inherit from this base class
 """
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, ClassVar, Dict, Hashable, Iterator, List, Optional, Tuple
+import atexit
+import functools
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from dotenv import load_dotenv
 
-from src.rate_limit.queue_manager import RequestQueue
+from src.rate_limit.queue_manager import RequestQueue, TokenBucket, get_provider_semaphore, get_token_bucket
 from src.rate_limit.async_queue_manager import AsyncRequestQueue
 from src.utils.template_engine import get_template_engine
 from src.llm.base_provider import BaseLLMProvider
 from src.llm.provider_factory import ProviderFactory
 from src.utils.logger import get_logger
+from src.context.shared_context import AgentOutput, AgentType, DocumentStatus
 from src.config.settings import get_settings
 from src.utils.error_handler import retry_with_backoff
+from src.utils.llm_cache import cache_disabled, get_llm_cache, make_cache_key
+from prompts.system_prompts import PROMPT_VERSION
 import requests
 import asyncio
 
 logger = get_logger(__name__)
 
+_now = datetime.now
+
+# Transient LLM failures (network errors, 5xx, rate limits) are retried with capped,
+# jittered exponential backoff; rate-limited calls also shrink the shared token bucket
+LLM_MAX_ATTEMPTS = 5
+LLM_MAX_RETRY_DELAY = 30.0
+
+# Small dedicated pool for agent disk/database I/O, kept apart from the default
+# executor that blocking LLM calls and other asyncio code use (AGENT_IO_WORKERS)
+_AGENT_IO_POOL = ThreadPoolExecutor(
+    max_workers=get_settings().agent_io_workers, thread_name_prefix="agent-io"
+)
+atexit.register(_AGENT_IO_POOL.shutdown)
+
+
+async def run_agent_io(func, *args, **kwargs):
+    """
+    Run blocking agent I/O (file writes, context saves) on the shared agent I/O pool
+    
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+        
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    if kwargs:
+        func = functools.partial(func, **kwargs)
+    return await loop.run_in_executor(_AGENT_IO_POOL, func, *args)
+
 
 class BaseAgent(ABC):
     """Base class for all documentation generation agents"""
     
+    # In-flight coalesced calls by (event loop, key), shared by all agents
+    _inflight_llm_calls: ClassVar[Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future]] = {}
+    
     def __init__(
         self,
         llm_provider: Optional[BaseLLMProvider] = None,
@@ -112,6 +156,16 @@ class BaseAgent(ABC):
         else:
             self.default_temperature = settings.default_temperature
         
+        # Requests in flight to this provider at once (shared by all its agents)
+        if self.provider_name == "ollama":
+            self.max_concurrent_requests = settings.ollama_max_concurrent
+        elif self.provider_name == "gemini":
+            self.max_concurrent_requests = settings.gemini_max_concurrent
+        elif self.provider_name == "openai":
+            self.max_concurrent_requests = settings.openai_max_concurrent
+        else:
+            self.max_concurrent_requests = settings.max_concurrent_agents
+        
         logger.debug(f"{self.agent_name} initialized with provider: {self.provider_name}, model: {self.model_name}, temperature: {self.default_temperature}")
     
     def _get_async_rate_limiter(self) -> AsyncRequestQueue:
@@ -126,7 +180,7 @@ class BaseAgent(ABC):
         return self._async_rate_limiter
     
     @retry_with_backoff(
-        max_retries=3,
+        max_retries=LLM_MAX_ATTEMPTS,
         initial_delay=2.0,
         backoff_factor=2.0,
         exceptions=(
@@ -134,7 +188,9 @@ class BaseAgent(ABC):
             TimeoutError,
             requests.exceptions.RequestException,  # Catches all requests exceptions (Timeout, ConnectionError, etc.)
             RuntimeError,  # For provider-level transient errors (e.g., "rate limit", "temporary failure")
-        )
+        ),
+        max_delay=LLM_MAX_RETRY_DELAY,
+        jitter=True
     )
     def _call_llm(
         self,
@@ -176,12 +232,7 @@ class BaseAgent(ABC):
             temperature = self.default_temperature
         
         # Get model for phase if phase_number is provided and model not explicitly set
-        if model is None and phase_number is not None:
-            from src.utils.phase_model_config import get_model_for_phase
-            phase_model = get_model_for_phase(phase_number, self.provider_name)
-            if phase_model:
-                model = phase_model
-                logger.debug(f"{self.agent_name} using phase {phase_number} model: {model}")
+        model = self._resolve_model(model, phase_number)
         
         # Set default max_tokens for document generation if not provided
         # Gemini 2.0 Flash supports up to 8192 output tokens (maximum allowed)
@@ -209,6 +260,11 @@ class BaseAgent(ABC):
                 **kwargs
             )
         
+        # Wait for RPM/TPM capacity before sending instead of backing off after a 429
+        bucket = get_token_bucket(self.provider_name, model_to_use)
+        if bucket is not None:
+            bucket.acquire(estimated_tokens=len(prompt) // 4)
+        
         try:
             # Pass prompt as argument so it's included in cache key generation
             # Rate limiter will handle rate limiting, retry decorator will handle transient errors
@@ -222,11 +278,367 @@ class BaseAgent(ABC):
             # These exceptions are raised BEFORE the retry decorator can handle them
             logger.error(f"{self.agent_name} LLM call failed with validation error (not retried): {str(e)}", exc_info=True)
             raise
+        except Exception as e:
+            self._penalize_rate_limit(bucket, e)
+            raise
         # All other exceptions (ConnectionError, TimeoutError, RuntimeError, requests exceptions)
         # will be caught by the @retry_with_backoff decorator and retried with exponential backoff
+
+    def _resolve_model(self, model: Optional[str] = None, phase_number: Optional[int] = None) -> Optional[str]:
+        """
+        Resolve the model override a call uses (the cache key uses the same one)
+        
+        Args:
+            model: Explicit model override
+            phase_number: Phase whose configured model applies when no override is
+                given (falls back to the agent's _current_phase_number, if set)
+        
+        Returns:
+            Model name, or None to use the provider default
+        """
+        if model is not None:
+            return model
+        phase_to_use = phase_number
+        if phase_to_use is None:
+            phase_to_use = getattr(self, "_current_phase_number", None)
+        if phase_to_use is None:
+            return None
+        from src.utils.phase_model_config import get_model_for_phase
+        phase_model = get_model_for_phase(phase_to_use, self.provider_name)
+        if phase_model:
+            logger.debug("%s using phase %s model: %s", self.agent_name, phase_to_use, phase_model)
+        return phase_model or None
+
+    def _llm_cache_key(self, prompt: str, **kwargs) -> str:
+        """Exact-match response cache key for a prompt and the _call_llm kwargs that shape the output"""
+        # Resolve unset sampling settings to the defaults _call_llm would use
+        temperature = kwargs.get("temperature")
+        max_tokens = kwargs.get("max_tokens")
+        return make_cache_key(
+            prompt,
+            self._resolve_model(kwargs.get("model"), kwargs.get("phase_number")) or self.model_name,
+            self.provider_name,
+            system_prompt=kwargs.get("system_prompt"),
+            prompt_version=PROMPT_VERSION,
+            temperature=self.default_temperature if temperature is None else temperature,
+            max_tokens=8192 if max_tokens is None else max_tokens,
+        )
+
+    def _llm_cache_lookup(self, prompt: str, bypass_cache: bool = False, **kwargs) -> Optional[str]:
+        """
+        Look up a cached response without calling the LLM
+
+        Args:
+            prompt: Input prompt
+            bypass_cache: Skip the lookup (always a miss)
+            **kwargs: The kwargs the LLM would be called with
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        if bypass_cache or cache_disabled():
+            return None
+        cached = get_llm_cache().get(self._llm_cache_key(prompt, **kwargs))
+        if cached is not None:
+            # Same chars-per-token estimate the token buckets use
+            logger.info(
+                "%s LLM cache hit (prompt length: %d chars, ~%d tokens saved)",
+                self.agent_name, len(prompt), (len(prompt) + len(cached)) // 4
+            )
+        return cached
+
+    def _llm_cache_store(self, prompt: str, response: str, **kwargs) -> None:
+        if response:
+            get_llm_cache().set(
+                self._llm_cache_key(prompt, **kwargs), response,
+                model=self._resolve_model(kwargs.get("model"), kwargs.get("phase_number")) or self.model_name
+            )
+
+    def _call_llm_cached(self, prompt: str, bypass_cache: bool = False, **kwargs) -> str:
+        """
+        Call LLM through the persistent exact-match response cache
+
+        Identical prompts for the same provider/model (and prompt version) are
+        answered from the cache without a network round trip. The cache is skipped
+        when bypass_cache is True or AUTO_REPO_NO_CACHE=1 is set (the fresh response
+        is still stored).
+
+        Args:
+            prompt: Input prompt
+            bypass_cache: Force a fresh LLM call
+            **kwargs: Passed through to _call_llm
+
+        Returns:
+            Model response text
+        """
+        cached = self._llm_cache_lookup(prompt, bypass_cache, **kwargs)
+        if cached is not None:
+            return cached
+
+        response = self._call_llm(prompt, **kwargs)
+        self._llm_cache_store(prompt, response, **kwargs)
+        return response
+
+    def _stream_llm(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Call LLM with rate limiting, yielding response chunks as they arrive
+        
+        Streaming responses are not retried or cleaned (chunks are already consumed
+        by the caller); use _call_llm when the full response is needed up front.
+        
+        Args:
+            prompt: Input prompt
+            temperature: Sampling temperature (uses agent default from settings if None)
+            max_tokens: Maximum tokens to generate (8192 if None)
+            **kwargs: Provider-specific parameters
+            
+        Yields:
+            Response text chunks
+        """
+        if temperature is None:
+            temperature = self.default_temperature
+        if max_tokens is None:
+            max_tokens = 8192
+        
+        bucket = get_token_bucket(self.provider_name, self.model_name)
+        if bucket is not None:
+            bucket.acquire(estimated_tokens=len(prompt) // 4)
+        self.rate_limiter.acquire()
+        
+        logger.info(
+            "%s streaming LLM response (model: %s, prompt length: %d chars)",
+            self.agent_name, self.model_name, len(prompt)
+        )
+        try:
+            yield from self.llm_provider.generate_stream(
+                prompt=prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        except Exception as e:
+            self._penalize_rate_limit(bucket, e)
+            raise
     
+    async def _async_stream_llm(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Call LLM with rate limiting, yielding response chunks as they arrive (async version)
+        
+        The blocking provider stream is consumed on a worker thread and handed
+        over chunk by chunk, so the event loop is free while tokens arrive. If
+        the consumer stops early (or is cancelled), the worker is told to stop
+        and is not waited for.
+        
+        Args:
+            prompt: Input prompt
+            temperature: Sampling temperature (uses agent default from settings if None)
+            max_tokens: Maximum tokens to generate (8192 if None)
+            **kwargs: Provider-specific parameters
+            
+        Yields:
+            Response text chunks
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+        
+        def hand_over(item) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:  # The loop has closed; nobody is listening
+                stop.set()
+        
+        def produce():
+            try:
+                for chunk in self._stream_llm(prompt, temperature, max_tokens, **kwargs):
+                    if stop.is_set():
+                        break  # Closing the generator closes the provider stream
+                    hand_over(chunk)
+            except Exception as e:
+                hand_over(e)
+            finally:
+                hand_over(done)
+        
+        producer = asyncio.ensure_future(asyncio.to_thread(produce))
+        finished = False
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    finished = True
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if finished:
+                await producer
+            else:
+                stop.set()
+                # The worker stops at its next chunk; retrieve its outcome without waiting
+                producer.add_done_callback(lambda future: future.cancelled() or future.exception())
+    
+    def _batch_call_llm(
+        self,
+        prompts: List[str],
+        bypass_cache: bool = False,
+        poll_interval: float = 30.0,
+        prompt_kwargs: Optional[List[Dict[str, Any]]] = None
+    ) -> List[str]:
+        """
+        Generate responses for many prompts, using the provider's batch endpoint when available
+
+        Prompts already in the response cache are not sent. Providers without batch
+        support (and items a batch failed to answer) fall back to per-prompt calls.
+        Prompts with different settings (system prompt, temperature, max_tokens)
+        are submitted as separate batches.
+
+        Args:
+            prompts: Input prompts
+            bypass_cache: Force fresh LLM calls
+            poll_interval: Seconds between batch status checks
+            prompt_kwargs: Per-prompt LLM kwargs, as _call_llm_cached takes them
+
+        Returns:
+            Responses in prompt order
+        """
+        prompt_kwargs = prompt_kwargs or [{} for _ in prompts]
+        cache = get_llm_cache()
+        use_cache = not bypass_cache and not cache_disabled()
+        keys = [self._llm_cache_key(prompt, **kwargs) for prompt, kwargs in zip(prompts, prompt_kwargs)]
+        results: List[Optional[str]] = [cache.get(key) if use_cache else None for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        logger.info("%s batch: %d cached, %d to generate", self.agent_name, len(prompts) - len(pending), len(pending))
+
+        if pending and self.llm_provider.supports_batch():
+            groups: Dict[Tuple[Optional[str], float, int], List[int]] = {}
+            for i in pending:
+                kwargs = prompt_kwargs[i]
+                temperature = kwargs.get("temperature")
+                max_tokens = kwargs.get("max_tokens")
+                settings = (
+                    kwargs.get("system_prompt"),
+                    self.default_temperature if temperature is None else temperature,
+                    8192 if max_tokens is None else max_tokens,
+                )
+                groups.setdefault(settings, []).append(i)
+            for (system_prompt, temperature, max_tokens), indices in groups.items():
+                batch_id = self.llm_provider.submit_batch(
+                    [prompts[i] for i in indices],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    system_prompt=system_prompt
+                )
+                logger.info("%s submitted batch %s (%d prompts)", self.agent_name, batch_id, len(indices))
+                responses = self.llm_provider.poll_batch(batch_id, len(indices))
+                while responses is None:
+                    time.sleep(poll_interval)
+                    responses = self.llm_provider.poll_batch(batch_id, len(indices))
+                for i, response in zip(indices, responses):
+                    if response:
+                        results[i] = self._clean_llm_response(response)
+                        cache.set(keys[i], results[i], model=self.model_name)
+
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = self._call_llm_cached(prompts[i], bypass_cache=bypass_cache, **prompt_kwargs[i])
+        return results
+
+    async def _async_call_llm_cached(self, prompt: str, bypass_cache: bool = False, **kwargs) -> str:
+        """
+        Call LLM through the persistent response cache (async version of _call_llm_cached)
+
+        The cache lookup and store run on the agent I/O pool. Concurrent calls
+        with the same prompt and settings share a single LLM request.
+
+        Args:
+            prompt: Input prompt
+            bypass_cache: Force a fresh LLM call
+            **kwargs: Passed through to _async_call_llm
+
+        Returns:
+            Model response text
+        """
+        cached = await run_agent_io(self._llm_cache_lookup, prompt, bypass_cache, **kwargs)
+        if cached is not None:
+            return cached
+
+        if bypass_cache:
+            response = await self._async_call_llm(prompt, **kwargs)
+            await run_agent_io(self._llm_cache_store, prompt, response, **kwargs)
+            return response
+
+        async def call_and_store() -> str:
+            response = await self._async_call_llm(prompt, **kwargs)
+            await run_agent_io(self._llm_cache_store, prompt, response, **kwargs)
+            return response
+
+        # An identical request already in flight (e.g. the same review for two
+        # documents) is awaited instead of sent again
+        return await self._coalesce_inflight(self._llm_cache_key(prompt, **kwargs), call_and_store)
+
+    async def _coalesce_inflight(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run call() once for concurrent callers sharing key on the running event loop
+
+        The first caller (the leader) runs call(); the others await its result or
+        exception. If the leader is cancelled, a waiting caller takes over as the
+        new leader instead of seeing the leader's CancelledError.
+
+        Args:
+            key: Identifies identical requests
+            call: Coroutine function producing the result
+
+        Returns:
+            The result of call(), possibly run by another caller
+        """
+        loop = asyncio.get_running_loop()
+        inflight_key = (loop, key)
+        while True:
+            leader = self._inflight_llm_calls.get(inflight_key)
+            if leader is None:
+                break
+            logger.info("%s waiting for an identical in-flight call", self.agent_name)
+            try:
+                return await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not leader.cancelled() or (task is not None and task.cancelling()):
+                    raise  # This caller was cancelled, not the leader
+                logger.info("%s in-flight call was cancelled, retrying it", self.agent_name)
+
+        future: asyncio.Future = loop.create_future()
+        self._inflight_llm_calls[inflight_key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # Retrieved here, so waiters are optional
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._inflight_llm_calls.pop(inflight_key, None)
+        return result
+
     @retry_with_backoff(
-        max_retries=3,
+        max_retries=LLM_MAX_ATTEMPTS,
         initial_delay=2.0,
         backoff_factor=2.0,
         exceptions=(
@@ -234,7 +646,9 @@ class BaseAgent(ABC):
             TimeoutError,
             requests.exceptions.RequestException,
             RuntimeError,
-        )
+        ),
+        max_delay=LLM_MAX_RETRY_DELAY,
+        jitter=True
     )
     async def _async_call_llm(
         self,
@@ -276,18 +690,7 @@ class BaseAgent(ABC):
             temperature = self.default_temperature
         
         # Get model for phase if phase_number is provided and model not explicitly set
-        # Also check agent instance for _current_phase_number attribute
-        if model is None:
-            phase_to_use = phase_number
-            if phase_to_use is None and hasattr(self, '_current_phase_number'):
-                phase_to_use = self._current_phase_number
-            
-            if phase_to_use is not None:
-                from src.utils.phase_model_config import get_model_for_phase
-                phase_model = get_model_for_phase(phase_to_use, self.provider_name)
-                if phase_model:
-                    model = phase_model
-                    logger.debug(f"{self.agent_name} using phase {phase_to_use} model: {model}")
+        model = self._resolve_model(model, phase_number)
         
         # Set default max_tokens for document generation if not provided
         # Gemini 2.0 Flash supports up to 8192 output tokens (maximum allowed)
@@ -320,18 +723,23 @@ class BaseAgent(ABC):
                 logger.error(f"{self.agent_name} LLM call failed: {type(e).__name__}: {str(e)}", exc_info=True)
                 raise
         
+        bucket = get_token_bucket(self.provider_name, model_to_use)
+        if bucket is not None:
+            await bucket.async_acquire(estimated_tokens=len(prompt) // 4)
+        
         try:
             # Use async rate limiter with timeout
             async_rate_limiter = self._get_async_rate_limiter()
             
-            # Add timeout to prevent hanging (5 minutes max)
-            import asyncio
-            import time
-            start_time = time.time()
-            response = await asyncio.wait_for(
-                async_rate_limiter.execute(make_request, prompt),
-                timeout=300.0  # 5 minutes timeout
-            )
+            # Cap requests in flight per provider so ready documents do not all burst at once
+            semaphore = get_provider_semaphore(self.provider_name, self.max_concurrent_requests)
+            async with semaphore:
+                # Add timeout to prevent hanging (5 minutes max)
+                start_time = time.time()
+                response = await asyncio.wait_for(
+                    async_rate_limiter.execute(make_request, prompt),
+                    timeout=300.0  # 5 minutes timeout
+                )
             elapsed = time.time() - start_time
             logger.debug(f"{self.agent_name} LLM call completed in {elapsed:.2f}s (response: {len(response) if response else 0} chars)")
             
@@ -346,9 +754,66 @@ class BaseAgent(ABC):
             raise
         except Exception as e:
             logger.error(f"❌ {self.agent_name} _async_call_llm: LLM call failed with unexpected error: {type(e).__name__}: {str(e)}", exc_info=True)
+            self._penalize_rate_limit(bucket, e)
             raise
         # All other exceptions will be caught by the @retry_with_backoff decorator
     
+    def _penalize_rate_limit(self, bucket: Optional[TokenBucket], error: Exception):
+        """Shrink the token bucket when the provider rejected a request with a rate limit"""
+        if bucket is None:
+            return
+        error_str = str(error).lower()
+        if "429" not in error_str and "rate limit" not in error_str and "resource exhausted" not in error_str:
+            return
+        
+        retry_after = None
+        # Providers wrap SDK errors, so look at the original exception for response headers
+        original = error.__cause__ or error.__context__ or error
+        response = getattr(error, "response", None) or getattr(original, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            retry_after = float(headers.get("retry-after")) if headers.get("retry-after") else None
+        except (TypeError, ValueError):
+            retry_after = None
+        bucket.penalize(retry_after=retry_after)
+    
+    def _persist(
+        self,
+        content: str,
+        agent_type: AgentType,
+        document_type: str,
+        file_path: Optional[str],
+        project_id: str,
+        context_manager,
+        cache_hit: bool = False
+    ) -> AgentOutput:
+        """
+        Save a completed document to the shared context
+        
+        Args:
+            content: Document content
+            agent_type: Agent type recorded with the output
+            document_type: Document identifier
+            file_path: File or virtual path for reference
+            project_id: Project ID
+            context_manager: Context manager to save through
+            cache_hit: Content was served from a response cache
+            
+        Returns:
+            The saved AgentOutput
+        """
+        output = AgentOutput(
+            agent_type=agent_type,
+            document_type=document_type,
+            content=content,
+            file_path=file_path,
+            status=DocumentStatus.COMPLETE,
+            generated_at=_now(),
+            cache_hit=cache_hit
+        )
+        context_manager.save_agent_output(project_id, output)
+        return output
+    
     def _clean_llm_response(self, response: str) -> str:
         """
         Clean LLM response by removing markdown code blocks and extra formatting
@@ -420,11 +885,7 @@ class BaseAgent(ABC):
         """
         # Default: Run sync generate() in thread pool
         # Subclasses should override this to use _async_call_llm directly for better performance
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.generate(*args, **kwargs)
-        )
+        return await asyncio.to_thread(self.generate, *args, **kwargs)
     
     def get_stats(self) -> dict:
         """Get agent and rate limiting statistics"""
@@ -3,14 +3,14 @@ Code Analyst Agent
 Analyzes codebase and generates/updates documentation from actual code
 """
 from typing import Optional, Dict, List
-from datetime import datetime
 from pathlib import Path
 import ast
 import inspect
+from concurrent.futures import ThreadPoolExecutor
 from src.agents.base_agent import BaseAgent
-from src.utils.file_manager import FileManager
+from src.utils.file_manager import FileManager, get_file_manager
 from src.context.context_manager import ContextManager
-from src.context.shared_context import AgentType, DocumentStatus, AgentOutput
+from src.context.shared_context import AgentType
 from src.rate_limit.queue_manager import RequestQueue
 from src.utils.logger import get_logger
 
@@ -46,7 +46,7 @@ class CodeAnalystAgent(BaseAgent):
             **provider_kwargs
         )
         
-        self.file_manager = file_manager or FileManager()
+        self.file_manager = file_manager or get_file_manager()
     
     def generate(self, input_data: str) -> str:
         """
@@ -174,23 +174,17 @@ class CodeAnalystAgent(BaseAgent):
         logger.info(f"Code analysis complete: {len(analysis['modules'])} modules, {len(analysis['classes'])} classes, {len(analysis['functions'])} functions")
         return analysis
     
-    def generate_code_documentation(
-        self,
-        code_analysis: Dict,
-        existing_docs: Optional[str] = None
-    ) -> str:
+    def summarize_code_analysis(self, code_analysis: Dict) -> str:
         """
-        Generate documentation from code analysis
+        Format code analysis results as the prompt's codebase summary
         
         Args:
             code_analysis: Results from analyze_codebase()
-            existing_docs: Optional existing documentation to update
         
         Returns:
-            Generated/updated documentation
+            Markdown summary (reusable across generate_code_documentation calls)
         """
-        # Format code analysis for LLM
-        code_summary = f"""
+        parts = [f"""
 # Codebase Analysis Summary
 
 ## Modules Analyzed: {len(code_analysis['modules'])}
@@ -198,22 +192,45 @@ class CodeAnalystAgent(BaseAgent):
 ## Functions Found: {len(code_analysis['functions'])}
 
 ## Key Classes:
-"""
+"""]
         for cls in code_analysis['classes'][:20]:  # Limit to first 20
-            code_summary += f"""
+            parts.append(f"""
 ### {cls['name']} (in {cls['file']})
 - Docstring: {cls.get('docstring', 'No docstring')}
 - Methods: {len(cls.get('methods', []))}
 - Bases: {', '.join(cls.get('bases', []))}
-"""
+""")
         
-        code_summary += "\n## Key Functions:\n"
+        parts.append("\n## Key Functions:\n")
         for func in code_analysis['functions'][:20]:  # Limit to first 20
-            code_summary += f"""
+            parts.append(f"""
 ### {func['name']} (in {func['file']})
 - Docstring: {func.get('docstring', 'No docstring')}
 - Args: {', '.join(func.get('args', []))}
-"""
+""")
+        return "".join(parts)
+    
+    def generate_code_documentation(
+        self,
+        code_analysis: Dict,
+        existing_docs: Optional[str] = None,
+        code_summary: Optional[str] = None
+    ) -> str:
+        """
+        Generate documentation from code analysis
+        
+        Args:
+            code_analysis: Results from analyze_codebase()
+            existing_docs: Optional existing documentation to update
+            code_summary: summarize_code_analysis(code_analysis), if already built
+                (lets several documents generated from one analysis share it)
+        
+        Returns:
+            Generated/updated documentation
+        """
+        # Format code analysis for LLM
+        if code_summary is None:
+            code_summary = self.summarize_code_analysis(code_analysis)
         
         prompt = f"""You are a Code Documentation Specialist. Your task is to generate comprehensive API and Developer documentation based on actual codebase analysis.
 
@@ -273,15 +290,20 @@ Start with the documentation content:"""
         """
         logger.info(f"Analyzing codebase at: {codebase_path}")
         
-        # Analyze codebase
-        code_analysis = self.analyze_codebase(codebase_path)
-        
-        # Get existing docs if available
+        # The existing docs lookup (a database read) and the codebase scan are
+        # independent; fetch the docs while the codebase is analyzed
         existing_docs = None
         if project_id and context_manager:
-            api_output = context_manager.get_agent_output(project_id, AgentType.API_DOCUMENTATION)
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="code-analyst") as executor:
+                api_output_future = executor.submit(
+                    context_manager.get_agent_output, project_id, AgentType.API_DOCUMENTATION
+                )
+                code_analysis = self.analyze_codebase(codebase_path)
+                api_output = api_output_future.result()
             if api_output:
                 existing_docs = api_output.content
+        else:
+            code_analysis = self.analyze_codebase(codebase_path)
         
         # Generate documentation
         doc_content = self.generate_code_documentation(code_analysis, existing_docs)
@@ -293,15 +315,11 @@ Start with the documentation content:"""
         # Save to database
         if project_id and context_manager:
             try:
-                output = AgentOutput(
-                    agent_type=AgentType.API_DOCUMENTATION,  # Update API docs
-                    document_type="code_analysis_docs",
-                    content=doc_content,
-                    file_path=virtual_path,  # Virtual path for reference only
-                    status=DocumentStatus.COMPLETE,
-                    generated_at=datetime.now()
+                # API_DOCUMENTATION agent type: code analysis updates the API docs
+                self._persist(
+                    doc_content, AgentType.API_DOCUMENTATION, "code_analysis_docs",
+                    virtual_path, project_id, context_manager
                 )
-                context_manager.save_agent_output(project_id, output)
                 logger.info("✅ Code-based documentation saved to database")
             except Exception as e:
                 logger.warning(f"Could not save to database: {e}")
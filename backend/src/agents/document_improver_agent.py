@@ -2,12 +2,12 @@
 Document Improver Agent
 Automatically improves documents based on quality review feedback
 """
+import asyncio
 from typing import Optional, Dict
-from datetime import datetime
-from src.agents.base_agent import BaseAgent
-from src.utils.file_manager import FileManager
+from src.agents.base_agent import BaseAgent, run_agent_io
+from src.utils.file_manager import FileManager, get_file_manager
 from src.context.context_manager import ContextManager
-from src.context.shared_context import AgentType, DocumentStatus, AgentOutput
+from src.context.shared_context import AgentType
 from src.rate_limit.queue_manager import RequestQueue
 from src.utils.logger import get_logger
 
@@ -41,7 +41,7 @@ class DocumentImproverAgent(BaseAgent):
             **provider_kwargs
         )
         
-        self.file_manager = file_manager or FileManager()
+        self.file_manager = file_manager or get_file_manager()
     
     def generate(self, input_data: str) -> str:
         """
@@ -70,7 +70,7 @@ class DocumentImproverAgent(BaseAgent):
                 quality_feedback=input_data
             )
     
-    def improve_document(
+    def _build_improvement_prompt(
         self,
         original_document: str,
         document_type: str,
@@ -80,22 +80,7 @@ class DocumentImproverAgent(BaseAgent):
         quality_details: Optional[Dict] = None,
         structured_feedback: Optional[Dict] = None
     ) -> str:
-        """
-        Improve a document based on quality review feedback
-        
-        Args:
-            original_document: The original document content
-            document_type: Type of document (e.g., "technical_documentation")
-            quality_feedback: Quality review feedback and suggestions
-            focus_areas: Optional list of specific areas to focus on
-            quality_score: Optional current quality score (0-100)
-            quality_details: Optional quality check details (word_count, sections, readability)
-            structured_feedback: Optional structured JSON feedback from LLM-as-Judge
-                               (dict with score, feedback, suggestion, missing_sections, etc.)
-        
-        Returns:
-            Improved document content
-        """
+        """Build the improvement prompt (see improve_document for the arguments)"""
         focus_text = ""
         if focus_areas:
             focus_text = f"\n\nFocus on these specific areas:\n" + "\n".join(f"- {area}" for area in focus_areas)
@@ -252,25 +237,108 @@ DO NOT:
 - Remove examples, explanations, or details from the original
 
 Start directly with the improved document content (preserving original structure):"""
+        return prompt
+
+    @staticmethod
+    def _clean_improved_document(improved_doc: str) -> str:
+        """Strip whitespace and a wrapping markdown code block from the LLM response"""
+        improved_doc = improved_doc.strip()
+        
+        # Remove markdown code blocks if present
+        if improved_doc.startswith("```"):
+            lines = improved_doc.split("\n")
+            if len(lines) > 2:
+                improved_doc = "\n".join(lines[1:-1])
+        return improved_doc
+
+    def improve_document(
+        self,
+        original_document: str,
+        document_type: str,
+        quality_feedback: str,
+        focus_areas: Optional[list] = None,
+        quality_score: Optional[float] = None,
+        quality_details: Optional[Dict] = None,
+        structured_feedback: Optional[Dict] = None
+    ) -> str:
+        """
+        Improve a document based on quality review feedback
+        
+        Args:
+            original_document: The original document content
+            document_type: Type of document (e.g., "technical_documentation")
+            quality_feedback: Quality review feedback and suggestions
+            focus_areas: Optional list of specific areas to focus on
+            quality_score: Optional current quality score (0-100)
+            quality_details: Optional quality check details (word_count, sections, readability)
+            structured_feedback: Optional structured JSON feedback from LLM-as-Judge
+                               (dict with score, feedback, suggestion, missing_sections, etc.)
+        
+        Returns:
+            Improved document content
+        """
+        prompt = self._build_improvement_prompt(
+            original_document,
+            document_type,
+            quality_feedback,
+            focus_areas=focus_areas,
+            quality_score=quality_score,
+            quality_details=quality_details,
+            structured_feedback=structured_feedback,
+        )
         
         try:
-            logger.debug(f"Improving {document_type} document (original: {len(original_document)} chars)")
-            improved_doc = self._call_llm(prompt, temperature=0.5)  # Lower temperature for more consistent improvements
+            logger.debug("Improving %s document (original: %s chars)", document_type, len(original_document))
+            improved_doc = self._call_llm_cached(prompt, temperature=0.5)  # Lower temperature for more consistent improvements
+            improved_doc = self._clean_improved_document(improved_doc)
             
-            # Clean the response
-            improved_doc = improved_doc.strip()
+            logger.debug("Improved document generated (%s chars)", len(improved_doc))
+            return improved_doc
             
-            # Remove markdown code blocks if present
-            if improved_doc.startswith("```"):
-                lines = improved_doc.split("\n")
-                if len(lines) > 2:
-                    improved_doc = "\n".join(lines[1:-1])
+        except Exception as e:
+            logger.error("Error improving document: %s", e)
+            raise
+
+    async def async_improve_document(
+        self,
+        original_document: str,
+        document_type: str,
+        quality_feedback: str,
+        focus_areas: Optional[list] = None,
+        quality_score: Optional[float] = None,
+        quality_details: Optional[Dict] = None,
+        structured_feedback: Optional[Dict] = None
+    ) -> str:
+        """
+        Improve a document based on quality review feedback (async version)
+        
+        Awaits the provider's async client directly instead of running
+        improve_document on a worker thread. Takes the same arguments as
+        improve_document.
+        
+        Returns:
+            Improved document content
+        """
+        prompt = self._build_improvement_prompt(
+            original_document,
+            document_type,
+            quality_feedback,
+            focus_areas=focus_areas,
+            quality_score=quality_score,
+            quality_details=quality_details,
+            structured_feedback=structured_feedback,
+        )
+        
+        try:
+            logger.debug("Improving %s document (original: %s chars)", document_type, len(original_document))
+            improved_doc = await self._async_call_llm_cached(prompt, temperature=0.5)
+            improved_doc = self._clean_improved_document(improved_doc)
             
-            logger.debug(f"Improved document generated ({len(improved_doc)} chars)")
+            logger.debug("Improved document generated (%s chars)", len(improved_doc))
             return improved_doc
             
         except Exception as e:
-            logger.error(f"Error improving document: {e}")
+            logger.error("Error improving document: %s", e)
             raise
     
     def improve_and_save(
@@ -298,30 +366,72 @@ Start directly with the improved document content (preserving original structure
         Returns:
             Path to saved improved document
         """
-        logger.info(f"Improving {document_type} based on quality feedback")
+        logger.info("Improving %s based on quality feedback", document_type)
         
         # Improve the document
         improved_doc = self.improve_document(original_document, document_type, quality_feedback)
         
         # Save to file (overwrite original)
         file_path = self.file_manager.write_file(output_filename, improved_doc)
-        logger.info(f"Improved {document_type} saved to: {file_path}")
+        logger.info("Improved %s saved to: %s", document_type, file_path)
         
         # Save to context if available
         if project_id and context_manager and agent_type:
             try:
-                output = AgentOutput(
-                    agent_type=agent_type,
-                    document_type=document_type,
-                    content=improved_doc,
-                    file_path=file_path,
-                    status=DocumentStatus.COMPLETE,
-                    generated_at=datetime.now()
-                )
-                context_manager.save_agent_output(project_id, output)
-                logger.debug(f"Improved {document_type} saved to context")
+                self._persist(improved_doc, agent_type, document_type, file_path, project_id, context_manager)
+                logger.debug("Improved %s saved to context", document_type)
             except Exception as e:
-                logger.warning(f"Could not save improved document to context: {e}")
+                logger.warning("Could not save improved document to context: %s", e)
         
         return file_path
-
+    
+    async def async_improve_and_save(
+        self,
+        original_document: str,
+        document_type: str,
+        quality_feedback: str,
+        output_filename: str,
+        project_id: Optional[str] = None,
+        context_manager: Optional[ContextManager] = None,
+        agent_type: Optional[AgentType] = None
+    ) -> str:
+        """
+        Improve document and save to file (async version)
+        
+        The file write and the context save run concurrently; the context
+        entry records the path the file is being written to.
+        
+        Args:
+            original_document: Original document content
+            document_type: Type of document
+            quality_feedback: Quality review feedback
+            output_filename: Output filename
+            project_id: Project ID
+            context_manager: Context manager
+            agent_type: Agent type for context saving
+        
+        Returns:
+            Path to saved improved document
+        """
+        logger.info("Improving %s based on quality feedback", document_type)
+        
+        improved_doc = await self.async_improve_document(original_document, document_type, quality_feedback)
+        
+        file_path = str(self.file_manager.resolve_path(output_filename).absolute())
+        file_task = run_agent_io(self.file_manager.write_file, output_filename, improved_doc)
+        if project_id and context_manager and agent_type:
+            context_task = run_agent_io(
+                self._persist, improved_doc, agent_type, document_type, file_path, project_id, context_manager
+            )
+            file_result, context_result = await asyncio.gather(file_task, context_task, return_exceptions=True)
+            if isinstance(context_result, Exception):
+                logger.warning("Could not save improved document to context: %s", context_result)
+            else:
+                logger.debug("Improved %s saved to context", document_type)
+            if isinstance(file_result, Exception):
+                raise file_result
+        else:
+            await file_task
+        
+        logger.info("Improved %s saved to: %s", document_type, file_path)
+        return file_path
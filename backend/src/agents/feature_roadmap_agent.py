@@ -2,11 +2,13 @@
 Feature Roadmap Agent
 Specialized agent for generating feature roadmaps
 """
-from typing import Optional, Dict
+from functools import partial
+from typing import Any, Dict, List, Optional
 from src.agents.base_agent import BaseAgent
-from src.utils.file_manager import FileManager
+from src.utils.file_manager import FileManager, get_file_manager
 from src.rate_limit.queue_manager import RequestQueue
 from prompts.system_prompts import get_feature_roadmap_prompt
+from src.utils.prompt_registry import get_cached_prompt
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -48,15 +50,48 @@ class FeatureRoadmapAgent(BaseAgent):
             **provider_kwargs
         )
         
-        self.file_manager = file_manager or FileManager(base_dir="docs/roadmap")
+        self.file_manager = file_manager or get_file_manager("docs/roadmap")
     
-    def generate(
+    def _build_prompt(
         self,
         user_idea: str,
         requirements_summary: Optional[Dict] = None,
         project_charter_summary: Optional[str] = None,
         business_model_summary: Optional[str] = None,
         dependency_documents: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> str:
+        """Build the expert feature roadmap prompt from the idea and dependency documents"""
+        # Build requirements summary if not provided
+        if not requirements_summary:
+            requirements_summary = {"user_idea": user_idea}
+        
+        # Extract dependency documents if provided
+        if dependency_documents:
+            if not project_charter_summary and "project_charter" in dependency_documents:
+                project_charter_summary = dependency_documents["project_charter"].get("content", "")
+            if not business_model_summary and "business_model" in dependency_documents:
+                business_model_summary = dependency_documents["business_model"].get("content", "")
+        
+        # Get expert prompt (reused when the same summaries are seen again, e.g. on retries)
+        return get_cached_prompt(
+            "feature_roadmap",
+            [requirements_summary, project_charter_summary, business_model_summary],
+            partial(
+                get_feature_roadmap_prompt,
+                requirements_summary=requirements_summary,
+                project_charter_summary=project_charter_summary,
+                business_model_summary=business_model_summary
+            )
+        )
+    
+    def generate(
+        self,
+        user_idea: str,
+        requirements_summary: Optional[Dict] = None,
+        project_charter_summary: Optional[str] = None,
+        business_model_summary: Optional[str] = None,
+        dependency_documents: Optional[Dict[str, Dict[str, str]]] = None,
+        bypass_cache: bool = False
     ) -> str:
         """
         Generate feature roadmap document
@@ -67,33 +102,77 @@ class FeatureRoadmapAgent(BaseAgent):
             project_charter_summary: Project charter content (optional)
             business_model_summary: Business model content (optional)
             dependency_documents: Dependency documents dict (optional)
+            bypass_cache: Skip the LLM response cache and force a fresh call
             
         Returns:
             Generated feature roadmap document (Markdown)
         """
-        # Build requirements summary if not provided
-        if not requirements_summary:
-            requirements_summary = {"user_idea": user_idea}
+        full_prompt = self._build_prompt(
+            user_idea,
+            requirements_summary,
+            project_charter_summary,
+            business_model_summary,
+            dependency_documents
+        )
         
-        # Extract dependency documents if provided
-        if dependency_documents:
-            if not project_charter_summary and "project_charter" in dependency_documents:
-                project_charter_summary = dependency_documents["project_charter"].get("content", "")
-            if not business_model_summary and "business_model" in dependency_documents:
-                business_model_summary = dependency_documents["business_model"].get("content", "")
+        try:
+            feature_roadmap = self._call_llm_cached(full_prompt, bypass_cache=bypass_cache)
+            logger.info("✅ Feature roadmap generated!")
+            return feature_roadmap
+        except Exception as e:
+            logger.error("Error generating feature roadmap: %s", e)
+            raise
+    
+    def batch_generate(self, items: List[Dict[str, Any]], bypass_cache: bool = False) -> List[str]:
+        """
+        Generate feature roadmap documents for many inputs through the provider batch API
+        
+        Args:
+            items: Keyword arguments for generate() (user_idea, requirements_summary, ...) per document
+            bypass_cache: Skip the LLM response cache and force fresh calls
+            
+        Returns:
+            Generated documents, in input order
+        """
+        prompts = [self._build_prompt(**item) for item in items]
+        return self._batch_call_llm(prompts, bypass_cache=bypass_cache)
+    
+    async def async_generate(
+        self,
+        user_idea: str,
+        requirements_summary: Optional[Dict] = None,
+        project_charter_summary: Optional[str] = None,
+        business_model_summary: Optional[str] = None,
+        dependency_documents: Optional[Dict[str, Dict[str, str]]] = None,
+        bypass_cache: bool = False
+    ) -> str:
+        """
+        Generate feature roadmap document (async version)
         
-        # Get expert prompt
-        full_prompt = get_feature_roadmap_prompt(
-            requirements_summary=requirements_summary,
-            project_charter_summary=project_charter_summary,
-            business_model_summary=business_model_summary
+        Args:
+            user_idea: User's project idea
+            requirements_summary: Requirements summary dict (optional)
+            project_charter_summary: Project charter content (optional)
+            business_model_summary: Business model content (optional)
+            dependency_documents: Dependency documents dict (optional)
+            bypass_cache: Skip the LLM response cache and force a fresh call
+            
+        Returns:
+            Generated feature roadmap document (Markdown)
+        """
+        full_prompt = self._build_prompt(
+            user_idea,
+            requirements_summary,
+            project_charter_summary,
+            business_model_summary,
+            dependency_documents
         )
         
         try:
-            feature_roadmap = self._call_llm(full_prompt)
+            feature_roadmap = await self._async_call_llm_cached(full_prompt, bypass_cache=bypass_cache)
             logger.info("✅ Feature roadmap generated!")
             return feature_roadmap
         except Exception as e:
-            logger.error(f"Error generating feature roadmap: {e}")
+            logger.error("Error generating feature roadmap: %s", e)
             raise
 
@@ -3,7 +3,6 @@ Format Converter Agent
 Converts documentation between different formats (Markdown, HTML, PDF, DOCX)
 """
 from typing import Optional, List
-from datetime import datetime
 from pathlib import Path
 import os
 import sys
@@ -83,10 +82,11 @@ if sys.platform == 'darwin' and Path('/opt/homebrew/lib').exists():
     ctypes.util.find_library = _patched_find_library
 
 from src.agents.base_agent import BaseAgent
-from src.utils.file_manager import FileManager
+from src.utils.file_manager import FileManager, get_file_manager
 from src.context.context_manager import ContextManager
-from src.context.shared_context import AgentType, DocumentStatus, AgentOutput
+from src.context.shared_context import AgentType
 from src.rate_limit.queue_manager import RequestQueue
+from src.utils import json_utils
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -151,7 +151,9 @@ class FormatConverterAgent(BaseAgent):
             **provider_kwargs
         )
         
-        self.file_manager = file_manager or FileManager(base_dir="docs")
+        self.file_manager = file_manager or get_file_manager("docs")
+        # Resolve the output root once so per-file conversions don't re-resolve it
+        self._base_abs = Path(self.file_manager.base_dir).resolve()
         self.supported_formats = ["html", "pdf", "docx"]
         logger.debug(f"FormatConverterAgent initialized with supported formats: {self.supported_formats}")
     
@@ -533,14 +535,14 @@ class FormatConverterAgent(BaseAgent):
             ''')
             
             html_obj = HTML(string=html_content)
-            pdf_path = self.file_manager.base_dir / output_path
+            pdf_path = self._base_abs / output_path
             logger.debug(f"Writing PDF to: {pdf_path}")
             html_obj.write_pdf(pdf_path, stylesheets=[pdf_css])
             
             # Restore stderr AFTER successful conversion
             sys.stderr = stderr_backup
             
-            pdf_abs_path = str(pdf_path.absolute())
+            pdf_abs_path = str(pdf_path)
             logger.info(f"PDF file generated successfully: {pdf_abs_path}")
             return pdf_abs_path
             
@@ -572,7 +574,7 @@ class FormatConverterAgent(BaseAgent):
                 if not output_path.endswith('.pdf'):
                     output_path = str(Path(output_path).with_suffix('.pdf'))
                 
-                pdf_path = self.file_manager.base_dir / output_path
+                pdf_path = self._base_abs / output_path
                 options = {
                     'page-size': 'A4',
                     'margin-top': '0.75in',
@@ -584,7 +586,7 @@ class FormatConverterAgent(BaseAgent):
                 }
                 pdfkit.from_string(html_content, str(pdf_path), options=options)
                 
-                return str(pdf_path.absolute())
+                return str(pdf_path)
             except ImportError:
                 raise ImportError(
                     "PDF conversion requires 'weasyprint' or 'pdfkit'. "
@@ -606,45 +608,65 @@ class FormatConverterAgent(BaseAgent):
         logger.info(f"Converting Markdown to DOCX (subdirectory: {subdirectory}, output_path: {output_path})")
         try:
             from docx import Document
-            from docx.shared import Inches
-            import re
-            
+            from docx.oxml.ns import qn
+            from lxml import etree
+
             if not output_path:
                 output_path = "documentation.docx"
-            
+
             # If subdirectory is provided, create path with subdirectory
             if subdirectory:
                 output_path = f"{subdirectory}/{output_path}"
-            
+
             if not output_path.endswith('.docx'):
                 output_path = str(Path(output_path).with_suffix('.docx'))
-            
+
             doc = Document()
-            
-            # Parse markdown and convert to docx
-            lines = markdown_content.split('\n')
-            for line in lines:
-                # Headings
-                if line.startswith('# '):
-                    doc.add_heading(line[2:], level=1)
-                elif line.startswith('## '):
-                    doc.add_heading(line[3:], level=2)
-                elif line.startswith('### '):
-                    doc.add_heading(line[4:], level=3)
-                # Lists
-                elif line.strip().startswith('- ') or line.strip().startswith('* '):
-                    doc.add_paragraph(line.strip()[2:], style='List Bullet')
-                # Regular paragraphs
-                elif line.strip():
-                    doc.add_paragraph(line.strip())
-                else:
-                    doc.add_paragraph()
-            
-            docx_path = self.file_manager.base_dir / output_path
+
+            # First pass: classify lines into (style, text) blocks
+            blocks = self._classify_markdown_lines(markdown_content)
+
+            # Resolve style IDs once instead of per paragraph
+            style_ids = {}
+            for style_name in {style for style, _ in blocks if style}:
+                try:
+                    style_ids[style_name] = doc.styles[style_name].style_id
+                except KeyError:
+                    pass
+
+            # Second pass: append <w:p> elements straight onto the body.
+            # sectPr must stay the last child, so detach it while appending.
+            body = doc.element.body
+            sect_pr = body.find(qn('w:sectPr'))
+            if sect_pr is not None:
+                body.remove(sect_pr)
+
+            xml_space = '{http://www.w3.org/XML/1998/namespace}space'
+            for style_name, text in blocks:
+                if style_name and style_name not in style_ids:
+                    # Style missing from the template - let python-docx handle it
+                    doc.add_paragraph(text, style=style_name)
+                    continue
+
+                paragraph = etree.SubElement(body, qn('w:p'))
+                if style_name:
+                    p_pr = etree.SubElement(paragraph, qn('w:pPr'))
+                    p_style = etree.SubElement(p_pr, qn('w:pStyle'))
+                    p_style.set(qn('w:val'), style_ids[style_name])
+                if text:
+                    run = etree.SubElement(paragraph, qn('w:r'))
+                    text_el = etree.SubElement(run, qn('w:t'))
+                    text_el.text = text
+                    text_el.set(xml_space, 'preserve')
+
+            if sect_pr is not None:
+                body.append(sect_pr)
+
+            docx_path = self._base_abs / output_path
             logger.debug(f"Writing DOCX to: {docx_path}")
             doc.save(str(docx_path))
             
-            docx_abs_path = str(docx_path.absolute())
+            docx_abs_path = str(docx_path)
             logger.info(f"DOCX file generated successfully: {docx_abs_path}")
             return docx_abs_path
         except ImportError as e:
@@ -656,13 +678,43 @@ class FormatConverterAgent(BaseAgent):
         except Exception as e:
             logger.error(f"Error converting Markdown to DOCX: {str(e)}", exc_info=True)
             raise
-    
+
+    @staticmethod
+    def _classify_markdown_lines(markdown_content: str) -> List[tuple]:
+        """
+        Classify Markdown lines into DOCX paragraph blocks
+
+        Args:
+            markdown_content: Markdown content to classify
+
+        Returns:
+            List of (style_name, text) tuples; style_name is None for plain paragraphs
+        """
+        blocks = []
+        for line in markdown_content.split('\n'):
+            stripped = line.strip()
+            # Headings
+            if line.startswith('# '):
+                blocks.append(('Heading 1', line[2:]))
+            elif line.startswith('## '):
+                blocks.append(('Heading 2', line[3:]))
+            elif line.startswith('### '):
+                blocks.append(('Heading 3', line[4:]))
+            # Lists
+            elif stripped.startswith('- ') or stripped.startswith('* '):
+                blocks.append(('List Bullet', stripped[2:]))
+            # Regular paragraphs (empty text for blank lines)
+            else:
+                blocks.append((None, stripped))
+        return blocks
+
     def convert(
         self,
         markdown_content: str,
         output_format: str,
         output_filename: Optional[str] = None,
-        subdirectory: Optional[str] = None
+        subdirectory: Optional[str] = None,
+        html_content: Optional[str] = None
     ) -> str:
         """
         Convert Markdown content to specified format
@@ -672,6 +724,7 @@ class FormatConverterAgent(BaseAgent):
             output_format: Target format ('html', 'pdf', 'docx')
             output_filename: Optional output filename
             subdirectory: Optional subdirectory to save file in (e.g., 'api_documentation')
+            html_content: markdown_to_html(markdown_content), if already rendered
         
         Returns:
             Path to converted file
@@ -685,7 +738,8 @@ class FormatConverterAgent(BaseAgent):
             )
         
         if output_format.lower() == 'html':
-            html_content = self.markdown_to_html(markdown_content)
+            if html_content is None:
+                html_content = self.markdown_to_html(markdown_content)
             if not output_filename:
                 output_filename = "documentation.html"
             # If subdirectory is provided, create path with subdirectory
@@ -699,7 +753,8 @@ class FormatConverterAgent(BaseAgent):
             return virtual_path  # Return virtual path for compatibility
         
         elif output_format.lower() == 'pdf':
-            html_content = self.markdown_to_html(markdown_content)
+            if html_content is None:
+                html_content = self.markdown_to_html(markdown_content)
             pdf_path = self.html_to_pdf(html_content, output_filename, subdirectory)
             logger.info(f"Format conversion completed: PDF -> {pdf_path}")
             return pdf_path
@@ -765,6 +820,14 @@ class FormatConverterAgent(BaseAgent):
         for doc_name, markdown_content in documents.items():
             doc_results = {}
             
+            # Base name without extension (computed once, shared by every output format)
+            if not doc_name:
+                base_name = "document"
+            elif '.' in doc_name:
+                base_name = os.path.splitext(os.path.basename(doc_name))[0]
+            else:
+                base_name = doc_name
+            
             # Map document name to the correct folder in docs/
             # Use AgentType mapping if available, otherwise use document name
             if doc_name:
@@ -773,7 +836,7 @@ class FormatConverterAgent(BaseAgent):
                 
                 if not folder_name:
                     # Extract clean document name (remove file extensions, normalize)
-                    clean_name = str(Path(doc_name).stem) if '.' in str(doc_name) else str(doc_name)
+                    clean_name = base_name
                     # Normalize to lowercase, replace spaces/underscores/hyphens
                     clean_name = clean_name.lower().replace(' ', '_').replace('-', '_')
                     # Try mapping again with cleaned name
@@ -791,20 +854,20 @@ class FormatConverterAgent(BaseAgent):
             else:
                 subdirectory = None  # Will save to docs/ root
             
+            # HTML and PDF output both start from the rendered HTML; render it once per document
+            html_content = None
             for fmt in formats:
                 try:
-                    # Extract base name from doc_name (handle both string and Path-like)
-                    if doc_name:
-                        base_name = str(Path(doc_name).stem) if '.' in str(doc_name) else str(doc_name)
-                    else:
-                        base_name = "document"
                     output_filename = f"{base_name}.{fmt}"
+                    if html_content is None and fmt.lower() in ("html", "pdf"):
+                        html_content = self.markdown_to_html(markdown_content)
                     
                     file_path = self.convert(
                         markdown_content=markdown_content,
                         output_format=fmt,
                         output_filename=output_filename,
-                        subdirectory=subdirectory
+                        subdirectory=subdirectory,
+                        html_content=html_content
                     )
                     
                     doc_results[fmt] = {
@@ -847,15 +910,11 @@ class FormatConverterAgent(BaseAgent):
         
         # Save to context if available
         if project_id and context_manager:
-            output = AgentOutput(
-                agent_type=AgentType.FORMAT_CONVERTER,
-                document_type="format_conversions",
-                content=str(results),  # JSON-like string of results
-                file_path="",  # Multiple files, no single path
-                status=DocumentStatus.COMPLETE,
-                generated_at=datetime.now()
+            # JSON string of results; multiple files, so no single path
+            self._persist(
+                json_utils.dumps(results), AgentType.FORMAT_CONVERTER, "format_conversions",
+                "", project_id, context_manager
             )
-            context_manager.save_agent_output(project_id, output)
             logger.info(f"Format conversions saved to shared context (project: {project_id})")
         
         logger.info(f"Batch conversion completed: {len(results)} documents processed")
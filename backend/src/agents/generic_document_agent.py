@@ -1,20 +1,33 @@
 """Agent for configuration-driven document generation."""
 from __future__ import annotations
 
+import asyncio
+import json
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from prompts.system_prompts import READABILITY_GUIDELINES
-from src.agents.base_agent import BaseAgent
+from src.agents.base_agent import BaseAgent, run_agent_io
 from src.config.document_catalog import DocumentDefinition
 from src.context.context_manager import ContextManager
-from src.utils.file_manager import FileManager
+from src.utils.file_manager import get_file_manager
 from src.utils.logger import get_logger
-from src.utils.prompt_registry import get_prompt_for_document
+from src.utils.prompt_registry import get_prompt_for_document, get_system_prompt_for_document
+from src.utils.semantic_cache import SemanticCache, semantic_cache_path
 from src.quality.document_type_quality_checker import DocumentTypeQualityChecker
 
 logger = get_logger(__name__)
 
+# Near-duplicate regenerations (same inputs after minor edits) reuse the earlier document
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_TTL = 7 * 24 * 3600
+SEMANTIC_CACHE_MAX_ENTRIES = 256
+
+# Character budget for dependency text in specialized prompts when condensing is enabled
+CONDENSED_SUMMARY_CHARS = 8000
+
+_now = datetime.now
+
 
 class GenericDocumentAgent(BaseAgent):
     """Generic prompt-driven document generator using catalog metadata."""
@@ -26,6 +39,8 @@ class GenericDocumentAgent(BaseAgent):
         model_name: Optional[str] = None,
         base_output_dir: str = "docs/generated",
         context_manager: Optional[ContextManager] = None,
+        semantic_cache: bool = False,
+        condense: bool = False,
         **provider_kwargs,
     ) -> None:
         super().__init__(
@@ -35,9 +50,17 @@ class GenericDocumentAgent(BaseAgent):
         )
         self.definition = definition
         self.output_filename = f"{definition.id}.md"
-        self.file_manager = FileManager(base_dir=base_output_dir)
+        self.file_manager = get_file_manager(base_output_dir)
         self.context_manager = context_manager
         self.project_id: Optional[str] = None
+        # Opt-in: reuse the document generated from near-identical inputs (requires sentence-transformers)
+        self.semantic_cache: Optional[SemanticCache] = SemanticCache(
+            path=semantic_cache_path(definition.id),
+            ttl=SEMANTIC_CACHE_TTL,
+            max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+        ) if semantic_cache else None
+        # Opt-in: trim long dependency documents (extractively) before they go into the prompt
+        self.condense = condense
 
     def _get_project_context(self, project_id: Optional[str]) -> Dict:
         """Get project context from ContextManager if available"""
@@ -108,6 +131,7 @@ class GenericDocumentAgent(BaseAgent):
             document_id=self.definition.id,
             user_idea=user_idea,
             dependency_documents=dependency_documents,
+            condense_chars=CONDENSED_SUMMARY_CHARS if self.condense else None,
         )
 
         if specialized_prompt:
@@ -304,23 +328,215 @@ class GenericDocumentAgent(BaseAgent):
 
         return "\n".join(guidance)
 
+    def _split_system_prompt(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Move the document's static instructions out of the prompt into a system prompt
+        
+        Sending the static part separately (and first) lets providers reuse it as a
+        cached prompt prefix; only the project-specific tail changes between calls.
+        
+        Returns:
+            (prompt without the static prefix, extra LLM kwargs)
+        """
+        system_prompt = get_system_prompt_for_document(self.definition.id)
+        if system_prompt and prompt.startswith(system_prompt):
+            return prompt[len(system_prompt):].lstrip("\n"), {"system_prompt": system_prompt}
+        return prompt, {}
+
+    @staticmethod
+    def _semantic_cache_text(user_idea: str, dependency_documents: Dict[str, Dict[str, str]]) -> str:
+        """Text embedded for the semantic cache: the idea plus the dependency documents' content"""
+        dependencies = {dep_id: dep.get("content", "") for dep_id, dep in dependency_documents.items()}
+        return json.dumps({"user_idea": user_idea, "dependencies": dependencies}, sort_keys=True)
+
+    def _semantic_lookup(self, semantic_text: Optional[str]) -> Optional[str]:
+        if not self.semantic_cache or semantic_text is None:
+            return None
+        return self.semantic_cache.lookup(semantic_text, threshold=SEMANTIC_CACHE_THRESHOLD)
+
+    def _semantic_store(self, semantic_text: Optional[str], content: str) -> None:
+        if self.semantic_cache and semantic_text is not None:
+            self.semantic_cache.add(semantic_text, content)
+
     def generate(
         self,
         user_idea: str,
         dependency_documents: Dict[str, Dict[str, str]],
         project_id: Optional[str] = None,
+        bypass_cache: bool = False,
     ) -> str:
         prompt = self._build_prompt(user_idea, dependency_documents, project_id)
-        return self._call_llm(prompt, temperature=self.default_temperature)
+        prompt, llm_kwargs = self._split_system_prompt(prompt)
+        llm_kwargs["temperature"] = self.default_temperature
+
+        # Built once; a miss's lookup and the store that follows embed the same text
+        semantic_text = self._semantic_cache_text(user_idea, dependency_documents) if self.semantic_cache else None
+
+        # Exact-match cache first (a hash lookup), then the semantic cache (an embedding)
+        cached = self._llm_cache_lookup(prompt, bypass_cache, **llm_kwargs)
+        if cached is None and not bypass_cache:
+            cached = self._semantic_lookup(semantic_text)
+        if cached is not None:
+            return cached
+
+        content = self._call_llm(prompt, **llm_kwargs)
+        self._llm_cache_store(prompt, content, **llm_kwargs)
+        self._semantic_store(semantic_text, content)
+        return content
+
+    def batch_generate(self, items: List[Dict[str, Any]], bypass_cache: bool = False) -> List[str]:
+        """
+        Generate this document for many inputs through the provider batch API
+        
+        Meant for offline bulk generation (e.g. regenerating a document across
+        projects), where the discounted, higher-latency batch endpoint is acceptable.
+        
+        Args:
+            items: Keyword arguments for generate() (user_idea, dependency_documents, project_id) per document
+            bypass_cache: Skip the LLM response cache and force fresh calls
+            
+        Returns:
+            Generated documents, in input order
+        """
+        prompts: List[str] = []
+        prompt_kwargs: List[Dict[str, Any]] = []
+        for item in items:
+            # Same system prompt split and temperature as generate(), so both share cache entries
+            prompt, llm_kwargs = self._split_system_prompt(self._build_prompt(**item))
+            llm_kwargs["temperature"] = self.default_temperature
+            prompts.append(prompt)
+            prompt_kwargs.append(llm_kwargs)
+        return self._batch_call_llm(prompts, bypass_cache=bypass_cache, prompt_kwargs=prompt_kwargs)
+
+    async def _async_generate(
+        self,
+        user_idea: str,
+        dependency_documents: Dict[str, Dict[str, str]],
+        project_id: Optional[str] = None,
+        bypass_cache: bool = False,
+        stream_to: Optional[str] = None,
+    ) -> Tuple[str, bool]:
+        """
+        Generate the document, returning (content, served from a response cache)
+        
+        With stream_to, a freshly generated response is written to that file
+        (relative to the output directory) chunk by chunk as it arrives.
+        """
+        prompt = self._build_prompt(user_idea, dependency_documents, project_id)
+        prompt, llm_kwargs = self._split_system_prompt(prompt)
+        llm_kwargs["temperature"] = self.default_temperature
+        # Built once; a miss's lookup and the store that follows embed the same text
+        semantic_text = self._semantic_cache_text(user_idea, dependency_documents) if self.semantic_cache else None
+
+        # Exact-match cache first (a hash lookup), then the semantic cache (an embedding)
+        cached = await run_agent_io(self._llm_cache_lookup, prompt, bypass_cache, **llm_kwargs)
+        if cached is None and self.semantic_cache and not bypass_cache:
+            cached = await run_agent_io(self._semantic_lookup, semantic_text)
+        if cached is not None:
+            if stream_to:
+                await run_agent_io(self.file_manager.write_file, stream_to, cached)
+            return cached, True
+
+        if bypass_cache:
+            content = await self._async_generate_uncached(
+                semantic_text, prompt, llm_kwargs, stream_to
+            )
+            return content, False
+
+        # Identical requests already being generated (client retries, several tabs)
+        # wait for that call instead of making their own
+        led = False
+
+        async def generate() -> str:
+            nonlocal led
+            led = True
+            return await self._async_generate_uncached(
+                semantic_text, prompt, llm_kwargs, stream_to
+            )
+
+        content = await self._coalesce_inflight(
+            ("document", self._llm_cache_key(prompt, **llm_kwargs)), generate
+        )
+        if stream_to and not led:
+            await run_agent_io(self.file_manager.write_file, stream_to, content)
+        return content, False
+
+    async def _async_generate_uncached(
+        self,
+        semantic_text: Optional[str],
+        prompt: str,
+        llm_kwargs: Dict[str, Any],
+        stream_to: Optional[str] = None,
+    ) -> str:
+        """Call the LLM (streaming into stream_to if given) and store the response in the caches"""
+        if stream_to:
+            content = await self._async_stream_to_file(prompt, llm_kwargs, stream_to)
+        else:
+            content = await self._async_call_llm(prompt, **llm_kwargs)
+        if self.semantic_cache:
+            # Independent stores (database write, embedding + index write): overlap them
+            await asyncio.gather(
+                run_agent_io(self._llm_cache_store, prompt, content, **llm_kwargs),
+                run_agent_io(self._semantic_store, semantic_text, content),
+            )
+        else:
+            await run_agent_io(self._llm_cache_store, prompt, content, **llm_kwargs)
+        return content
+
+    async def _async_stream_to_file(
+        self,
+        prompt: str,
+        llm_kwargs: Dict[str, Any],
+        stream_to: str,
+    ) -> str:
+        """
+        Stream the LLM response into stream_to and return the cleaned response
+        
+        File writes run on the agent I/O pool. A failed stream is retried once
+        through the (retrying) non-streaming call, which overwrites the partial file.
+        
+        Args:
+            prompt: Full prompt
+            llm_kwargs: Extra LLM parameters
+            stream_to: File that receives the chunks as they arrive
+        
+        Returns:
+            Cleaned response content (the same text the file ends up holding)
+        """
+        parts: List[str] = []
+        stream_failed = False
+        f = await run_agent_io(self.file_manager.open_stream, stream_to)
+        try:
+            async for chunk in self._async_stream_llm(prompt, **llm_kwargs):
+                await run_agent_io(f.write, chunk)
+                parts.append(chunk)
+        except Exception as e:
+            logger.warning(
+                "Streaming %s failed (%s), retrying without streaming", self.definition.id, e
+            )
+            stream_failed = True
+        finally:
+            await run_agent_io(f.close)
+        
+        if stream_failed:
+            content = await self._async_call_llm(prompt, **llm_kwargs)
+        else:
+            raw = "".join(parts)
+            content = self._clean_llm_response(raw)
+            if content == raw:
+                return content
+        await run_agent_io(self.file_manager.write_file, stream_to, content)
+        return content
 
     async def async_generate(
         self,
         user_idea: str,
         dependency_documents: Dict[str, Dict[str, str]],
         project_id: Optional[str] = None,
+        bypass_cache: bool = False,
     ) -> str:
-        prompt = self._build_prompt(user_idea, dependency_documents, project_id)
-        return await self._async_call_llm(prompt, temperature=self.default_temperature)
+        content, _ = await self._async_generate(user_idea, dependency_documents, project_id, bypass_cache)
+        return content
 
     async def generate_and_save(
         self,
@@ -328,7 +544,21 @@ class GenericDocumentAgent(BaseAgent):
         dependency_documents: Dict[str, Dict[str, str]],
         output_rel_path: str,
         project_id: Optional[str] = None,
+        stream: bool = False,
     ) -> Dict[str, str]:
+        """
+        Generate the document and save it to the database
+        
+        Args:
+            user_idea: User's project idea
+            dependency_documents: Generated dependency documents by ID
+            output_rel_path: Output path relative to the output directory
+            project_id: Project ID
+            stream: Also write the document to output_rel_path as the LLM streams it
+            
+        Returns:
+            Document id, name, file_path, content, generated_at and cache_hit
+        """
         # Store project_id for context retrieval
         if project_id:
             self.project_id = project_id
@@ -342,7 +572,10 @@ class GenericDocumentAgent(BaseAgent):
         )
         
         try:
-            content = await self.async_generate(user_idea, dependency_documents, project_id)
+            content, cache_hit = await self._async_generate(
+                user_idea, dependency_documents, project_id,
+                stream_to=output_rel_path if stream else None
+            )
             logger.debug(
                 "Document %s generated [Size: %d chars] [Project: %s]",
                 self.definition.id,
@@ -359,8 +592,9 @@ class GenericDocumentAgent(BaseAgent):
             )
             raise
 
-        # Generate virtual file path for reference (not used for actual file storage)
-        virtual_path = f"docs/{output_rel_path}"
+        # Generate virtual file path for reference (not used for actual file storage
+        # unless the document was streamed to disk)
+        virtual_path = str(self.file_manager.resolve_path(output_rel_path)) if stream else f"docs/{output_rel_path}"
         logger.debug(
             "Document %s saving to database (virtual path: %s) [Project: %s]",
             self.definition.id,
@@ -371,34 +605,20 @@ class GenericDocumentAgent(BaseAgent):
         # Save to database if context_manager is available
         if project_id and self.context_manager:
             try:
-                from src.context.shared_context import AgentType, DocumentStatus, AgentOutput
-                # Try to map document_id to AgentType
-                agent_type = None
-                try:
-                    agent_type = AgentType(self.definition.id)
-                except ValueError:
-                    # Not a standard AgentType - use GENERIC_DOCUMENT as fallback
-                    # This allows us to save any document type to the database
-                    logger.debug(f"Document {self.definition.id} not in AgentType enum, using GENERIC_DOCUMENT fallback")
-                    # Use a generic agent type that exists in the enum
-                    # We'll use document_type to identify the actual document
-                    try:
-                        # Try to use a generic type that makes sense
-                        agent_type = AgentType.TECHNICAL_DOCUMENTATION  # Generic fallback
-                    except:
-                        # Last resort - use any available type
-                        agent_type = list(AgentType)[0]  # Use first available type
+                from src.context.shared_context import AgentType, agent_type_for_document
+                # Documents without a dedicated AgentType are saved under a generic one;
+                # document_type identifies the actual document
+                agent_type = agent_type_for_document(self.definition.id)
+                if agent_type is None:
+                    logger.debug("Document %s not in AgentType enum, using TECHNICAL_DOCUMENTATION fallback", self.definition.id)
+                    agent_type = AgentType.TECHNICAL_DOCUMENTATION
                 
                 # Always save to database - document_type identifies the actual document
-                output = AgentOutput(
-                    agent_type=agent_type,
-                    document_type=self.definition.id,  # This is the key identifier
-                    content=content,
-                    file_path=virtual_path,  # Virtual path for reference only
-                    status=DocumentStatus.COMPLETE,
-                    generated_at=datetime.now()
+                # document_type (the definition ID) is the key identifier; file_path is virtual
+                await run_agent_io(
+                    self._persist, content, agent_type, self.definition.id,
+                    virtual_path, project_id, self.context_manager, cache_hit
                 )
-                self.context_manager.save_agent_output(project_id, output)
                 logger.info(f"✅ Document {self.definition.id} saved to database [agent_type: {agent_type.value}, document_type: {self.definition.id}]")
             except Exception as e:
                 logger.error(f"❌ Could not save document {self.definition.id} to database: {e}", exc_info=True)
@@ -408,6 +628,7 @@ class GenericDocumentAgent(BaseAgent):
             "name": self.definition.name,
             "file_path": virtual_path,  # Virtual path for reference only
             "content": content,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": _now().isoformat(),
+            "cache_hit": cache_hit,
         }
 
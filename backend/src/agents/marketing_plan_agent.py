@@ -2,11 +2,13 @@
 Marketing Plan Agent
 Specialized agent for generating marketing plans and GTM strategies
 """
-from typing import Optional, Dict
+from functools import partial
+from typing import Any, Dict, List, Optional
 from src.agents.base_agent import BaseAgent
-from src.utils.file_manager import FileManager
+from src.utils.file_manager import FileManager, get_file_manager
 from src.rate_limit.queue_manager import RequestQueue
 from prompts.system_prompts import get_marketing_plan_prompt
+from src.utils.prompt_registry import get_cached_prompt
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -48,9 +50,9 @@ class MarketingPlanAgent(BaseAgent):
             **provider_kwargs
         )
         
-        self.file_manager = file_manager or FileManager(base_dir="docs/marketing")
+        self.file_manager = file_manager or get_file_manager("docs/marketing")
     
-    def generate(
+    def _build_prompt(
         self,
         user_idea: str,
         requirements_summary: Optional[Dict] = None,
@@ -58,19 +60,7 @@ class MarketingPlanAgent(BaseAgent):
         business_model_summary: Optional[str] = None,
         dependency_documents: Optional[Dict[str, Dict[str, str]]] = None
     ) -> str:
-        """
-        Generate marketing plan document
-        
-        Args:
-            user_idea: User's project idea
-            requirements_summary: Requirements summary dict (optional)
-            project_charter_summary: Project charter content (optional)
-            business_model_summary: Business model content (optional)
-            dependency_documents: Dependency documents dict (optional)
-            
-        Returns:
-            Generated marketing plan document (Markdown)
-        """
+        """Build the expert marketing plan prompt from the idea and dependency documents"""
         # Build requirements summary if not provided
         if not requirements_summary:
             requirements_summary = {"user_idea": user_idea}
@@ -87,18 +77,107 @@ class MarketingPlanAgent(BaseAgent):
                 if feature_roadmap and not project_charter_summary:
                     project_charter_summary = feature_roadmap[:2000]  # Use as context
         
-        # Get expert prompt
-        full_prompt = get_marketing_plan_prompt(
-            requirements_summary=requirements_summary,
-            project_charter_summary=project_charter_summary,
-            business_model_summary=business_model_summary
+        # Get expert prompt (reused when the same summaries are seen again, e.g. on retries)
+        return get_cached_prompt(
+            "marketing_plan",
+            [requirements_summary, project_charter_summary, business_model_summary],
+            partial(
+                get_marketing_plan_prompt,
+                requirements_summary=requirements_summary,
+                project_charter_summary=project_charter_summary,
+                business_model_summary=business_model_summary
+            )
+        )
+    
+    def generate(
+        self,
+        user_idea: str,
+        requirements_summary: Optional[Dict] = None,
+        project_charter_summary: Optional[str] = None,
+        business_model_summary: Optional[str] = None,
+        dependency_documents: Optional[Dict[str, Dict[str, str]]] = None,
+        bypass_cache: bool = False
+    ) -> str:
+        """
+        Generate marketing plan document
+        
+        Args:
+            user_idea: User's project idea
+            requirements_summary: Requirements summary dict (optional)
+            project_charter_summary: Project charter content (optional)
+            business_model_summary: Business model content (optional)
+            dependency_documents: Dependency documents dict (optional)
+            bypass_cache: Skip the LLM response cache and force a fresh call
+            
+        Returns:
+            Generated marketing plan document (Markdown)
+        """
+        full_prompt = self._build_prompt(
+            user_idea,
+            requirements_summary,
+            project_charter_summary,
+            business_model_summary,
+            dependency_documents
+        )
+        
+        try:
+            marketing_plan = self._call_llm_cached(full_prompt, bypass_cache=bypass_cache)
+            logger.info("✅ Marketing plan generated!")
+            return marketing_plan
+        except Exception as e:
+            logger.error("Error generating marketing plan: %s", e)
+            raise
+    
+    def batch_generate(self, items: List[Dict[str, Any]], bypass_cache: bool = False) -> List[str]:
+        """
+        Generate marketing plan documents for many inputs through the provider batch API
+        
+        Args:
+            items: Keyword arguments for generate() (user_idea, requirements_summary, ...) per document
+            bypass_cache: Skip the LLM response cache and force fresh calls
+            
+        Returns:
+            Generated documents, in input order
+        """
+        prompts = [self._build_prompt(**item) for item in items]
+        return self._batch_call_llm(prompts, bypass_cache=bypass_cache)
+    
+    async def async_generate(
+        self,
+        user_idea: str,
+        requirements_summary: Optional[Dict] = None,
+        project_charter_summary: Optional[str] = None,
+        business_model_summary: Optional[str] = None,
+        dependency_documents: Optional[Dict[str, Dict[str, str]]] = None,
+        bypass_cache: bool = False
+    ) -> str:
+        """
+        Generate marketing plan document (async version)
+        
+        Args:
+            user_idea: User's project idea
+            requirements_summary: Requirements summary dict (optional)
+            project_charter_summary: Project charter content (optional)
+            business_model_summary: Business model content (optional)
+            dependency_documents: Dependency documents dict (optional)
+            bypass_cache: Skip the LLM response cache and force a fresh call
+            
+        Returns:
+            Generated marketing plan document (Markdown)
+        """
+        full_prompt = self._build_prompt(
+            user_idea,
+            requirements_summary,
+            project_charter_summary,
+            business_model_summary,
+            dependency_documents
         )
         
         try:
-            marketing_plan = self._call_llm(full_prompt)
+            marketing_plan = await self._async_call_llm_cached(full_prompt, bypass_cache=bypass_cache)
             logger.info("✅ Marketing plan generated!")
             return marketing_plan
         except Exception as e:
-            logger.error(f"Error generating marketing plan: {e}")
+            logger.error("Error generating marketing plan: %s", e)
             raise
 
@@ -2,19 +2,37 @@
 Quality Reviewer Agent
 Reviews and improves all generated documentation
 """
+from collections import OrderedDict
+from functools import partial
 from typing import Optional, Dict
-from datetime import datetime
-from src.agents.base_agent import BaseAgent
-from src.utils.file_manager import FileManager
+from src.agents.base_agent import BaseAgent, run_agent_io
+from src.utils.file_manager import FileManager, get_file_manager
 from src.context.context_manager import ContextManager
-from src.context.shared_context import AgentType, DocumentStatus, AgentOutput
+from src.context.shared_context import AgentType
 from src.quality.quality_checker import QualityChecker
 from src.quality.document_type_quality_checker import DocumentTypeQualityChecker
 from src.rate_limit.queue_manager import RequestQueue
+from src.utils.llm_cache import DEFAULT_CACHE_PATH as LLM_CACHE_PATH
+from src.utils.logger import get_logger
+from src.utils.prompt_registry import get_cached_prompt
+from src.utils.semantic_cache import SemanticCache
 from prompts.system_prompts import get_quality_reviewer_prompt, get_structured_quality_feedback_prompt
+import hashlib
 import json
+import os
 import re
 
+logger = get_logger(__name__)
+
+# Structured feedback parsing, run on every LLM review response
+_FEEDBACK_JSON_PATTERN = re.compile(r'\{[^{}]*"score"[^{}]*\}', re.DOTALL)
+_FEEDBACK_CODE_BLOCK_PATTERN = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_SCORE_FIELD_PATTERN = re.compile(r'"score"\s*:\s*([\d.]+)')
+_SUGGESTION_FIELD_PATTERN = re.compile(r'"suggestion"\s*:\s*"([^"]+)"')
+
+# Structured feedback semantic caches live next to the exact LLM cache
+FEEDBACK_SEMANTIC_CACHE_DIR = os.path.join(os.path.dirname(LLM_CACHE_PATH), "review")
+
 
 class QualityReviewerAgent(BaseAgent):
     """
@@ -30,6 +48,17 @@ class QualityReviewerAgent(BaseAgent):
     - Quality metrics
     """
     
+    # Maximum number of review reports kept in the per-agent cache
+    REVIEW_CACHE_SIZE = 8
+    
+    # Structured feedback is reused for a document of the same type whose
+    # leading content embeds this close to one already reviewed (and whose
+    # remaining content and automated scores are identical)
+    FEEDBACK_SEMANTIC_THRESHOLD = 0.95
+    FEEDBACK_SEMANTIC_PREFIX_CHARS = 2048
+    FEEDBACK_SEMANTIC_TTL = 7 * 24 * 3600
+    FEEDBACK_SEMANTIC_MAX_ENTRIES = 256
+    
     def __init__(
         self,
         provider_name: Optional[str] = None,
@@ -38,9 +67,16 @@ class QualityReviewerAgent(BaseAgent):
         file_manager: Optional[FileManager] = None,
         quality_checker: Optional[QualityChecker] = None,
         api_key: Optional[str] = None,
+        semantic_cache: bool = False,
         **provider_kwargs
     ):
-        """Initialize Quality Reviewer Agent"""
+        """
+        Initialize Quality Reviewer Agent
+        
+        Args:
+            semantic_cache: Reuse structured feedback given to a near-duplicate
+                document of the same type (requires sentence-transformers)
+        """
         super().__init__(
             provider_name=provider_name,
             model_name=model_name,
@@ -49,10 +85,95 @@ class QualityReviewerAgent(BaseAgent):
             **provider_kwargs
         )
         
-        self.file_manager = file_manager or FileManager(base_dir="docs/quality")
+        self.file_manager = file_manager or get_file_manager("docs/quality")
         self.quality_checker = quality_checker or QualityChecker()
         # Use document-type-aware quality checker for better accuracy
         self.document_type_checker = DocumentTypeQualityChecker()
+        
+        # Cache review reports for repeated calls with identical documentation
+        self.cache_enabled = True
+        self._review_cache: "OrderedDict[str, str]" = OrderedDict()
+        
+        # Opt-in: one semantic cache per document type, so only same-type documents can match
+        self.semantic_cache = semantic_cache
+        self._feedback_semantic_caches: Dict[str, SemanticCache] = {}
+    
+    def _feedback_semantic_cache(self, document_type: str) -> SemanticCache:
+        """Semantic cache of structured feedback for one document type (created on first use)"""
+        cache = self._feedback_semantic_caches.get(document_type)
+        if cache is None:
+            slug = re.sub(r"[^a-z0-9]+", "_", document_type.lower()).strip("_") or "document"
+            cache = SemanticCache(
+                path=os.path.expanduser(os.path.join(FEEDBACK_SEMANTIC_CACHE_DIR, f"{slug}.sqlite")),
+                ttl=self.FEEDBACK_SEMANTIC_TTL,
+                max_entries=self.FEEDBACK_SEMANTIC_MAX_ENTRIES,
+            )
+            self._feedback_semantic_caches[document_type] = cache
+        return cache
+    
+    def _feedback_digests(self, document_content: str, automated_scores: Optional[Dict]) -> Dict[str, str]:
+        """Digests of what the embedded prefix does not cover: the content tail and the automated scores"""
+        tail = document_content[self.FEEDBACK_SEMANTIC_PREFIX_CHARS:]
+        scores = json.dumps(automated_scores or {}, sort_keys=True, default=str)
+        return {
+            "content": hashlib.sha256(tail.encode("utf-8")).hexdigest(),
+            "scores": hashlib.sha256(scores.encode("utf-8")).hexdigest(),
+        }
+    
+    def _feedback_semantic_lookup(
+        self,
+        document_content: str,
+        document_type: str,
+        automated_scores: Optional[Dict] = None
+    ) -> Optional[str]:
+        if not self.semantic_cache:
+            return None
+        try:
+            entry = self._feedback_semantic_cache(document_type).lookup(
+                document_content[:self.FEEDBACK_SEMANTIC_PREFIX_CHARS],
+                threshold=self.FEEDBACK_SEMANTIC_THRESHOLD,
+            )
+            if entry is None:
+                return None
+            entry = json.loads(entry)
+            if entry.get("digests") != self._feedback_digests(document_content, automated_scores):
+                logger.debug("Feedback semantic cache hit rejected: content tail or scores differ")
+                return None
+            return entry["response"]
+        except Exception as e:
+            logger.warning("Feedback semantic cache lookup failed: %s", e)
+            return None
+    
+    def _feedback_semantic_store(
+        self,
+        document_content: str,
+        document_type: str,
+        response: str,
+        automated_scores: Optional[Dict] = None
+    ) -> None:
+        if not self.semantic_cache:
+            return
+        try:
+            entry = {
+                "response": response,
+                "digests": self._feedback_digests(document_content, automated_scores),
+            }
+            self._feedback_semantic_cache(document_type).add(
+                document_content[:self.FEEDBACK_SEMANTIC_PREFIX_CHARS], json.dumps(entry)
+            )
+        except Exception as e:
+            logger.warning("Feedback semantic cache store failed: %s", e)
+    
+    @staticmethod
+    def _documentation_cache_key(all_documentation: Dict[str, str]) -> str:
+        """Build a stable cache key from (document name, content) pairs"""
+        hasher = hashlib.md5()
+        for doc_name, doc_content in sorted(all_documentation.items()):
+            hasher.update(doc_name.encode("utf-8"))
+            hasher.update(b"\0")
+            hasher.update((doc_content or "").encode("utf-8"))
+            hasher.update(b"\0")
+        return hasher.hexdigest()
     
     def generate(self, all_documentation: Dict[str, str]) -> str:
         """
@@ -64,20 +185,28 @@ class QualityReviewerAgent(BaseAgent):
         Returns:
             Generated quality review report (Markdown)
         """
+        cache_key = None
+        if self.cache_enabled:
+            cache_key = self._documentation_cache_key(all_documentation)
+            cached_report = self._review_cache.get(cache_key)
+            if cached_report is not None:
+                self._review_cache.move_to_end(cache_key)
+                logger.debug("Using cached quality review report (%d documents)", len(all_documentation))
+                return cached_report
+        
         # First run automated quality checks using document-type-aware checker
+        # (one batch call; the base checker is only a fallback for failed documents)
+        type_aware_results = self.document_type_checker.check_multiple_documents(all_documentation)
         automated_scores = {}
         for doc_name, doc_content in all_documentation.items():
+            quality_result = type_aware_results.get(doc_name, {})
+            if quality_result and not quality_result.get("error"):
+                automated_scores[doc_name] = quality_result
+                continue
+            
             try:
-                # Use document-type-aware checker for better accuracy
-                quality_result = self.document_type_checker.check_multiple_documents(
-                    {doc_name: doc_content}
-                ).get(doc_name, {})
-                
                 # Fallback to base checker if document-type checker fails
-                if not quality_result or quality_result.get("error"):
-                    quality_result = self.quality_checker.check_quality(doc_content)
-                
-                automated_scores[doc_name] = quality_result
+                automated_scores[doc_name] = self.quality_checker.check_quality(doc_content)
             except Exception as e:
                 # Skip quality check for this document if it fails
                 automated_scores[doc_name] = {
@@ -90,7 +219,12 @@ class QualityReviewerAgent(BaseAgent):
                 }
         
         # Get prompt from centralized prompts config
-        full_prompt = get_quality_reviewer_prompt(all_documentation)
+        # (summarizing long documents is expensive, so reuse the prompt for unchanged input)
+        full_prompt = get_cached_prompt(
+            "quality_reviewer",
+            all_documentation,
+            partial(get_quality_reviewer_prompt, all_documentation)
+        )
         
         # Add automated scores to prompt for LLM context
         if automated_scores:
@@ -125,11 +259,12 @@ class QualityReviewerAgent(BaseAgent):
             
             full_prompt += scores_summary + "\n\nConsider these automated scores in your review. Focus on improving documents with low scores."
         
-        
-        stats = self.get_stats()
-        
         try:
             review_report = self._call_llm(full_prompt)
+            if cache_key is not None:
+                self._review_cache[cache_key] = review_report
+                if len(self._review_cache) > self.REVIEW_CACHE_SIZE:
+                    self._review_cache.popitem(last=False)
             return review_report
         except Exception as e:
             raise
@@ -158,20 +293,15 @@ class QualityReviewerAgent(BaseAgent):
         
         # Generate virtual file path for reference (not used for actual file storage)
         virtual_path = f"docs/{output_filename}"
-        logger.info(f"Quality review report saving to database (virtual path: {virtual_path})")
+        logger.info("Quality review report saving to database (virtual path: %s)", virtual_path)
         
         # Save to database
         try:
             if project_id and context_manager:
-                output = AgentOutput(
-                    agent_type=AgentType.QUALITY_REVIEWER,
-                    document_type="quality_review",
-                    content=review_report,
-                    file_path=virtual_path,  # Virtual path for reference only
-                    status=DocumentStatus.COMPLETE,
-                    generated_at=datetime.now()
+                self._persist(
+                    review_report, AgentType.QUALITY_REVIEWER, "quality_review",
+                    virtual_path, project_id, context_manager
                 )
-                context_manager.save_agent_output(project_id, output)
                 logger.info("✅ Quality review report saved to database")
             else:
                 logger.warning("⚠️  No context manager available, review report not saved")
@@ -210,60 +340,110 @@ class QualityReviewerAgent(BaseAgent):
                 "priority_improvements": List[Dict]
             }
         """
-        # Get LLM focus questions from automated_scores if available
-        llm_focus = automated_scores.get("llm_focus", []) if automated_scores else []
+        try:
+            response = self._feedback_semantic_lookup(document_content, document_type, automated_scores)
+            if response is None:
+                # Call LLM to generate structured feedback
+                prompt = self._build_structured_feedback_prompt(document_content, document_type, automated_scores)
+                response = self._call_llm_cached(prompt)
+                self._feedback_semantic_store(document_content, document_type, response, automated_scores)
+            return self._parse_structured_feedback(response)
+        except Exception as e:
+            logger.error("Error generating structured feedback: %s", e, exc_info=True)
+            return self._fallback_structured_feedback(e, automated_scores)
+    
+    async def async_generate_structured_feedback(
+        self,
+        document_content: str,
+        document_type: str,
+        automated_scores: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Generate structured JSON feedback for a single document (async version)
+        
+        Awaits the provider's async client directly instead of running
+        generate_structured_feedback on a worker thread.
         
-        # Get structured feedback prompt (with llm_focus if available)
-        prompt = get_structured_quality_feedback_prompt(
+        Args:
+            document_content: The document content to review
+            document_type: Type of document (e.g., "api_documentation", "technical_documentation")
+            automated_scores: Optional automated quality scores from QualityChecker
+        
+        Returns:
+            Dict with structured feedback (same shape as generate_structured_feedback)
+        """
+        try:
+            response = None
+            if self.semantic_cache:
+                response = await run_agent_io(
+                    self._feedback_semantic_lookup, document_content, document_type, automated_scores
+                )
+            if response is None:
+                prompt = self._build_structured_feedback_prompt(document_content, document_type, automated_scores)
+                response = await self._async_call_llm_cached(prompt)
+                if self.semantic_cache:
+                    await run_agent_io(
+                        self._feedback_semantic_store, document_content, document_type, response, automated_scores
+                    )
+            return self._parse_structured_feedback(response)
+        except Exception as e:
+            logger.error("Error generating structured feedback: %s", e, exc_info=True)
+            return self._fallback_structured_feedback(e, automated_scores)
+    
+    @staticmethod
+    def _build_structured_feedback_prompt(
+        document_content: str,
+        document_type: str,
+        automated_scores: Optional[Dict]
+    ) -> str:
+        """Build the LLM-as-Judge prompt, including llm_focus questions when available"""
+        llm_focus = automated_scores.get("llm_focus", []) if automated_scores else []
+        return get_structured_quality_feedback_prompt(
             document_content=document_content,
             document_type=document_type,
             automated_scores=automated_scores,
             llm_focus_questions=llm_focus
         )
+    
+    def _parse_structured_feedback(self, response: str) -> Dict:
+        """Extract and normalize the JSON feedback from an LLM response"""
+        # Extract JSON from response (handle cases where LLM adds markdown or explanations)
+        json_match = _FEEDBACK_JSON_PATTERN.search(response)
+        if json_match:
+            json_str = json_match.group(0)
+        else:
+            # Try to find JSON in code blocks
+            json_block = _FEEDBACK_CODE_BLOCK_PATTERN.search(response)
+            if json_block:
+                json_str = json_block.group(1)
+            else:
+                # Try to parse entire response as JSON
+                json_str = response.strip()
         
+        # Parse JSON
         try:
-            # Call LLM to generate structured feedback
-            response = self._call_llm(prompt)
-            
-            # Extract JSON from response (handle cases where LLM adds markdown or explanations)
-            json_match = re.search(r'\{[^{}]*"score"[^{}]*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-            else:
-                # Try to find JSON in code blocks
-                json_block = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
-                if json_block:
-                    json_str = json_block.group(1)
-                else:
-                    # Try to parse entire response as JSON
-                    json_str = response.strip()
-            
-            # Parse JSON
-            try:
-                feedback_data = json.loads(json_str)
-            except json.JSONDecodeError:
-                # If JSON parsing fails, try to extract key fields manually
-                logger.warning(f"Failed to parse JSON feedback, attempting fallback extraction")
-                feedback_data = self._extract_feedback_fallback(response)
-            
-            # Validate and normalize feedback structure
-            feedback_data = self._validate_feedback_structure(feedback_data)
-            
-            return feedback_data
-            
-        except Exception as e:
-            logger.error(f"Error generating structured feedback: {e}", exc_info=True)
-            # Return fallback feedback structure
-            return {
-                "score": automated_scores.get("overall_score", 5.0) / 10.0 if automated_scores else 5.0,
-                "feedback": f"Quality review failed: {str(e)}",
-                "suggestion": "Review the document manually and check for completeness and clarity",
-                "missing_sections": automated_scores.get("sections", {}).get("missing_sections", [])[:5] if automated_scores else [],
-                "strengths": [],
-                "weaknesses": ["Quality review generation failed"],
-                "readability_issues": [],
-                "priority_improvements": []
-            }
+            feedback_data = json.loads(json_str)
+        except json.JSONDecodeError:
+            # If JSON parsing fails, try to extract key fields manually
+            logger.warning("Failed to parse JSON feedback, attempting fallback extraction")
+            feedback_data = self._extract_feedback_fallback(response)
+        
+        # Validate and normalize feedback structure
+        return self._validate_feedback_structure(feedback_data)
+    
+    @staticmethod
+    def _fallback_structured_feedback(error: Exception, automated_scores: Optional[Dict]) -> Dict:
+        """Feedback structure returned when the LLM review fails"""
+        return {
+            "score": automated_scores.get("overall_score", 5.0) / 10.0 if automated_scores else 5.0,
+            "feedback": f"Quality review failed: {str(error)}",
+            "suggestion": "Review the document manually and check for completeness and clarity",
+            "missing_sections": automated_scores.get("sections", {}).get("missing_sections", [])[:5] if automated_scores else [],
+            "strengths": [],
+            "weaknesses": ["Quality review generation failed"],
+            "readability_issues": [],
+            "priority_improvements": []
+        }
     
     def _extract_feedback_fallback(self, response: str) -> Dict:
         """Extract feedback from response when JSON parsing fails"""
@@ -279,7 +459,7 @@ class QualityReviewerAgent(BaseAgent):
         }
         
         # Try to extract score
-        score_match = re.search(r'"score"\s*:\s*([\d.]+)', response)
+        score_match = _SCORE_FIELD_PATTERN.search(response)
         if score_match:
             try:
                 feedback_data["score"] = float(score_match.group(1))
@@ -287,7 +467,7 @@ class QualityReviewerAgent(BaseAgent):
                 pass
         
         # Try to extract suggestion
-        suggestion_match = re.search(r'"suggestion"\s*:\s*"([^"]+)"', response)
+        suggestion_match = _SUGGESTION_FIELD_PATTERN.search(response)
         if suggestion_match:
             feedback_data["suggestion"] = suggestion_match.group(1)
         
@@ -2,16 +2,20 @@
 Requirements Analyst Agent
 Uses OOP structure with BaseAgent inheritance
 """
-from typing import Optional
-from src.agents.base_agent import BaseAgent
-from src.utils.file_manager import FileManager
+import hashlib
+from functools import partial
+from typing import List, Optional, Tuple
+from src.agents.base_agent import BaseAgent, run_agent_io
+from src.utils.file_manager import FileManager, get_file_manager
 from src.utils.requirements_parser import RequirementsParser
 from src.rate_limit.queue_manager import RequestQueue
 from src.context.context_manager import ContextManager
-from src.context.shared_context import RequirementsDocument, AgentType, DocumentStatus, AgentOutput
+from src.context.shared_context import RequirementsDocument, AgentType
 from prompts.system_prompts import get_requirements_prompt
+from src.utils.prompt_registry import get_cached_prompt
 from pathlib import Path
 from src.utils.logger import get_logger
+from src.utils.semantic_cache import SemanticCache, semantic_cache_path
 
 logger = get_logger(__name__)
 
@@ -30,6 +34,7 @@ class RequirementsAnalyst(BaseAgent):
         rate_limiter: Optional[RequestQueue] = None,
         file_manager: Optional[FileManager] = None,
         api_key: Optional[str] = None,
+        semantic_cache: bool = False,
         **provider_kwargs
     ):
         """
@@ -41,6 +46,8 @@ class RequirementsAnalyst(BaseAgent):
             rate_limiter: Shared rate limiter (optional)
             file_manager: File manager instance (optional)
             api_key: API key (optional, loads from env vars if not provided)
+            semantic_cache: Reuse documents generated for near-duplicate user ideas
+                (requires sentence-transformers; off by default to avoid false hits)
             **provider_kwargs: Additional provider-specific configuration
         
         Examples:
@@ -66,46 +73,104 @@ class RequirementsAnalyst(BaseAgent):
         )
         
         # Initialize file manager
-        self.file_manager = file_manager or FileManager(base_dir="docs/requirements")
+        self.file_manager = file_manager or get_file_manager("docs/requirements")
 
         # Initialize requirements parser
         self.parser = RequirementsParser()
+        # Last (content digest, parsed document), so re-saving the same document skips the parse
+        self._last_parse: Optional[Tuple[bytes, RequirementsDocument]] = None
 
         # Context manager (optional, will be set when project_id is provided)
         self.context_manager: Optional[ContextManager] = None
         self.project_id: Optional[str] = None
+
+        # Semantic cache for near-duplicate user ideas (optional)
+        self.semantic_cache: Optional[SemanticCache] = SemanticCache(
+            path=semantic_cache_path("requirements")
+        ) if semantic_cache else None
+    
+    def _build_prompt(self, user_idea: str) -> str:
+        """Build the requirements prompt (shared by the sync, async and batch paths)"""
+        return get_cached_prompt("requirements", user_idea, partial(get_requirements_prompt, user_idea))
     
-    def generate(self, user_idea: str) -> str:
+    def generate(self, user_idea: str, bypass_cache: bool = False) -> str:
         """
         Generate requirements document from user idea
         
         Args:
             user_idea: User's project idea/requirement
+            bypass_cache: Skip the LLM response cache and force a fresh call
             
         Returns:
             Generated requirements document (Markdown)
         """
         # Get prompt from centralized prompts config
-        full_prompt = get_requirements_prompt(user_idea)
+        full_prompt = self._build_prompt(user_idea)
         
+        if self.semantic_cache and not bypass_cache:
+            cached_doc = self.semantic_cache.lookup(user_idea, threshold=0.90, top_k=5)
+            if cached_doc is not None:
+                return cached_doc
         
-        # Check rate limit stats
-        stats = self.get_stats()
+        try:
+            requirements_doc = self._call_llm_cached(full_prompt, bypass_cache=bypass_cache)
+            logger.info("Requirements document generated!")
+            if self.semantic_cache:
+                self.semantic_cache.add(user_idea, requirements_doc)
+            return requirements_doc
+        except Exception as e:
+            logger.error("Error generating requirements: %s", e)
+            raise
+    
+    async def async_generate(self, user_idea: str, bypass_cache: bool = False) -> str:
+        """
+        Generate requirements document from user idea (async version)
+        
+        Args:
+            user_idea: User's project idea/requirement
+            bypass_cache: Skip the LLM response cache and force a fresh call
+            
+        Returns:
+            Generated requirements document (Markdown)
+        """
+        full_prompt = self._build_prompt(user_idea)
+        
+        if self.semantic_cache and not bypass_cache:
+            cached_doc = self.semantic_cache.lookup(user_idea, threshold=0.90, top_k=5)
+            if cached_doc is not None:
+                return cached_doc
         
         try:
-            requirements_doc = self._call_llm(full_prompt)
-            logger.info("✅ Requirements document generated!")
+            requirements_doc = await self._async_call_llm_cached(full_prompt, bypass_cache=bypass_cache)
+            logger.info("Requirements document generated!")
+            if self.semantic_cache:
+                self.semantic_cache.add(user_idea, requirements_doc)
             return requirements_doc
         except Exception as e:
-            logger.error(f"Error generating requirements: {e}")
+            logger.error("Error generating requirements: %s", e)
             raise
     
+    def batch_generate(self, user_ideas: List[str], bypass_cache: bool = False) -> List[str]:
+        """
+        Generate requirements documents for many ideas through the provider batch API
+        
+        Args:
+            user_ideas: User project ideas
+            bypass_cache: Skip the LLM response cache and force fresh calls
+            
+        Returns:
+            Generated requirements documents, in input order
+        """
+        prompts = [self._build_prompt(user_idea) for user_idea in user_ideas]
+        return self._batch_call_llm(prompts, bypass_cache=bypass_cache)
+    
     def generate_and_save(
         self,
         user_idea: str,
         output_filename: str = "requirements.md",
         project_id: Optional[str] = None,
-        context_manager: Optional[ContextManager] = None
+        context_manager: Optional[ContextManager] = None,
+        stream: bool = False
     ) -> str:
         """
         Generate requirements and save to file
@@ -115,6 +180,7 @@ class RequirementsAnalyst(BaseAgent):
             output_filename: Filename to save (will be saved in base_dir)
             project_id: Optional project ID for context sharing
             context_manager: Optional context manager for saving to shared context
+            stream: Stream the LLM response into output_filename (under base_dir) as it arrives
             
         Returns:
             Absolute path to saved file
@@ -125,29 +191,91 @@ class RequirementsAnalyst(BaseAgent):
             self.context_manager = context_manager
         
         # Generate requirements
-        logger.info(f"Starting requirements generation for: {output_filename}")
-        requirements_doc = self.generate(user_idea)
-        logger.debug(f"Requirements document generated (length: {len(requirements_doc)} characters)")
+        logger.info("Starting requirements generation for: %s", output_filename)
+        if stream:
+            requirements_doc = self._generate_streaming(user_idea, output_filename)
+        else:
+            requirements_doc = self.generate(user_idea)
+        logger.debug("Requirements document generated (length: %d characters)", len(requirements_doc))
         
         # Save to database (not to file)
         try:
             # Generate virtual file path for reference (not used for actual file storage)
             virtual_path = f"docs/{output_filename}"
-            logger.info(f"Requirements document saving to database (virtual path: {virtual_path})")
+            logger.info("Requirements document saving to database (virtual path: %s)", virtual_path)
             
             # Save to context/database (with improved parsing)
             if self.project_id and self.context_manager:
                 self._save_to_context(requirements_doc, virtual_path, user_idea)
-                logger.info("✅ Requirements document saved to database")
+                logger.info("Requirements document saved to database")
             else:
-                logger.warning("⚠️  No context manager available, document not saved to database")
+                logger.warning("No context manager available, document not saved to database")
             
             return virtual_path  # Return virtual path for compatibility
         except Exception as e:
-            logger.error(f"Error saving requirements to database: {str(e)}", exc_info=True)
-            logger.error("❌ Error saving to database: {{e}}")
+            logger.exception("Error saving requirements to database: %s", e)
             raise
     
+    def _generate_streaming(self, user_idea: str, output_filename: str) -> str:
+        """Stream the requirements document into a file, returning the full text"""
+        parts = []
+        with self.file_manager.open_stream(output_filename) as f:
+            for chunk in self._stream_llm(self._build_prompt(user_idea)):
+                f.write(chunk)
+                parts.append(chunk)
+        requirements_doc = "".join(parts)
+        logger.info("Requirements document generated!")
+        return requirements_doc
+    
+    async def async_generate_and_save(
+        self,
+        user_idea: str,
+        output_filename: str = "requirements.md",
+        project_id: Optional[str] = None,
+        context_manager: Optional[ContextManager] = None
+    ) -> str:
+        """
+        Generate requirements and save to file (async version)
+        
+        Args:
+            user_idea: User's project idea
+            output_filename: Filename to save (will be saved in base_dir)
+            project_id: Optional project ID for context sharing
+            context_manager: Optional context manager for saving to shared context
+            
+        Returns:
+            Virtual path of the saved document
+        """
+        if project_id and context_manager:
+            self.project_id = project_id
+            self.context_manager = context_manager
+        
+        logger.info("Starting requirements generation for: %s", output_filename)
+        requirements_doc = await self.async_generate(user_idea)
+        logger.debug("Requirements document generated (length: %d characters)", len(requirements_doc))
+        
+        virtual_path = f"docs/{output_filename}"
+        if self.project_id and self.context_manager:
+            # Database writes are blocking, keep them off the event loop
+            await run_agent_io(self._save_to_context, requirements_doc, virtual_path, user_idea)
+            logger.info("Requirements document saved to database")
+        else:
+            logger.warning("No context manager available, document not saved to database")
+        
+        return virtual_path
+    
+    def _parse_requirements(self, requirements_doc: str, user_idea: str) -> RequirementsDocument:
+        """Parse a requirements document, reusing the previous result for identical input"""
+        key = hashlib.blake2b(
+            f"{user_idea}\0{requirements_doc}".encode("utf-8"), digest_size=16
+        ).digest()
+        if self._last_parse is not None and self._last_parse[0] == key:
+            return self._last_parse[1]
+        
+        req_doc = self.parser.parse_markdown(requirements_doc, user_idea)
+        self._last_parse = (key, req_doc)
+        return req_doc
+    
     def _save_to_context(self, requirements_doc: str, file_path: str, user_idea: str):
         """Save requirements to shared context with intelligent parsing"""
         if not self.project_id or not self.context_manager:
@@ -155,34 +283,28 @@ class RequirementsAnalyst(BaseAgent):
             return
 
         try:
-            logger.info(f"Saving requirements to context (project: {self.project_id})")
+            logger.info("Saving requirements to context (project: %s)", self.project_id)
             # Create project if it doesn't exist
             self.context_manager.create_project(self.project_id, user_idea)
 
             # Parse requirements document intelligently
-            req_doc = self.parser.parse_markdown(requirements_doc, user_idea)
-            logger.debug(f"Requirements parsed: {len(req_doc.core_features)} features, "
-                        f"{len(req_doc.user_personas)} personas, "
-                        f"{len(req_doc.business_objectives)} objectives")
+            req_doc = self._parse_requirements(requirements_doc, user_idea)
+            logger.debug(
+                "Requirements parsed: %d features, %d personas, %d objectives",
+                len(req_doc.core_features),
+                len(req_doc.user_personas),
+                len(req_doc.business_objectives)
+            )
 
             # Save parsed requirements to context
             self.context_manager.save_requirements(self.project_id, req_doc)
 
             # Save agent output
-            output = AgentOutput(
-                agent_type=AgentType.REQUIREMENTS_ANALYST,
-                document_type="requirements",
-                content=requirements_doc,
-                file_path=file_path,
-                status=DocumentStatus.COMPLETE
+            self._persist(
+                requirements_doc, AgentType.REQUIREMENTS_ANALYST, "requirements",
+                file_path, self.project_id, self.context_manager
             )
-            self.context_manager.save_agent_output(self.project_id, output)
 
-            logger.info(f"Requirements saved to shared context (project: {self.project_id})")
-            logger.debug(
-                f"Extracted: {len(req_doc.core_features)} features, "
-                  f"{len(req_doc.user_personas)} personas, "
-                f"{len(req_doc.business_objectives)} objectives"
-            )
+            logger.info("Requirements saved to shared context (project: %s)", self.project_id)
         except Exception as e:
-            logger.warning(f"Could not save to context: {str(e)}", exc_info=True)
+            logger.warning("Could not save to context: %s", e, exc_info=True)
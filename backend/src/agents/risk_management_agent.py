@@ -2,11 +2,13 @@
 Risk Management Agent
 Specialized agent for generating risk management plans
 """
-from typing import Optional, Dict
+from functools import partial
+from typing import Any, Dict, List, Optional
 from src.agents.base_agent import BaseAgent
-from src.utils.file_manager import FileManager
+from src.utils.file_manager import FileManager, get_file_manager
 from src.rate_limit.queue_manager import RequestQueue
 from prompts.system_prompts import get_risk_management_prompt
+from src.utils.prompt_registry import get_cached_prompt
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -48,15 +50,48 @@ class RiskManagementAgent(BaseAgent):
             **provider_kwargs
         )
         
-        self.file_manager = file_manager or FileManager(base_dir="docs/risk")
+        self.file_manager = file_manager or get_file_manager("docs/risk")
     
-    def generate(
+    def _build_prompt(
         self,
         user_idea: str,
         requirements_summary: Optional[Dict] = None,
         project_charter_summary: Optional[str] = None,
         business_model_summary: Optional[str] = None,
         dependency_documents: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> str:
+        """Build the expert risk management plan prompt from the idea and dependency documents"""
+        # Build requirements summary if not provided
+        if not requirements_summary:
+            requirements_summary = {"user_idea": user_idea}
+        
+        # Extract dependency documents if provided
+        if dependency_documents:
+            if not project_charter_summary and "project_charter" in dependency_documents:
+                project_charter_summary = dependency_documents["project_charter"].get("content", "")
+            if not business_model_summary and "business_model" in dependency_documents:
+                business_model_summary = dependency_documents["business_model"].get("content", "")
+        
+        # Get expert prompt (reused when the same summaries are seen again, e.g. on retries)
+        return get_cached_prompt(
+            "risk_management_plan",
+            [requirements_summary, project_charter_summary, business_model_summary],
+            partial(
+                get_risk_management_prompt,
+                requirements_summary=requirements_summary,
+                project_charter_summary=project_charter_summary,
+                business_model_summary=business_model_summary
+            )
+        )
+    
+    def generate(
+        self,
+        user_idea: str,
+        requirements_summary: Optional[Dict] = None,
+        project_charter_summary: Optional[str] = None,
+        business_model_summary: Optional[str] = None,
+        dependency_documents: Optional[Dict[str, Dict[str, str]]] = None,
+        bypass_cache: bool = False
     ) -> str:
         """
         Generate risk management plan document
@@ -67,33 +102,77 @@ class RiskManagementAgent(BaseAgent):
             project_charter_summary: Project charter content (optional)
             business_model_summary: Business model content (optional)
             dependency_documents: Dependency documents dict (optional)
+            bypass_cache: Skip the LLM response cache and force a fresh call
             
         Returns:
             Generated risk management plan document (Markdown)
         """
-        # Build requirements summary if not provided
-        if not requirements_summary:
-            requirements_summary = {"user_idea": user_idea}
+        full_prompt = self._build_prompt(
+            user_idea,
+            requirements_summary,
+            project_charter_summary,
+            business_model_summary,
+            dependency_documents
+        )
         
-        # Extract dependency documents if provided
-        if dependency_documents:
-            if not project_charter_summary and "project_charter" in dependency_documents:
-                project_charter_summary = dependency_documents["project_charter"].get("content", "")
-            if not business_model_summary and "business_model" in dependency_documents:
-                business_model_summary = dependency_documents["business_model"].get("content", "")
+        try:
+            risk_plan = self._call_llm_cached(full_prompt, bypass_cache=bypass_cache)
+            logger.info("✅ Risk management plan generated!")
+            return risk_plan
+        except Exception as e:
+            logger.error("Error generating risk management plan: %s", e)
+            raise
+    
+    def batch_generate(self, items: List[Dict[str, Any]], bypass_cache: bool = False) -> List[str]:
+        """
+        Generate risk management plan documents for many inputs through the provider batch API
+        
+        Args:
+            items: Keyword arguments for generate() (user_idea, requirements_summary, ...) per document
+            bypass_cache: Skip the LLM response cache and force fresh calls
+            
+        Returns:
+            Generated documents, in input order
+        """
+        prompts = [self._build_prompt(**item) for item in items]
+        return self._batch_call_llm(prompts, bypass_cache=bypass_cache)
+    
+    async def async_generate(
+        self,
+        user_idea: str,
+        requirements_summary: Optional[Dict] = None,
+        project_charter_summary: Optional[str] = None,
+        business_model_summary: Optional[str] = None,
+        dependency_documents: Optional[Dict[str, Dict[str, str]]] = None,
+        bypass_cache: bool = False
+    ) -> str:
+        """
+        Generate risk management plan document (async version)
         
-        # Get expert prompt
-        full_prompt = get_risk_management_prompt(
-            requirements_summary=requirements_summary,
-            project_charter_summary=project_charter_summary,
-            business_model_summary=business_model_summary
+        Args:
+            user_idea: User's project idea
+            requirements_summary: Requirements summary dict (optional)
+            project_charter_summary: Project charter content (optional)
+            business_model_summary: Business model content (optional)
+            dependency_documents: Dependency documents dict (optional)
+            bypass_cache: Skip the LLM response cache and force a fresh call
+            
+        Returns:
+            Generated risk management plan document (Markdown)
+        """
+        full_prompt = self._build_prompt(
+            user_idea,
+            requirements_summary,
+            project_charter_summary,
+            business_model_summary,
+            dependency_documents
         )
         
         try:
-            risk_plan = self._call_llm(full_prompt)
+            risk_plan = await self._async_call_llm_cached(full_prompt, bypass_cache=bypass_cache)
             logger.info("✅ Risk management plan generated!")
             return risk_plan
         except Exception as e:
-            logger.error(f"Error generating risk management plan: {e}")
+            logger.error("Error generating risk management plan: %s", e)
             raise
 
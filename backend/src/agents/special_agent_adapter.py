@@ -1,19 +1,42 @@
 """Adapter to make special agents compatible with GenericDocumentAgent interface."""
 from __future__ import annotations
 
+import inspect
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Type
 
-from src.agents.base_agent import BaseAgent
+from src.agents.base_agent import BaseAgent, run_agent_io
 from src.agents.requirements_analyst import RequirementsAnalyst
 from src.config.document_catalog import DocumentDefinition
 from src.context.context_manager import ContextManager
-from src.utils.file_manager import FileManager
+from src.utils.file_manager import get_file_manager
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_now = datetime.now
+
+
+@lru_cache(maxsize=None)
+def _accepts_dependency_documents(agent_class: Type[BaseAgent]) -> Optional[bool]:
+    """
+    Inspect an agent class's generate signature once.
+    
+    Args:
+        agent_class: Special agent class
+        
+    Returns:
+        None if the class has no generate method, otherwise whether generate
+        takes dependency_documents or requirements_summary
+    """
+    generate = getattr(agent_class, "generate", None)
+    if generate is None:
+        return None
+    params = inspect.signature(generate).parameters
+    return "dependency_documents" in params or "requirements_summary" in params
+
 
 class SpecialAgentAdapter:
     """Adapter to make special agents work with the coordinator's expected interface."""
@@ -28,7 +51,7 @@ class SpecialAgentAdapter:
     ) -> None:
         self.agent = agent
         self.definition = definition
-        self.file_manager = FileManager(base_dir=base_output_dir)
+        self.file_manager = get_file_manager(base_output_dir)
         self.context_manager = context_manager
         self.project_id = project_id
 
@@ -38,29 +61,19 @@ class SpecialAgentAdapter:
         dependency_documents: Dict[str, Dict[str, str]],
     ) -> str:
         """Generate document content asynchronously."""
-        # For most special agents, we can use the sync generate in an executor
-        # RequirementsAnalyst has special handling
+        # Agents with a native async_generate await the LLM directly; the rest
+        # fall back to BaseAgent.async_generate, which runs generate in a thread
         if isinstance(self.agent, RequirementsAnalyst):
             # RequirementsAnalyst.generate only takes user_idea
-            import asyncio
-
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, self.agent.generate, user_idea)
+            return await self.agent.async_generate(user_idea)
 
         # For other special agents, try to call generate with user_idea and dependency_documents
         # Most special agents have different signatures, so we'll need to adapt
-        if hasattr(self.agent, "generate"):
-            import asyncio
-
-            loop = asyncio.get_event_loop()
+        accepts_dependencies = _accepts_dependency_documents(type(self.agent))
+        if accepts_dependencies is not None:
             # Try calling with user_idea and dependency_documents first (for new agents)
             try:
-                # Check if agent accepts dependency_documents parameter
-                import inspect
-                sig = inspect.signature(self.agent.generate)
-                params = list(sig.parameters.keys())
-                
-                if "dependency_documents" in params or "requirements_summary" in params:
+                if accepts_dependencies:
                     # Agent supports dependency documents - build requirements_summary from context
                     requirements_summary = {"user_idea": user_idea}
                     
@@ -80,19 +93,16 @@ class SpecialAgentAdapter:
                                 requirements_summary["requirements_document"] = req_content
                     
                     # Call with full parameters
-                    return await loop.run_in_executor(
-                        None,
-                        lambda: self.agent.generate(
-                            user_idea,
-                            requirements_summary=requirements_summary,
-                            project_charter_summary=project_charter_summary,
-                            business_model_summary=business_model_summary,
-                            dependency_documents=dependency_documents
-                        )
+                    return await self.agent.async_generate(
+                        user_idea,
+                        requirements_summary=requirements_summary,
+                        project_charter_summary=project_charter_summary,
+                        business_model_summary=business_model_summary,
+                        dependency_documents=dependency_documents
                     )
                 else:
                     # Agent only accepts user_idea
-                    return await loop.run_in_executor(None, self.agent.generate, user_idea)
+                    return await self.agent.async_generate(user_idea)
             except TypeError as e:
                 # If that fails, try with just user_idea
                 logger.warning(
@@ -100,7 +110,7 @@ class SpecialAgentAdapter:
                     type(self.agent).__name__,
                     e
                 )
-                return await loop.run_in_executor(None, self.agent.generate, user_idea)
+                return await self.agent.async_generate(user_idea)
 
         raise NotImplementedError(f"Agent {type(self.agent).__name__} does not have a generate method")
 
@@ -128,30 +138,26 @@ class SpecialAgentAdapter:
         # Save to database via context_manager
         if self.context_manager and self.project_id:
             try:
-                from src.context.shared_context import AgentType, DocumentStatus, AgentOutput
+                from src.context.shared_context import AgentType
                 
                 # Determine agent type from definition
                 # Map document IDs to AgentType enum values
-                agent_type = None
                 if isinstance(self.agent, RequirementsAnalyst):
-                    agent_type = AgentType.REQUIREMENTS_ANALYST
+                    # Saved below by _save_to_context together with the parsed requirements
+                    agent_type = None
                 elif self.definition.id == "gtm_strategy" or self.definition.id == "marketing_plan":
                     agent_type = AgentType.MARKETING_PLAN
                 else:
                     # For other special agents (feature_roadmap, risk_management_plan, etc.)
-                    # Use GENERIC_DOCUMENTATION since they don't have specific AgentType values
-                    agent_type = AgentType.GENERIC_DOCUMENTATION
+                    # use the same generic fallback as GenericDocumentAgent;
+                    # document_type identifies the actual document
+                    agent_type = AgentType.TECHNICAL_DOCUMENTATION
                 
-                # Always save output for all special agents
                 if agent_type:
-                    output = AgentOutput(
-                        agent_type=agent_type,
-                        document_type=self.definition.id,
-                        content=content,
-                        file_path=virtual_path,  # Virtual path for reference only
-                        status=DocumentStatus.COMPLETE,
+                    await run_agent_io(
+                        self.agent._persist, content, agent_type, self.definition.id,
+                        virtual_path, self.project_id, self.context_manager
                     )
-                    self.context_manager.save_agent_output(self.project_id, output)
                     logger.info(f"✅ Document {self.definition.id} saved to database")
 
                 # Also parse and save requirements if possible
@@ -160,7 +166,7 @@ class SpecialAgentAdapter:
                     # The agent's _save_to_context will handle parsing
                     self.agent.project_id = self.project_id
                     self.agent.context_manager = self.context_manager
-                    self.agent._save_to_context(content, virtual_path, user_idea)
+                    await run_agent_io(self.agent._save_to_context, content, virtual_path, user_idea)
             except Exception as exc:
                 logger.warning("Failed to save to database: %s", exc)
 
@@ -169,6 +175,6 @@ class SpecialAgentAdapter:
             "name": self.definition.name,
             "file_path": virtual_path,
             "content": content,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": _now().isoformat(),
         }
 
@@ -1,29 +1,23 @@
 """Registry for special-case agents that require custom logic."""
 from __future__ import annotations
 
+from functools import lru_cache
+from importlib import import_module
 from typing import Dict, Optional, Type
 
 from src.agents.base_agent import BaseAgent
-from src.agents.code_analyst_agent import CodeAnalystAgent
-from src.agents.document_improver_agent import DocumentImproverAgent
-from src.agents.format_converter_agent import FormatConverterAgent
-from src.agents.quality_reviewer_agent import QualityReviewerAgent
-from src.agents.requirements_analyst import RequirementsAnalyst
-from src.agents.marketing_plan_agent import MarketingPlanAgent
-from src.agents.feature_roadmap_agent import FeatureRoadmapAgent
-from src.agents.risk_management_agent import RiskManagementAgent
-
-# Map document IDs to special agent classes
-SPECIAL_AGENT_REGISTRY: Dict[str, Type[BaseAgent]] = {
-    "requirements": RequirementsAnalyst,
-    "quality_review": QualityReviewerAgent,
-    "document_improver": DocumentImproverAgent,
-    "format_converter": FormatConverterAgent,
-    "code_analyst": CodeAnalystAgent,
-    "gtm_strategy": MarketingPlanAgent,
-    "marketing_plan": MarketingPlanAgent,
-    "feature_roadmap": FeatureRoadmapAgent,
-    "risk_management_plan": RiskManagementAgent,
+
+# Map document IDs to special agent classes ("module:ClassName"), imported on first use
+SPECIAL_AGENT_REGISTRY: Dict[str, str] = {
+    "requirements": "src.agents.requirements_analyst:RequirementsAnalyst",
+    "quality_review": "src.agents.quality_reviewer_agent:QualityReviewerAgent",
+    "document_improver": "src.agents.document_improver_agent:DocumentImproverAgent",
+    "format_converter": "src.agents.format_converter_agent:FormatConverterAgent",
+    "code_analyst": "src.agents.code_analyst_agent:CodeAnalystAgent",
+    "gtm_strategy": "src.agents.marketing_plan_agent:MarketingPlanAgent",
+    "marketing_plan": "src.agents.marketing_plan_agent:MarketingPlanAgent",
+    "feature_roadmap": "src.agents.feature_roadmap_agent:FeatureRoadmapAgent",
+    "risk_management_plan": "src.agents.risk_management_agent:RiskManagementAgent",
 }
 
 # Map special_key (from config) to document IDs
@@ -39,20 +33,25 @@ SPECIAL_KEY_TO_DOC_ID: Dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=None)
+def _import_agent_class(path: str) -> Type[BaseAgent]:
+    """Import an agent class from its "module:ClassName" path."""
+    module_name, class_name = path.split(":")
+    return getattr(import_module(module_name), class_name)
+
+
 def get_special_agent_class(document_id: str, special_key: Optional[str] = None) -> Optional[Type[BaseAgent]]:
     """Get special agent class for a document ID or special_key."""
     # First try direct document_id lookup
-    agent_class = SPECIAL_AGENT_REGISTRY.get(document_id)
-    if agent_class:
-        return agent_class
+    agent_path = SPECIAL_AGENT_REGISTRY.get(document_id)
 
     # Then try special_key lookup
-    if special_key:
+    if not agent_path and special_key:
         mapped_doc_id = SPECIAL_KEY_TO_DOC_ID.get(special_key)
         if mapped_doc_id:
-            return SPECIAL_AGENT_REGISTRY.get(mapped_doc_id)
+            agent_path = SPECIAL_AGENT_REGISTRY.get(mapped_doc_id)
 
-    return None
+    return _import_agent_class(agent_path) if agent_path else None
 
 
 def is_special_agent(document_id: str, special_key: Optional[str] = None) -> bool:
@@ -1,16 +1,17 @@
 """Helpers for loading and working with the document catalog configuration."""
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set
+from threading import Lock
+from typing import Optional
 
-import json
 import logging
 import os
 
-from fastapi import HTTPException
+from src.utils import json_utils
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,11 @@ DEFAULT_CATALOG_PATH = Path("backend/config/document_definitions.json")
 QUALITY_RULES_PATH = Path("src/config/quality_rules.json")
 
 
-@dataclass(frozen=True)
+class CatalogNotFoundError(FileNotFoundError):
+    """Raised when document_definitions.json cannot be located."""
+
+
+@dataclass(frozen=True, slots=True)
 class DocumentDefinition:
     """Typed representation of a single document definition."""
 
@@ -28,7 +33,7 @@ class DocumentDefinition:
     name: str
     prompt_key: Optional[str]
     agent_class: str
-    dependencies: List[str]
+    dependencies: tuple[str, ...]
     category: Optional[str]
     description: Optional[str]
     priority: Optional[str]
@@ -104,9 +109,9 @@ def _catalog_path() -> Path:
 
 
 # Cache at module level to avoid reloading on every call
-_document_definitions_cache: Optional[Dict[str, DocumentDefinition]] = None
+_document_definitions_cache: Optional[dict[str, DocumentDefinition]] = None
 
-def load_document_definitions() -> Dict[str, DocumentDefinition]:
+def load_document_definitions() -> dict[str, DocumentDefinition]:
     """Load and cache document definitions keyed by ID."""
     global _document_definitions_cache
     
@@ -145,23 +150,20 @@ def load_document_definitions() -> Dict[str, DocumentDefinition]:
         if not catalog_file.exists():
             env_path = os.getenv(DOCUMENT_CONFIG_ENV, "not set")
             attempted_paths = [str(p) for p in possible_paths]
-            raise HTTPException(
-                status_code=500,
-                detail=(
-                    f"Document catalog not found.\n"
-                    f"  Attempted paths:\n"
-                    + "\n".join(f"    - {p}" for p in attempted_paths)
-                    + f"\n  DOCUMENT_CONFIG_PATH env var: {env_path}\n"
-                    f"  Current working directory: {Path.cwd()}\n"
-                    f"  Project root (detected): {project_root}\n"
-                    f"  Please ensure document_definitions.json exists in backend/config/\n"
-                    f"  Or update DOCUMENT_CONFIG_PATH in .env file to: backend/config/document_definitions.json"
-                ),
+            raise CatalogNotFoundError(
+                f"Document catalog not found.\n"
+                f"  Attempted paths:\n"
+                + "\n".join(f"    - {p}" for p in attempted_paths)
+                + f"\n  DOCUMENT_CONFIG_PATH env var: {env_path}\n"
+                f"  Current working directory: {Path.cwd()}\n"
+                f"  Project root (detected): {project_root}\n"
+                f"  Please ensure document_definitions.json exists in backend/config/\n"
+                f"  Or update DOCUMENT_CONFIG_PATH in .env file to: backend/config/document_definitions.json"
             )
 
-    payload = json.loads(catalog_file.read_text(encoding="utf-8"))
+    payload = json_utils.load_file(catalog_file)
     documents = payload.get("documents", [])
-    definitions: Dict[str, DocumentDefinition] = {}
+    definitions: dict[str, DocumentDefinition] = {}
 
     for raw in documents:
         doc_id = raw.get("id")
@@ -183,7 +185,8 @@ def load_document_definitions() -> Dict[str, DocumentDefinition]:
             name=raw.get("name", doc_id.title()),
             prompt_key=raw.get("prompt_key"),
             agent_class=raw.get("agent_class", "generic"),
-            dependencies=list({dep for dep in raw.get("dependencies", []) if dep}),
+            # Deduplicated in file order, so the resolved order is stable across runs
+            dependencies=tuple(dict.fromkeys(dep for dep in raw.get("dependencies", []) if dep)),
             category=raw.get("category"),
             description=raw.get("description"),
             priority=raw.get("priority"),
@@ -210,33 +213,37 @@ def get_document_by_id(document_id: str) -> Optional[DocumentDefinition]:
 
 def reload_catalog() -> None:
     """Clear the cached definitions (useful for tests or when the file changes)."""
-    load_document_definitions.cache_clear()  # type: ignore[attr-defined]
+    global _document_definitions_cache, _catalog_graph_cache, _all_ids_cache, _all_dependencies_cache
+    _document_definitions_cache = None
+    _catalog_graph_cache = None
+    _all_dependencies_cache = None
+    with _all_ids_lock:
+        _all_ids_cache = None
     _load_quality_rules_dependencies.cache_clear()  # type: ignore[attr-defined]
 
 
 @lru_cache(maxsize=1)
-def _load_quality_rules_dependencies() -> Dict[str, List[str]]:
+def _load_quality_rules_dependencies() -> dict[str, list[str]]:
     """
     Load dependencies from quality_rules.json and map document names to document IDs.
     
     Returns:
         Dict mapping document ID to list of dependency document IDs
     """
-    dependencies_map: Dict[str, List[str]] = {}
+    dependencies_map: dict[str, list[str]] = {}
     
     # Load quality rules
     if not QUALITY_RULES_PATH.exists():
         return dependencies_map
     
     try:
-        with open(QUALITY_RULES_PATH, 'r', encoding='utf-8') as f:
-            quality_rules = json.load(f)
+        quality_rules = json_utils.loads(QUALITY_RULES_PATH.read_bytes())
     except Exception:
         return dependencies_map
     
     # Load document definitions to create name -> id mapping
     definitions = load_document_definitions()
-    name_to_id: Dict[str, str] = {}
+    name_to_id: dict[str, str] = {}
     for doc_id, definition in definitions.items():
         name_to_id[definition.name] = doc_id
         # Also map normalized names (lowercase, no special chars)
@@ -269,7 +276,7 @@ def _load_quality_rules_dependencies() -> Dict[str, List[str]]:
             continue
         
         # Map dependency names to IDs
-        dep_ids: List[str] = []
+        dep_ids: list[str] = []
         for dep_name in rules.get("dependencies", []):
             # Try exact match
             if dep_name in name_to_id:
@@ -292,7 +299,11 @@ def _load_quality_rules_dependencies() -> Dict[str, List[str]]:
     return dependencies_map
 
 
-def get_all_dependencies(doc_id: str) -> List[str]:
+# Combined dependencies per document ID, tied to the definitions they were read from
+_all_dependencies_cache: Optional[tuple[dict[str, DocumentDefinition], dict[str, tuple[str, ...]]]] = None
+
+
+def get_all_dependencies(doc_id: str) -> list[str]:
     """
     Get all dependencies for a document ID, combining dependencies from:
     1. document_definitions.json
@@ -301,11 +312,19 @@ def get_all_dependencies(doc_id: str) -> List[str]:
     Returns:
         List of unique dependency document IDs
     """
+    global _all_dependencies_cache
+
     definitions = load_document_definitions()
+    if _all_dependencies_cache is None or _all_dependencies_cache[0] is not definitions:
+        _all_dependencies_cache = (definitions, {})
+    cached = _all_dependencies_cache[1].get(doc_id)
+    if cached is not None:
+        return list(cached)
+
     definition = definitions.get(doc_id)
     
     # Start with dependencies from document_definitions.json
-    deps_from_definitions: List[str] = []
+    deps_from_definitions: list[str] = []
     if definition:
         deps_from_definitions = list(definition.dependencies)
     
@@ -313,62 +332,84 @@ def get_all_dependencies(doc_id: str) -> List[str]:
     quality_deps = _load_quality_rules_dependencies().get(doc_id, [])
     
     # Combine and deduplicate
-    all_deps = list(dict.fromkeys(deps_from_definitions + quality_deps))
+    all_deps = tuple(dict.fromkeys(deps_from_definitions + quality_deps))
+    _all_dependencies_cache[1][doc_id] = all_deps
     
-    return all_deps
+    return list(all_deps)
+
 
+# Dependency graph and full topological order, tied to the definitions they were built from
+_catalog_graph_cache: Optional[
+    tuple[dict[str, DocumentDefinition], dict[str, tuple[str, ...]], Optional[tuple[str, ...]]]
+] = None
 
-def resolve_dependencies(selected_ids: Iterable[str]) -> List[str]:
+
+def _topological_order(graph: dict[str, tuple[str, ...]], root_ids: Iterable[str]) -> list[str]:
     """
-    Resolve dependencies for the given document IDs with topological ordering.
-    Combines dependencies from both document_definitions.json and quality_rules.json.
-    
-    Enhanced features:
-    - Circular dependency detection with detailed error messages
-    - Optional dependency handling (warnings instead of errors)
-    - Missing dependency detection
+    Order the given documents and their dependencies so dependencies come first.
     
     Args:
-        selected_ids: Iterable of document IDs to resolve
+        graph: Document ID -> IDs of its (existing) dependencies
+        root_ids: Document IDs to start from
         
     Returns:
         List of document IDs in topological order
         
     Raises:
-        ValueError: If circular dependency detected or unknown document ID found
+        ValueError: If a circular dependency is reachable from root_ids
     """
+    order: list[str] = []
+    visiting: set[str] = set()
+    visited: set[str] = set()
+
+    # Iterative depth-first search: the stack holds the current dependency path,
+    # each entry paired with the iterator over its not-yet-visited dependencies
+    for root_id in root_ids:
+        if root_id in visited:
+            continue
+        visiting.add(root_id)
+        stack: list[tuple[str, Iterator[str]]] = [(root_id, iter(graph[root_id]))]
+        while stack:
+            doc_id, deps = stack[-1]
+            for dep_id in deps:
+                if dep_id in visited:
+                    continue
+                if dep_id in visiting:
+                    # Circular dependency detected - build detailed error message
+                    path = [entry[0] for entry in stack]
+                    cycle = path[path.index(dep_id):] + [dep_id]
+                    raise ValueError(
+                        f"Circular dependency detected: {' -> '.join(cycle)}. "
+                        f"Please check dependencies in document_definitions.json and quality_rules.json."
+                    )
+                visiting.add(dep_id)
+                stack.append((dep_id, iter(graph[dep_id])))
+                break
+            else:
+                stack.pop()
+                visiting.remove(doc_id)
+                visited.add(doc_id)
+                order.append(doc_id)
+
+    return order
+
+
+def _catalog_graph() -> tuple[dict[str, tuple[str, ...]], Optional[tuple[str, ...]]]:
+    """
+    Build (once per catalog load) the dependency graph and the full topological order.
+    
+    Returns:
+        Tuple of (document ID -> existing dependency IDs, topological order of the
+        whole catalog, or None if the catalog contains a circular dependency)
+    """
+    global _catalog_graph_cache
+
     definitions = load_document_definitions()
-    order: List[str] = []
-    visiting: Set[str] = set()
-    visited: Set[str] = set()
-    cycle_path: List[str] = []  # Track cycle path for better error messages
-
-    def visit(doc_id: str, path: List[str] = None) -> None:
-        """Visit a document and its dependencies recursively."""
-        if path is None:
-            path = []
-        
-        if doc_id in visited:
-            return
-        if doc_id in visiting:
-            # Circular dependency detected - build detailed error message
-            cycle_start = path.index(doc_id) if doc_id in path else 0
-            cycle = path[cycle_start:] + [doc_id]
-            raise ValueError(
-                f"Circular dependency detected: {' -> '.join(cycle)}. "
-                f"Please check dependencies in document_definitions.json and quality_rules.json."
-            )
-        
-        definition = definitions.get(doc_id)
-        if not definition:
-            raise ValueError(
-                f"Unknown document id '{doc_id}'. "
-                f"Available document IDs: {', '.join(sorted(definitions.keys()))}"
-            )
+    if _catalog_graph_cache is not None and _catalog_graph_cache[0] is definitions:
+        return _catalog_graph_cache[1], _catalog_graph_cache[2]
 
-        visiting.add(doc_id)
-        current_path = path + [doc_id]
-        
+    graph: dict[str, tuple[str, ...]] = {}
+    for doc_id in definitions:
         # Use get_all_dependencies to get combined dependencies
         all_deps = get_all_dependencies(doc_id)
         missing_deps = [dep for dep in all_deps if dep not in definitions]
@@ -382,14 +423,42 @@ def resolve_dependencies(selected_ids: Iterable[str]) -> List[str]:
                 missing_deps
             )
         
-        # Visit only valid dependencies
-        for dep_id in all_deps:
-            if dep_id in definitions:
-                visit(dep_id, current_path)
+        graph[doc_id] = tuple(dep for dep in all_deps if dep in definitions)
+
+    try:
+        full_order: Optional[tuple[str, ...]] = tuple(_topological_order(graph, definitions))
+    except ValueError as exc:
+        # Selections that avoid the cycle can still be resolved on their own
+        logger.warning("Document catalog has no global order: %s", exc)
+        full_order = None
+
+    _catalog_graph_cache = (definitions, graph, full_order)
+    return graph, full_order
+
+
+def resolve_dependencies(selected_ids: Iterable[str]) -> list[str]:
+    """
+    Resolve dependencies for the given document IDs with topological ordering.
+    Combines dependencies from both document_definitions.json and quality_rules.json.
+    
+    Enhanced features:
+    - Circular dependency detection with detailed error messages
+    - Optional dependency handling (warnings instead of errors)
+    - Missing dependency detection
+    
+    The catalog's topological order is computed once per load; each call only
+    collects the selection's dependency closure and filters that order.
+    
+    Args:
+        selected_ids: Iterable of document IDs to resolve
+        
+    Returns:
+        List of document IDs in topological order
         
-        visiting.remove(doc_id)
-        visited.add(doc_id)
-        order.append(doc_id)
+    Raises:
+        ValueError: If circular dependency detected or unknown document ID found
+    """
+    definitions = load_document_definitions()
 
     # Validate all selected IDs exist before processing
     selected_list = list(dict.fromkeys(selected_ids))
@@ -400,14 +469,45 @@ def resolve_dependencies(selected_ids: Iterable[str]) -> List[str]:
             f"Available document IDs: {', '.join(sorted(definitions.keys()))}"
         )
 
-    for doc_id in selected_list:
-        visit(doc_id)
+    graph, full_order = _catalog_graph()
+    if full_order is None:
+        return _topological_order(graph, selected_list)
+
+    closure: set[str] = set(selected_list)
+    pending = list(selected_list)
+    while pending:
+        for dep_id in graph[pending.pop()]:
+            if dep_id not in closure:
+                closure.add(dep_id)
+                pending.append(dep_id)
+
+    return [doc_id for doc_id in full_order if doc_id in closure]
 
-    return order
 
+# All document IDs, tied to the definitions they were read from
+_all_ids_cache: Optional[tuple[dict[str, DocumentDefinition], tuple[str, ...]]] = None
+_all_ids_lock = Lock()
 
-def list_document_ids() -> List[str]:
+
+def list_document_ids() -> list[str]:
     """Return all document IDs in the catalog."""
-    return list(load_document_definitions().keys())
+    global _all_ids_cache
+
+    definitions = load_document_definitions()
+    with _all_ids_lock:
+        if _all_ids_cache is None or _all_ids_cache[0] is not definitions:
+            _all_ids_cache = (definitions, tuple(definitions))
+        return list(_all_ids_cache[1])
+
+
+def warm() -> None:
+    """
+    Load the catalog and precompute the derived data ahead of the first request.
+    
+    Reads the definitions, builds the dependency graph and full topological
+    order used by resolve_dependencies, and the list of document IDs.
+    """
+    _catalog_graph()
+    list_document_ids()
 
 
@@ -88,11 +88,21 @@ class Settings:
     default_llm_provider: str
     rate_limit_per_minute: int
     rate_limit_per_day: int
+    max_concurrent_agents: int  # Documents generated / LLM requests in flight at once, per provider
+    # Per-provider LLM request caps (default: max_concurrent_agents)
+    ollama_max_concurrent: int  # Self-hosted models saturate well before cloud APIs
+    gemini_max_concurrent: int
+    openai_max_concurrent: int
+    # Thread pools (defaults scale with the CPU count)
+    agent_io_workers: int  # Agent file/database writes; kept below the database connection pool size
+    generation_threads: int  # Default executor of the generation event loop (blocking LLM calls, scoring)
     # LLM Temperature Configuration
     default_temperature: float  # Default temperature for all providers
     ollama_temperature: float   # Temperature for Ollama (lower for better instruction following)
     gemini_temperature: float   # Temperature for Gemini
     openai_temperature: float   # Temperature for OpenAI
+    # Caches
+    semantic_cache_dir: str  # Semantic (embedding) caches, one SQLite file per document type
     # Performance
     enable_profiling: bool
     # Debug features
@@ -115,6 +125,20 @@ def get_settings() -> Settings:
     gemini_temperature = float(os.getenv("GEMINI_TEMPERATURE", os.getenv("TEMPERATURE", "0.7")))  # Higher for cloud models
     openai_temperature = float(os.getenv("OPENAI_TEMPERATURE", os.getenv("TEMPERATURE", "0.7")))  # Higher for cloud models
     
+    # Concurrency caps per provider, so a backed-up provider only queues its own requests
+    max_concurrent_agents = int(os.getenv("MAX_CONCURRENT_AGENTS", "5"))
+    ollama_max_concurrent = int(os.getenv("OLLAMA_MAX_CONCURRENT", str(max_concurrent_agents)))
+    gemini_max_concurrent = int(os.getenv("GEMINI_MAX_CONCURRENT", str(max_concurrent_agents)))
+    openai_max_concurrent = int(os.getenv("OPENAI_MAX_CONCURRENT", str(max_concurrent_agents)))
+    
+    # Both pools mostly wait on I/O, so they get more threads than cores
+    cpu_count = os.cpu_count() or 1
+    agent_io_workers = int(os.getenv("AGENT_IO_WORKERS", str(min(8, cpu_count + 4))))
+    generation_threads = int(os.getenv("GENERATION_THREADS", str(min(32, cpu_count * 4))))
+    
+    # Next to the exact LLM cache, outside the generated docs tree
+    semantic_cache_dir = os.getenv("SEMANTIC_CACHE_DIR", "~/.cache/auto-repo-agents/semantic")
+    
     if env == Environment.PROD:
         return Settings(
             environment=env,
@@ -126,10 +150,17 @@ def get_settings() -> Settings:
             default_llm_provider=os.getenv("LLM_PROVIDER", "gemini"),
             rate_limit_per_minute=int(os.getenv("RATE_LIMIT_PER_MINUTE", "2")),  # Gemini free tier: 2 RPM
             rate_limit_per_day=int(os.getenv("RATE_LIMIT_PER_DAY", "50")),  # Gemini free tier: 50 RPD
+            max_concurrent_agents=max_concurrent_agents,
+            ollama_max_concurrent=ollama_max_concurrent,
+            gemini_max_concurrent=gemini_max_concurrent,
+            openai_max_concurrent=openai_max_concurrent,
+            agent_io_workers=agent_io_workers,
+            generation_threads=generation_threads,
             default_temperature=default_temperature,
             ollama_temperature=ollama_temperature,
             gemini_temperature=gemini_temperature,
             openai_temperature=openai_temperature,
+            semantic_cache_dir=semantic_cache_dir,
             enable_profiling=False,  # Disable profiling in prod
             debug_mode=False,
             verbose_output=False
@@ -145,10 +176,17 @@ def get_settings() -> Settings:
             default_llm_provider=os.getenv("LLM_PROVIDER", "gemini"),
             rate_limit_per_minute=int(os.getenv("RATE_LIMIT_PER_MINUTE", "2")),  # Gemini free tier: 2 RPM
             rate_limit_per_day=int(os.getenv("RATE_LIMIT_PER_DAY", "50")),  # Gemini free tier: 50 RPD
+            max_concurrent_agents=max_concurrent_agents,
+            ollama_max_concurrent=ollama_max_concurrent,
+            gemini_max_concurrent=gemini_max_concurrent,
+            openai_max_concurrent=openai_max_concurrent,
+            agent_io_workers=agent_io_workers,
+            generation_threads=generation_threads,
             default_temperature=default_temperature,
             ollama_temperature=ollama_temperature,
             gemini_temperature=gemini_temperature,
             openai_temperature=openai_temperature,
+            semantic_cache_dir=semantic_cache_dir,
             enable_profiling=False,
             debug_mode=True,
             verbose_output=False
@@ -164,10 +202,17 @@ def get_settings() -> Settings:
             default_llm_provider=os.getenv("LLM_PROVIDER", "gemini"),
             rate_limit_per_minute=int(os.getenv("RATE_LIMIT_PER_MINUTE", "2")),  # Gemini free tier: 2 RPM
             rate_limit_per_day=int(os.getenv("RATE_LIMIT_PER_DAY", "50")),  # Gemini free tier: 50 RPD
+            max_concurrent_agents=max_concurrent_agents,
+            ollama_max_concurrent=ollama_max_concurrent,
+            gemini_max_concurrent=gemini_max_concurrent,
+            openai_max_concurrent=openai_max_concurrent,
+            agent_io_workers=agent_io_workers,
+            generation_threads=generation_threads,
             default_temperature=default_temperature,
             ollama_temperature=ollama_temperature,
             gemini_temperature=gemini_temperature,
             openai_temperature=openai_temperature,
+            semantic_cache_dir=semantic_cache_dir,
             enable_profiling=True,  # Enable profiling in dev
             debug_mode=True,
             verbose_output=True
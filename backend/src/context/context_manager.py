@@ -3,7 +3,6 @@ Context Manager
 Manages shared context database for agent collaboration
 """
 import os
-import json
 import threading
 # Path removed - content is stored in database, not files
 from typing import Optional, Dict, List, Any
@@ -22,6 +21,7 @@ from src.context.shared_context import (
     AgentType,
     DocumentStatus
 )
+from src.utils import json_utils
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -501,12 +501,12 @@ class ContextManager:
                         project_id,
                         requirements.user_idea,
                         requirements.project_overview,
-                        json.dumps(requirements.core_features),
-                        json.dumps(requirements.technical_requirements),
-                        json.dumps(requirements.user_personas),
-                        json.dumps(requirements.business_objectives),
-                        json.dumps(requirements.constraints),
-                        json.dumps(requirements.assumptions),
+                        json_utils.dumps(requirements.core_features),
+                        json_utils.dumps(requirements.technical_requirements),
+                        json_utils.dumps(requirements.user_personas),
+                        json_utils.dumps(requirements.business_objectives),
+                        json_utils.dumps(requirements.constraints),
+                        json_utils.dumps(requirements.assumptions),
                         requirements.generated_at
                     ))
             except Exception as e:
@@ -534,17 +534,96 @@ class ContextManager:
             return RequirementsDocument(
                 user_idea=row["user_idea"],
                 project_overview=row["project_overview"] or "",
-                core_features=json.loads(row["core_features"] or "[]"),
-                technical_requirements=json.loads(row["technical_requirements"] or "{}"),
-                user_personas=json.loads(row["user_personas"] or "[]"),
-                business_objectives=json.loads(row["business_objectives"] or "[]"),
-                constraints=json.loads(row["constraints"] or "[]"),
-                assumptions=json.loads(row["assumptions"] or "[]"),
+                core_features=json_utils.loads(row["core_features"] or "[]"),
+                technical_requirements=json_utils.loads(row["technical_requirements"] or "{}"),
+                user_personas=json_utils.loads(row["user_personas"] or "[]"),
+                business_objectives=json_utils.loads(row["business_objectives"] or "[]"),
+                constraints=json_utils.loads(row["constraints"] or "[]"),
+                assumptions=json_utils.loads(row["assumptions"] or "[]"),
                 generated_at=generated_at
             )
         finally:
             self._put_connection(conn)
     
+    def _insert_agent_output(self, cursor, project_id: str, output: AgentOutput, version: Optional[int] = None):
+        """
+        Upsert one agent output row on an open cursor (caller owns the transaction)
+        
+        Args:
+            cursor: Database cursor
+            project_id: Project identifier
+            output: AgentOutput to save
+            version: Optional version number (auto-incremented if None)
+        """
+        # Get next version number if not provided
+        # Use document_type to get version (more reliable for custom document types)
+        if version is None:
+            # Try to get version by document_type first (more specific)
+            try:
+                cursor.execute("""
+                    SELECT MAX(version) FROM agent_outputs 
+                    WHERE project_id = %s AND document_type = %s
+                """, (project_id, output.document_type))
+                result = cursor.fetchone()
+                current_version = result[0] if result[0] is not None else 0
+                version = current_version + 1
+            except Exception as e:
+                # Fallback to agent_type if document_type query fails
+                try:
+                    current_version = self.get_document_version(project_id, output.agent_type)
+                    version = current_version + 1
+                except:
+                    version = 1  # Start with version 1 if all else fails
+        
+        # Use document_type as part of output_id to ensure uniqueness for custom document types
+        # This allows documents not in AgentType enum to be saved correctly
+        output_id = f"{project_id}_{output.document_type}_v{version}"  # Use document_type for uniqueness
+        
+        # Ensure dependencies is a list (handle None or other types)
+        dependencies = output.dependencies
+        if dependencies is None:
+            dependencies = []
+        elif not isinstance(dependencies, list):
+            # Try to convert to list if possible
+            dependencies = list(dependencies) if hasattr(dependencies, '__iter__') else []
+        
+        # Ensure all values are properly formatted
+        generated_at = output.generated_at
+        if generated_at and isinstance(generated_at, str):
+            generated_at = datetime.fromisoformat(generated_at)
+        
+        # Use INSERT ... ON CONFLICT for upsert
+        # file_path is optional - can be None if storing only in database
+        file_path = output.file_path if output.file_path else None
+        cursor.execute("""
+            INSERT INTO agent_outputs (
+                output_id, project_id, agent_type, document_type,
+                content, file_path, quality_score, status,
+                dependencies, generated_at, version, approved
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (output_id) DO UPDATE SET
+                content = EXCLUDED.content,
+                file_path = EXCLUDED.file_path,
+                quality_score = EXCLUDED.quality_score,
+                status = EXCLUDED.status,
+                dependencies = EXCLUDED.dependencies,
+                generated_at = EXCLUDED.generated_at,
+                approved = EXCLUDED.approved
+        """, (
+            output_id,
+            project_id,
+            output.agent_type.value,
+            output.document_type,
+            output.content,
+            file_path,
+            output.quality_score,
+            output.status.value,
+            json_utils.dumps(dependencies),
+            generated_at,
+            version,
+            0  # Default: pending approval
+        ))
+    
     def save_agent_output(self, project_id: str, output: AgentOutput, version: Optional[int] = None):
         """
         Save agent output (thread-safe)
@@ -559,76 +638,7 @@ class ContextManager:
             try:
                 conn = self._get_connection()
                 cursor = conn.cursor()
-                
-                # Get next version number if not provided
-                # Use document_type to get version (more reliable for custom document types)
-                if version is None:
-                    # Try to get version by document_type first (more specific)
-                    try:
-                        cursor.execute("""
-                            SELECT MAX(version) FROM agent_outputs 
-                            WHERE project_id = %s AND document_type = %s
-                        """, (project_id, output.document_type))
-                        result = cursor.fetchone()
-                        current_version = result[0] if result[0] is not None else 0
-                        version = current_version + 1
-                    except Exception as e:
-                        # Fallback to agent_type if document_type query fails
-                        try:
-                            current_version = self.get_document_version(project_id, output.agent_type)
-                            version = current_version + 1
-                        except:
-                            version = 1  # Start with version 1 if all else fails
-                
-                # Use document_type as part of output_id to ensure uniqueness for custom document types
-                # This allows documents not in AgentType enum to be saved correctly
-                output_id = f"{project_id}_{output.document_type}_v{version}"  # Use document_type for uniqueness
-                
-                # Ensure dependencies is a list (handle None or other types)
-                dependencies = output.dependencies
-                if dependencies is None:
-                    dependencies = []
-                elif not isinstance(dependencies, list):
-                    # Try to convert to list if possible
-                    dependencies = list(dependencies) if hasattr(dependencies, '__iter__') else []
-                
-                # Ensure all values are properly formatted
-                generated_at = output.generated_at
-                if generated_at and isinstance(generated_at, str):
-                    generated_at = datetime.fromisoformat(generated_at)
-                
-                # Use INSERT ... ON CONFLICT for upsert
-                # file_path is optional - can be None if storing only in database
-                file_path = output.file_path if output.file_path else None
-                cursor.execute("""
-                    INSERT INTO agent_outputs (
-                        output_id, project_id, agent_type, document_type,
-                        content, file_path, quality_score, status,
-                        dependencies, generated_at, version, approved
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (output_id) DO UPDATE SET
-                        content = EXCLUDED.content,
-                        file_path = EXCLUDED.file_path,
-                        quality_score = EXCLUDED.quality_score,
-                        status = EXCLUDED.status,
-                        dependencies = EXCLUDED.dependencies,
-                        generated_at = EXCLUDED.generated_at,
-                        approved = EXCLUDED.approved
-                """, (
-                    output_id,
-                    project_id,
-                    output.agent_type.value,
-                    output.document_type,
-                    output.content,
-                    file_path,
-                    output.quality_score,
-                    output.status.value,
-                    json.dumps(dependencies),
-                    generated_at,
-                    version,
-                    0  # Default: pending approval
-                ))
-                
+                self._insert_agent_output(cursor, project_id, output, version)
                 conn.commit()
                 cursor.close()
             except Exception as e:
@@ -649,6 +659,42 @@ class ContextManager:
                     except Exception as e:
                         logger.warning(f"Error returning connection to pool: {e}")
     
+    def batch_save(self, project_id: str, outputs: List[AgentOutput]):
+        """
+        Save several agent outputs in a single transaction (thread-safe)
+        
+        Either every output is written or, on error, none are.
+        
+        Args:
+            project_id: Project identifier
+            outputs: AgentOutputs to save (versions are auto-incremented)
+        """
+        if not outputs:
+            return
+        with self._lock:
+            conn = None
+            try:
+                conn = self._get_connection()
+                cursor = conn.cursor()
+                for output in outputs:
+                    self._insert_agent_output(cursor, project_id, output)
+                conn.commit()
+                cursor.close()
+            except Exception as e:
+                logger.error(f"Error batch saving {len(outputs)} agent outputs for {project_id}: {e}", exc_info=True)
+                if conn:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                raise
+            finally:
+                if conn:
+                    try:
+                        self._put_connection(conn)
+                    except Exception as e:
+                        logger.warning(f"Error returning connection to pool: {e}")
+    
     def get_agent_output(self, project_id: str, agent_type: AgentType) -> Optional[AgentOutput]:
         """Get agent output for a project (latest version)"""
         with self._lock:
@@ -680,7 +726,7 @@ class ContextManager:
                     quality_score=row["quality_score"],
                     status=DocumentStatus(row["status"]),
                     generated_at=generated_at,
-                    dependencies=json.loads(row["dependencies"] or "[]")
+                    dependencies=json_utils.loads(row["dependencies"] or "[]")
                 )
             finally:
                 self._put_connection(conn)
@@ -728,7 +774,7 @@ class ContextManager:
                     quality_score=row["quality_score"],
                     status=DocumentStatus(row["status"]),
                     generated_at=generated_at,
-                    dependencies=json.loads(row["dependencies"] or "[]")
+                    dependencies=json_utils.loads(row["dependencies"] or "[]")
                 )
             
             cursor.close()
@@ -922,11 +968,11 @@ class ContextManager:
                     
                     if completed_agents is not None:
                         update_fields.append("completed_agents = %s")
-                        update_values.append(json.dumps(completed_agents) if completed_agents else "[]")
+                        update_values.append(json_utils.dumps(completed_agents) if completed_agents else "[]")
                     
                     if results is not None:
                         update_fields.append("results = %s")
-                        update_values.append(json.dumps(results) if results else "{}")
+                        update_values.append(json_utils.dumps(results) if results else "{}")
                     
                     if error is not None:
                         update_fields.append("error = %s")
@@ -939,7 +985,7 @@ class ContextManager:
                     
                     if selected_documents is not None:
                         update_fields.append("selected_documents = %s")
-                        update_values.append(json.dumps(selected_documents))
+                        update_values.append(json_utils.dumps(selected_documents))
 
                     update_values.append(project_id)
                     cursor.execute(f"""
@@ -971,11 +1017,11 @@ class ContextManager:
                         profile,
                         provider_name or "default",
                         now,
-                        json.dumps(completed_agents or []),
-                        json.dumps(results or {}),
+                        json_utils.dumps(completed_agents or []),
+                        json_utils.dumps(results or {}),
                         error,
                         0,  # Default: pending approval
-                        json.dumps(selected_documents or []),
+                        json_utils.dumps(selected_documents or []),
                     ))
                 
                 conn.commit()
@@ -1034,9 +1080,9 @@ class ContextManager:
                 "completed_at": row["completed_at"].isoformat() if row["completed_at"] and isinstance(row["completed_at"], datetime) else row["completed_at"],
                 "failed_at": row["failed_at"].isoformat() if row["failed_at"] and isinstance(row["failed_at"], datetime) else row["failed_at"],
                 "error": row["error"],
-                "completed_agents": json.loads(row["completed_agents"] or "[]"),
-                "results": json.loads(row["results"] or "{}") if row["results"] else {},
-                "selected_documents": json.loads(row["selected_documents"] or "[]")
+                "completed_agents": json_utils.loads(row["completed_agents"] or "[]"),
+                "results": json_utils.loads(row["results"] or "{}") if row["results"] else {},
+                "selected_documents": json_utils.loads(row["selected_documents"] or "[]")
                 if "selected_documents" in row.keys()
                 else [],
                 # Handle optional columns that may not exist in older database schemas
@@ -1416,7 +1462,7 @@ class ContextManager:
                     file_path,
                     quality_score,
                     DocumentStatus.COMPLETE.value,
-                    json.dumps([]),
+                    json_utils.dumps([]),
                     now,
                     version,
                     0  # Pending approval
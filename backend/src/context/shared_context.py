@@ -41,6 +41,24 @@ class AgentType(str, Enum):
     CLAUDE_CLI_DOCUMENTATION = "claude_cli_documentation"
 
 
+# Built once so document-id lookups are a dict probe instead of an enum
+# constructor call that raises ValueError for every non-standard document
+_AGENT_TYPES_BY_VALUE: Dict[str, AgentType] = {member.value: member for member in AgentType}
+
+
+def agent_type_for_document(document_id: str) -> Optional[AgentType]:
+    """
+    Map a document identifier to its AgentType
+    
+    Args:
+        document_id: Document identifier (e.g. "api_documentation")
+        
+    Returns:
+        Matching AgentType, or None if the document has no dedicated agent type
+    """
+    return _AGENT_TYPES_BY_VALUE.get(document_id)
+
+
 class DocumentStatus(str, Enum):
     """Status of document generation"""
     PENDING = "pending"
@@ -50,7 +68,7 @@ class DocumentStatus(str, Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RequirementsDocument:
     """Requirements document structure"""
     user_idea: str
@@ -64,7 +82,7 @@ class RequirementsDocument:
     generated_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentOutput:
     """Output from a documentation agent"""
     agent_type: AgentType
@@ -75,6 +93,7 @@ class AgentOutput:
     status: DocumentStatus = DocumentStatus.PENDING
     generated_at: Optional[datetime] = None
     dependencies: List[str] = field(default_factory=list)  # IDs of dependent documents
+    cache_hit: bool = False  # Content was served from a response cache, not a fresh LLM call
 
 
 @dataclass
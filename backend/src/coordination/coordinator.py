@@ -1,14 +1,16 @@
 """Configuration-driven workflow coordinator for OmniDoc."""
 from __future__ import annotations
 
+from collections.abc import Iterator, Mapping
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Union, Set
 import re
 import asyncio
 import time
-import sys
 
+from src.agents.base_agent import run_agent_io
 from src.agents.generic_document_agent import GenericDocumentAgent
 from src.agents.special_agent_adapter import SpecialAgentAdapter
 from src.agents.special_agent_registry import get_special_agent_class
@@ -22,6 +24,8 @@ from src.config.document_catalog import (
 )
 from src.config.settings import get_settings
 from src.context.context_manager import ContextManager
+from src.context.shared_context import AgentOutput, AgentType, DocumentStatus, agent_type_for_document
+from src.quality.document_type_quality_checker import DocumentTypeQualityChecker
 from src.utils.logger import get_logger
 from src.coordination.metrics import get_metrics, clear_metrics
 
@@ -29,62 +33,123 @@ logger = get_logger(__name__)
 
 ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
 
+# Reviewer feedback passed to the document improver
+_QUALITY_FEEDBACK_HEADER = """Quality Review Results:
+- Quality Score: {score:.1f}/10
+- Overall Feedback: {feedback}
+- Primary Suggestion: {suggestion}
+
+Issues Identified:
+"""
+_PRIORITY_IMPROVEMENT_LINE = "  • {area}: {issue}\n    → Suggestion: {suggestion}\n"
+
+# Markdown heading (# to ######) on a line of its own
+_HEADING_PATTERN = re.compile(r"^#{1,6}[^\S\n]+(.+)$", re.MULTILINE)
+
+
+class _LazyAgents(Mapping):
+    """Document agents keyed by document ID, constructed on first access."""
+
+    def __init__(
+        self,
+        definitions: Dict[str, DocumentDefinition],
+        factory: Callable[[DocumentDefinition], Any],
+    ) -> None:
+        self._definitions = definitions
+        self._factory = factory
+        self._agents: Dict[str, Any] = {}
+
+    def __getitem__(self, document_id: str) -> Any:
+        agent = self._agents.get(document_id)
+        if agent is None:
+            agent = self._factory(self._definitions[document_id])
+            self._agents[document_id] = agent
+        return agent
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._definitions)
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
 
 class WorkflowCoordinator:
     """Coordinates configuration-driven document generation."""
     
+    # Automated score (0-100) at or above which a passing document skips the LLM review
+    AUTOMATED_PASS_SCORE = 85.0
+    # Background saves (or batched flushes) of improved documents in flight at once; the
+    # context manager serializes writes, so more would only park agent I/O threads on its lock
+    MAX_CONCURRENT_BACKGROUND_SAVES = 2
+    
     def __init__(
         self,
         context_manager: Optional[ContextManager] = None,
         provider_name: Optional[str] = None,
+        aggregate_context_writes: bool = True,
+        max_concurrency: Optional[int] = None,
+        skip_review_on_automated_pass: bool = True,
     ) -> None:
         settings = get_settings()
         self.context_manager = context_manager or ContextManager()
+        # Collect improved documents finishing together and write them in one transaction
+        self.aggregate_context_writes = aggregate_context_writes
+        # Upper bound on documents generated at once (defaults to settings.max_concurrent_agents)
+        self.max_concurrency = max_concurrency or settings.max_concurrent_agents
+        # Trust the local checker for clearly passing documents instead of asking the LLM
+        self.skip_review_on_automated_pass = skip_review_on_automated_pass
         self.definitions: Dict[str, DocumentDefinition] = load_document_definitions()
         self.provider_name = (provider_name or settings.default_llm_provider or "gemini").lower()
         self.output_root = Path(settings.docs_dir) / "projects"
         self.output_root.mkdir(parents=True, exist_ok=True)
+        # Agents and the quality review/improvement agents are created on first use;
+        # a workflow usually needs only a few of the catalog's documents
         self.agents = self._build_agents()
-        
-        # Initialize quality review and improvement agents
-        self.quality_reviewer = QualityReviewerAgent(provider_name=self.provider_name)
-        self.document_improver = DocumentImproverAgent(provider_name=self.provider_name)
-
-    def _build_agents(self) -> Dict[str, Union[GenericDocumentAgent, SpecialAgentAdapter]]:
-        """Build agents dictionary, using special agents when configured."""
-        agents: Dict[str, Union[GenericDocumentAgent, SpecialAgentAdapter]] = {}
-        for definition in self.definitions.values():
-            if definition.agent_class == "special":
-                # Try to get special agent class
-                special_agent_class = get_special_agent_class(definition.id, definition.special_key)
-                if special_agent_class:
-                    logger.debug("Using special agent %s for document %s", special_agent_class.__name__, definition.id)
-                    special_agent = special_agent_class(provider_name=self.provider_name)
-                    agents[definition.id] = SpecialAgentAdapter(
-                        agent=special_agent,
-                        definition=definition,
-                        base_output_dir=str(self.output_root),
-                        context_manager=self.context_manager,
-                    )
-                else:
-                    logger.warning(
-                        "Document %s marked as special but no special agent found, falling back to generic",
-                        definition.id,
-                    )
-                    agents[definition.id] = GenericDocumentAgent(
-                        definition=definition,
-                        provider_name=self.provider_name,
-                        base_output_dir=str(self.output_root),
-                    )
-            else:
-                # Use generic agent
-                agents[definition.id] = GenericDocumentAgent(
+
+    def _build_agents(self) -> Mapping[str, Union[GenericDocumentAgent, SpecialAgentAdapter]]:
+        """Agents dictionary; each agent is constructed the first time its document is generated."""
+        return _LazyAgents(self.definitions, self._build_agent)
+
+    def _build_agent(self, definition: DocumentDefinition) -> Union[GenericDocumentAgent, SpecialAgentAdapter]:
+        """Build the agent for one document, using a special agent when configured."""
+        if definition.agent_class == "special":
+            # Try to get special agent class
+            special_agent_class = get_special_agent_class(definition.id, definition.special_key)
+            if special_agent_class:
+                logger.debug("Using special agent %s for document %s", special_agent_class.__name__, definition.id)
+                special_agent = special_agent_class(provider_name=self.provider_name)
+                return SpecialAgentAdapter(
+                    agent=special_agent,
                     definition=definition,
-                    provider_name=self.provider_name,
                     base_output_dir=str(self.output_root),
                     context_manager=self.context_manager,
                 )
-        return agents
+            logger.warning(
+                "Document %s marked as special but no special agent found, falling back to generic",
+                definition.id,
+            )
+            return GenericDocumentAgent(
+                definition=definition,
+                provider_name=self.provider_name,
+                base_output_dir=str(self.output_root),
+            )
+        # Use generic agent
+        return GenericDocumentAgent(
+            definition=definition,
+            provider_name=self.provider_name,
+            base_output_dir=str(self.output_root),
+            context_manager=self.context_manager,
+        )
+
+    @cached_property
+    def quality_reviewer(self) -> QualityReviewerAgent:
+        """Quality review agent (created on first review)"""
+        return QualityReviewerAgent(provider_name=self.provider_name)
+
+    @cached_property
+    def document_improver(self) -> DocumentImproverAgent:
+        """Document improvement agent (created on first improvement)"""
+        return DocumentImproverAgent(provider_name=self.provider_name)
 
     async def _review_and_improve_document(
         self,
@@ -113,16 +178,6 @@ class WorkflowCoordinator:
         """
         try:
             # Step 1: Quality Review
-            if progress_callback:
-                await progress_callback(
-                    {
-                        "type": "quality_review_started",
-                        "project_id": project_id,
-                        "document_id": document_id,
-                        "name": document_name,
-                    }
-                )
-            
             # Extract sections for logging
             original_sections = self._extract_sections(original_content)
             logger.info(
@@ -142,12 +197,28 @@ class WorkflowCoordinator:
                 )
             
             # Get automated quality scores first (to include llm_focus and auto_fail)
-            from src.quality.document_type_quality_checker import DocumentTypeQualityChecker
             doc_type_checker = DocumentTypeQualityChecker()
-            automated_scores = doc_type_checker.check_quality_for_type(
+            # CPU-only scoring; keep it off the event loop (LLM calls no longer use the thread pool)
+            automated_check = asyncio.to_thread(
+                doc_type_checker.check_quality_for_type,
                 content=original_content,
                 document_type=document_name  # Use document name for better matching
             )
+            if progress_callback:
+                # The progress notification and the scoring are independent; run them together
+                _, automated_scores = await asyncio.gather(
+                    progress_callback(
+                        {
+                            "type": "quality_review_started",
+                            "project_id": project_id,
+                            "document_id": document_id,
+                            "name": document_name,
+                        }
+                    ),
+                    automated_check,
+                )
+            else:
+                automated_scores = await automated_check
             
             # Check for auto_fail conditions
             auto_fail_info = automated_scores.get("auto_fail", {})
@@ -162,15 +233,38 @@ class WorkflowCoordinator:
                     ", ".join(auto_fail_reasons) if auto_fail_reasons else "Auto-fail conditions met"
                 )
             
-            # Get structured feedback from quality reviewer (sync method, run in executor)
-            loop = asyncio.get_event_loop()
-            structured_feedback_dict = await loop.run_in_executor(
-                None,
-                lambda: self.quality_reviewer.generate_structured_feedback(
-                    document_content=original_content,
-                    document_type=document_type,
-                    automated_scores=automated_scores
+            # A document the local checker clearly passes is accepted without the LLM judge
+            automated_score = automated_scores.get("overall_score", 0)
+            if (
+                self.skip_review_on_automated_pass
+                and not auto_fail_triggered
+                and automated_scores.get("passed", False)
+                and automated_score >= self.AUTOMATED_PASS_SCORE
+            ):
+                logger.info(
+                    "✅ Document %s passed automated checks [Project: %s] [Score: %.1f/100] [Skipping LLM review]",
+                    document_id,
+                    project_id,
+                    automated_score
                 )
+                if progress_callback:
+                    await progress_callback(
+                        {
+                            "type": "quality_review_completed",
+                            "project_id": project_id,
+                            "document_id": document_id,
+                            "name": document_name,
+                            "score": automated_score / 10.0,
+                            "needs_improvement": False,
+                        }
+                    )
+                return original_content
+            
+            # Get structured feedback from quality reviewer
+            structured_feedback_dict = await self.quality_reviewer.async_generate_structured_feedback(
+                document_content=original_content,
+                document_type=document_type,
+                automated_scores=automated_scores
             )
             
             quality_score = structured_feedback_dict.get("score", 5.0)
@@ -252,54 +346,33 @@ class WorkflowCoordinator:
                 )
             
             # Step 4: Document improver identifies specific issues and generates improvement suggestions
-            if progress_callback:
-                await progress_callback(
-                    {
-                        "type": "improvement_started",
-                        "project_id": project_id,
-                        "document_id": document_id,
-                        "name": document_name,
-                    }
-                )
-            
-            # Get improvement suggestions from document improver
-            improvement_suggestions = structured_feedback_dict.get("priority_improvements", [])
-            missing_sections = structured_feedback_dict.get("missing_sections", [])
-            weaknesses = structured_feedback_dict.get("weaknesses", [])
-            
             # Build quality feedback text for document improver
-            quality_feedback_text = f"""Quality Review Results:
-- Quality Score: {quality_score:.1f}/10
-- Overall Feedback: {structured_feedback_dict.get('feedback', 'No feedback')}
-- Primary Suggestion: {structured_feedback_dict.get('suggestion', 'No specific suggestion')}
-
-Issues Identified:
-"""
-            if missing_sections:
-                quality_feedback_text += f"- Missing Sections: {', '.join(missing_sections)}\n"
-            if weaknesses:
-                quality_feedback_text += "- Weaknesses:\n"
-                for weakness in weaknesses:
-                    quality_feedback_text += f"  • {weakness}\n"
-            if improvement_suggestions:
-                quality_feedback_text += "- Priority Improvements:\n"
-                for improvement in improvement_suggestions[:5]:  # Limit to top 5
-                    if isinstance(improvement, dict):
-                        quality_feedback_text += f"  • {improvement.get('area', 'Unknown')}: {improvement.get('issue', '')}\n"
-                        quality_feedback_text += f"    → Suggestion: {improvement.get('suggestion', '')}\n"
+            quality_feedback_text = self._format_quality_feedback(quality_score, structured_feedback_dict)
             
             # Step 5: Use document improver to generate improved version
-            # Call improve_document in async context
-            loop = asyncio.get_event_loop()
-            improved_content = await loop.run_in_executor(
-                None,
-                lambda: self.document_improver.improve_document(
-                    original_document=original_content,
-                    document_type=document_type,
-                    quality_feedback=quality_feedback_text,
-                    structured_feedback=structured_feedback_dict,
-                )
+            improvement = self.document_improver.async_improve_document(
+                original_document=original_content,
+                document_type=document_type,
+                quality_feedback=quality_feedback_text,
+                structured_feedback=structured_feedback_dict,
             )
+            if progress_callback:
+                _, improved_content = await asyncio.gather(
+                    progress_callback(
+                        {
+                            "type": "improvement_started",
+                            "project_id": project_id,
+                            "document_id": document_id,
+                            "name": document_name,
+                        }
+                    ),
+                    improvement,
+                )
+            else:
+                improved_content = await improvement
+            
+            # Headings of the improved version, shared by the merge, validation and logging below
+            improved_sections = self._extract_sections(improved_content)
             
             # Step 6: Merge improved sections back into original
             # The document improver should preserve original structure and add improvements
@@ -308,7 +381,11 @@ Issues Identified:
                 original_content=original_content,
                 improved_content=improved_content,
                 structured_feedback={**structured_feedback_dict, "document_type": document_type},
+                original_sections=original_sections,
+                improved_sections=improved_sections,
             )
+            if merged_content is not improved_content:
+                improved_sections = self._extract_sections(merged_content)
             
             # Step 7: Validate improved content
             validation_result = self._validate_improved_content(
@@ -317,21 +394,13 @@ Issues Identified:
                 document_type=document_type,
                 document_id=document_id,
                 project_id=project_id,
+                original_sections=original_sections,
+                improved_sections=improved_sections,
             )
-            
-            # If validation fails critically, log warning but still use improved content
-            if not validation_result.get("passed", True):
-                logger.warning(
-                    "⚠️ Improved content validation failed for %s [Project: %s]: %s",
-                    document_id,
-                    project_id,
-                    validation_result.get("warnings", [])
-                )
+            # A failed validation is logged there; the improved content is still used
             
             improvement_ratio = (len(merged_content) / len(original_content)) * 100 if original_content else 0
             
-            # Extract sections for comparison
-            improved_sections = self._extract_sections(merged_content)
             section_change = len(improved_sections) - len(original_sections)
             
             logger.info(
@@ -382,15 +451,72 @@ Issues Identified:
             return merged_content
             
         except Exception as e:
-            logger.error(f"❌ Error during quality review/improvement for {document_id}: {e}", exc_info=True)
+            logger.error("❌ Error during quality review/improvement for %s: %s", document_id, e, exc_info=True)
             # Return original content if improvement fails
             return original_content
     
+    @staticmethod
+    def _improved_output(document_id: str, document_result: Dict[str, Any], improved_content: str) -> AgentOutput:
+        """
+        Build the context record for a document replaced by its improved version
+        
+        Args:
+            document_id: Document identifier
+            document_result: Result of the original generation (file path, quality score)
+            improved_content: Improved document content
+            
+        Returns:
+            AgentOutput marked complete, ready to save
+        """
+        agent_type = agent_type_for_document(document_id) or AgentType.TECHNICAL_DOCUMENTATION
+        
+        return AgentOutput(
+            agent_type=agent_type,
+            document_type=document_id,
+            content=improved_content,
+            file_path=document_result.get("file_path"),
+            status=DocumentStatus.COMPLETE,
+            quality_score=document_result.get("quality_score"),
+            # Saving replaces the stored row, so the timestamp must be set here too
+            generated_at=datetime.now(),
+        )
+    
+    @staticmethod
+    def _format_quality_feedback(quality_score: float, structured_feedback: Dict[str, Any]) -> str:
+        """Render structured reviewer feedback as the text handed to the document improver."""
+        parts = [
+            _QUALITY_FEEDBACK_HEADER.format(
+                score=quality_score,
+                feedback=structured_feedback.get("feedback", "No feedback"),
+                suggestion=structured_feedback.get("suggestion", "No specific suggestion"),
+            )
+        ]
+        missing_sections = structured_feedback.get("missing_sections", [])
+        weaknesses = structured_feedback.get("weaknesses", [])
+        improvement_suggestions = structured_feedback.get("priority_improvements", [])
+        if missing_sections:
+            parts.append(f"- Missing Sections: {', '.join(missing_sections)}\n")
+        if weaknesses:
+            parts.append("- Weaknesses:\n")
+            parts.extend(f"  • {weakness}\n" for weakness in weaknesses)
+        if improvement_suggestions:
+            parts.append("- Priority Improvements:\n")
+            for improvement in improvement_suggestions[:5]:  # Limit to top 5
+                if isinstance(improvement, dict):
+                    parts.append(_PRIORITY_IMPROVEMENT_LINE.format(
+                        area=improvement.get("area", "Unknown"),
+                        issue=improvement.get("issue", ""),
+                        suggestion=improvement.get("suggestion", ""),
+                    ))
+        return "".join(parts)
+    
     def _merge_improved_content(
         self,
         original_content: str,
         improved_content: str,
         structured_feedback: Dict,
+        original_sections: Optional[List[str]] = None,
+        improved_sections: Optional[List[str]] = None,
     ) -> str:
         """
         Merge improved content back into original document.
@@ -400,14 +526,19 @@ Issues Identified:
         2. If improved content is shorter, check if it's still complete (has all required sections)
         3. If improved content is significantly shorter and missing sections, log warning but use improved
         4. Add detailed logging for content comparison
+        
+        original_sections/improved_sections are the documents' headings, when
+        the caller has already extracted them.
         """
         original_length = len(original_content)
         improved_length = len(improved_content)
         length_ratio = improved_length / original_length if original_length > 0 else 1.0
         
         # Extract sections for comparison
-        original_sections = self._extract_sections(original_content)
-        improved_sections = self._extract_sections(improved_content)
+        if original_sections is None:
+            original_sections = self._extract_sections(original_content)
+        if improved_sections is None:
+            improved_sections = self._extract_sections(improved_content)
         
         # Log detailed comparison
         logger.info(
@@ -439,7 +570,6 @@ Issues Identified:
             
             # Check if improved content has all required sections from quality rules
             try:
-                from src.quality.document_type_quality_checker import DocumentTypeQualityChecker
                 checker = DocumentTypeQualityChecker()
                 # Try to get document type from structured_feedback or use a default
                 document_type = structured_feedback.get("document_type", "document")
@@ -467,7 +597,7 @@ Issues Identified:
                     else:
                         logger.info("✅ Improved content contains all required sections despite being shorter")
             except Exception as e:
-                logger.debug(f"Could not verify required sections: {e}")
+                logger.debug("Could not verify required sections: %s", e)
         
         # If improved content is significantly longer and has most sections, use it
         if length_ratio > 1.2 and len(improved_sections) >= len(original_sections) * 0.8:
@@ -489,14 +619,7 @@ Issues Identified:
     
     def _extract_sections(self, content: str) -> List[str]:
         """Extract section headings from markdown content."""
-        # Match markdown headings (# ## ### etc.)
-        heading_pattern = r'^#{1,6}\s+(.+)$'
-        sections = []
-        for line in content.split('\n'):
-            match = re.match(heading_pattern, line)
-            if match:
-                sections.append(match.group(1).strip())
-        return sections
+        return [heading.strip() for heading in _HEADING_PATTERN.findall(content)]
     
     def _validate_improved_content(
         self,
@@ -505,10 +628,15 @@ Issues Identified:
         document_type: str,
         document_id: str,
         project_id: str,
+        original_sections: Optional[List[str]] = None,
+        improved_sections: Optional[List[str]] = None,
     ) -> Dict:
         """
         Validate improved content to ensure it hasn't lost critical information.
         
+        original_sections/improved_sections are the documents' headings, when
+        the caller has already extracted them.
+        
         Returns:
             Dict with 'passed' (bool) and 'warnings' (list of strings)
         """
@@ -531,8 +659,10 @@ Issues Identified:
                 validation_result["passed"] = False
         
         # Check 2: Section preservation validation
-        original_sections = self._extract_sections(original_content)
-        improved_sections = self._extract_sections(improved_content)
+        if original_sections is None:
+            original_sections = self._extract_sections(original_content)
+        if improved_sections is None:
+            improved_sections = self._extract_sections(improved_content)
         
         if len(improved_sections) < len(original_sections) * 0.8:
             missing_sections = set(original_sections) - set(improved_sections)
@@ -545,7 +675,6 @@ Issues Identified:
         
         # Check 3: Required sections validation (from quality rules)
         try:
-            from src.quality.document_type_quality_checker import DocumentTypeQualityChecker
             checker = DocumentTypeQualityChecker()
             requirements = checker.get_requirements_for_type(document_type)
             required_sections = requirements.get("required_sections", [])
@@ -566,7 +695,7 @@ Issues Identified:
                     )
                     validation_result["passed"] = False
         except Exception as e:
-            logger.debug(f"Could not validate required sections: {e}")
+            logger.debug("Could not validate required sections: %s", e)
         
         # Log validation result
         if validation_result["passed"]:
@@ -593,10 +722,20 @@ Issues Identified:
         generated_docs: Dict[str, Dict[str, str]],
         progress_callback: Optional[ProgressCallback],
         total: int,
-        completed_count: int
+        completed_count: int,
+        pending_outputs: Optional[List[Any]] = None,
+        background_writes: Optional[Set[asyncio.Future]] = None,
+        background_save_slots: Optional[asyncio.Semaphore] = None,
     ) -> Dict:
         """
         Generate a single document. Helper for parallel execution.
+
+        When pending_outputs is given, the improved document is appended to it
+        instead of being saved, so the caller can flush it with others in one batch.
+        Otherwise, when background_writes is given, the improved document is
+        saved in the background (dependents read it from memory) and the save
+        is added to the set for the caller to await; background_save_slots, if
+        given, bounds how many of those saves run at once.
         """
         definition = self.definitions.get(document_id)
         if not definition:
@@ -642,16 +781,6 @@ Issues Identified:
                 if useful_doc_id in generated_docs:
                     dependency_payload[useful_doc_id] = generated_docs[useful_doc_id]
 
-        if progress_callback:
-            await progress_callback({
-                "type": "document_started",
-                "project_id": project_id,
-                "document_id": document_id,
-                "name": definition.name,
-                "index": str(completed_count + 1), # Approximate index
-                "total": str(total),
-            })
-
         output_rel_path = f"{project_id}/{document_id}.md"
         
         if isinstance(agent, SpecialAgentAdapter):
@@ -660,10 +789,10 @@ Issues Identified:
         
         doc_start_time = time.time()
         try:
-            logger.info(f"📝 Starting generation for {document_id} [Project: {project_id}]")
+            logger.info("📝 Starting generation for %s [Project: %s]", document_id, project_id)
             document_timeout = 1800
             
-            document_result = await asyncio.wait_for(
+            generation = asyncio.wait_for(
                 agent.generate_and_save(
                     user_idea=user_idea,
                     dependency_documents=dependency_payload,
@@ -672,6 +801,30 @@ Issues Identified:
                 ),
                 timeout=document_timeout
             )
+            if progress_callback:
+                # The start notification and the generation are independent; run them
+                # together. Only the generation decides the document's outcome: a failed
+                # notification (e.g. a dropped websocket) is logged, not raised
+                started, document_result = await asyncio.gather(
+                    progress_callback({
+                        "type": "document_started",
+                        "project_id": project_id,
+                        "document_id": document_id,
+                        "name": definition.name,
+                        "index": str(completed_count + 1), # Approximate index
+                        "total": str(total),
+                    }),
+                    generation,
+                    return_exceptions=True,
+                )
+                if isinstance(started, Exception):
+                    logger.warning("Start notification for %s failed: %s", document_id, started)
+                elif isinstance(started, BaseException):
+                    raise started
+                if isinstance(document_result, BaseException):
+                    raise document_result
+            else:
+                document_result = await generation
             
             # Quality Review
             original_content = document_result.get("content", "")
@@ -691,27 +844,17 @@ Issues Identified:
                 if improved_content and improved_content != original_content:
                     document_result["content"] = improved_content
                     # Update DB
-                    try:
-                        from src.context.shared_context import AgentType, DocumentStatus, AgentOutput
-                        try:
-                            agent_type = AgentType(document_id)
-                        except ValueError:
-                            try:
-                                agent_type = AgentType.TECHNICAL_DOCUMENTATION
-                            except:
-                                agent_type = list(AgentType)[0]
-                        
-                        output = AgentOutput(
-                            agent_type=agent_type,
-                            document_type=document_id,
-                            content=improved_content,
-                            file_path=document_result.get("file_path"),
-                            status=DocumentStatus.COMPLETE,
-                            quality_score=document_result.get("quality_score"),
+                    output = self._improved_output(document_id, document_result, improved_content)
+                    if pending_outputs is not None:
+                        pending_outputs.append(output)
+                    elif background_writes is not None:
+                        save = asyncio.ensure_future(
+                            self._save_improved_output(project_id, output, background_save_slots)
                         )
-                        self.context_manager.save_agent_output(project_id, output)
-                    except Exception as e:
-                        logger.error(f"Failed to save improved content for {document_id}: {e}")
+                        background_writes.add(save)
+                        save.add_done_callback(background_writes.discard)
+                    else:
+                        await self._save_improved_output(project_id, output)
 
             if progress_callback:
                 await progress_callback({
@@ -726,7 +869,7 @@ Issues Identified:
             return document_id, document_result
 
         except Exception as e:
-            logger.error(f"Failed to generate {document_id}: {e}", exc_info=True)
+            logger.error("Failed to generate %s: %s", document_id, e, exc_info=True)
             if progress_callback:
                 await progress_callback({
                     "type": "error",
@@ -737,6 +880,147 @@ Issues Identified:
                 })
             raise
 
+    async def _save_improved_output(
+        self, project_id: str, output: AgentOutput, slots: Optional[asyncio.Semaphore] = None
+    ) -> None:
+        """Save an improved document on the agent I/O pool (holding one of slots, if given), logging (not raising) failures"""
+        try:
+            if slots is None:
+                await run_agent_io(self.context_manager.save_agent_output, project_id, output)
+            else:
+                async with slots:
+                    await run_agent_io(self.context_manager.save_agent_output, project_id, output)
+        except Exception as e:
+            logger.error("Failed to save improved content for %s: %s", output.document_type, e)
+
+    async def _flush_improved_outputs(
+        self, project_id: str, pending_outputs: List[AgentOutput], slots: asyncio.Semaphore
+    ) -> None:
+        """
+        Once one of slots is free, save every improved document pending at that
+        moment in one transaction on the agent I/O pool, logging (not raising) failures
+
+        Documents queued while the slots are busy are picked up by whichever flush
+        runs next, so a flush may find nothing left to save.
+        """
+        async with slots:
+            if not pending_outputs:
+                return
+            outputs = pending_outputs[:]
+            del pending_outputs[:]
+            try:
+                await run_agent_io(self.context_manager.batch_save, project_id, outputs)
+            except Exception as e:
+                logger.error("Failed to save %d improved document(s): %s", len(outputs), e)
+
+    async def _run_dag(
+        self,
+        execution_plan: List[str],
+        run_document: Callable[[str], Awaitable[Any]],
+        on_done: Callable[[str, Any], Awaitable[None]],
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        Run documents as soon as their dependencies have completed.
+        
+        Each document is dispatched the moment its last dependency finishes,
+        so a slow document only delays its own dependents rather than a
+        whole wave. Dependents of a failed document are never started.
+        When more documents are ready than there are free workers, those
+        heading the longest chains of dependents go first (then plan order).
+        
+        Args:
+            execution_plan: Documents to generate (dependencies included)
+            run_document: Coroutine function generating one document
+            on_done: Awaited with (document_id, result or exception) once a
+                document finishes, before its dependents are released
+            max_concurrency: Maximum documents generated at once (None = no limit)
+        """
+        plan = set(execution_plan)
+        pending_count: Dict[str, int] = {}
+        reverse_deps: Dict[str, List[str]] = {doc_id: [] for doc_id in execution_plan}
+        for doc_id in execution_plan:
+            deps = [dep for dep in get_all_dependencies(doc_id) if dep in plan]
+            pending_count[doc_id] = len(deps)
+            for dep in deps:
+                reverse_deps[dep].append(doc_id)
+
+        # Length of the longest dependent chain starting at each document (the
+        # plan is topologically ordered, so dependents are seen first)
+        chain_length: Dict[str, int] = {}
+        for doc_id in reversed(execution_plan):
+            chain_length[doc_id] = 1 + max(
+                (chain_length.get(child, 0) for child in reverse_deps[doc_id]), default=0
+            )
+        plan_index = {doc_id: index for index, doc_id in enumerate(execution_plan)}
+
+        # Entries are (-chain length, plan index, document); stop sentinels sort last
+        ready: asyncio.PriorityQueue = asyncio.PriorityQueue()
+
+        def release(doc_id: str) -> None:
+            ready.put_nowait((-chain_length[doc_id], plan_index[doc_id], doc_id))
+
+        for doc_id in execution_plan:
+            if pending_count[doc_id] == 0:
+                release(doc_id)
+        if ready.empty():
+            if execution_plan:
+                logger.error("Deadlock detected in generation: no document has all dependencies met.")
+            return
+
+        total = len(execution_plan)
+        settled = 0
+        worker_count = min(max_concurrency or total, total)
+
+        def settle(count: int) -> None:
+            nonlocal settled
+            settled += count
+            if settled == total:
+                # Wake every idle worker so it can exit
+                for _ in range(worker_count):
+                    ready.put_nowait((0, 0, None))
+
+        def block_dependents(doc_id: str) -> int:
+            blocked = 0
+            stack = list(reverse_deps[doc_id])
+            while stack:
+                child = stack.pop()
+                if pending_count[child] < 0:
+                    continue
+                pending_count[child] = -1
+                blocked += 1
+                stack.extend(reverse_deps[child])
+            if blocked:
+                logger.warning("Skipping %d document(s) depending on failed %s", blocked, doc_id)
+            return blocked
+
+        async def worker() -> None:
+            while True:
+                _, _, doc_id = await ready.get()
+                if doc_id is None:
+                    return
+                try:
+                    result: Any = await run_document(doc_id)
+                except Exception as exc:
+                    result = exc
+                try:
+                    await on_done(doc_id, result)
+                except Exception as exc:
+                    # Keep scheduling; a dead worker would stall the remaining documents
+                    logger.error("Error recording result for %s: %s", doc_id, exc, exc_info=True)
+
+                if isinstance(result, Exception):
+                    settle(1 + block_dependents(doc_id))
+                    continue
+                for child in reverse_deps[doc_id]:
+                    if pending_count[child] > 0:
+                        pending_count[child] -= 1
+                        if pending_count[child] == 0:
+                            release(child)
+                settle(1)
+
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+
     async def async_generate_all_docs(
         self,
         user_idea: str,
@@ -744,7 +1028,24 @@ Issues Identified:
         selected_documents: List[str],
         codebase_path: Optional[str] = None,
         progress_callback: Optional[ProgressCallback] = None,
+        previous_results: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Dict]:
+        """
+        Generate the selected documents and their dependencies.
+        
+        Args:
+            user_idea: User's project idea
+            project_id: Project identifier
+            selected_documents: Document IDs to generate
+            codebase_path: Unused
+            progress_callback: Awaited with progress events
+            previous_results: Results of an earlier, failed run of this project
+                (as stored in its status); documents generated there are reused
+                and only the rest are generated
+            
+        Returns:
+            Results with the generated "files", "documents" and a "summary"
+        """
         del codebase_path
 
         if not selected_documents:
@@ -762,12 +1063,29 @@ Issues Identified:
         results: Dict[str, Dict] = {"files": {}, "documents": []}
         
         completed_docs: Set[str] = set()
-        # Note: execution_plan includes selected docs AND their dependencies.
-        # We need to process ALL of them.
-        pending_docs = set(execution_plan)
+        
+        # On a retry, keep what the failed run already generated
+        if previous_results:
+            previous_files = previous_results.get("files") or {}
+            for doc_id in execution_plan:
+                entry = previous_files.get(doc_id)
+                if isinstance(entry, dict) and entry.get("content"):
+                    generated_docs[doc_id] = {"content": entry["content"], "file_path": entry.get("file_path", "")}
+                    results["files"][doc_id] = entry
+                    completed_docs.add(doc_id)
+            results["documents"] = [
+                doc for doc in previous_results.get("documents") or []
+                if isinstance(doc, dict) and doc.get("id") in completed_docs
+            ]
+            if completed_docs:
+                logger.info(
+                    "♻️ Reusing %d document(s) from the previous run [Project: %s]",
+                    len(completed_docs),
+                    project_id
+                )
         
         workflow_start_time = time.time()
-        logger.info(f"🚀 Starting PARALLEL workflow [Project: {project_id}] [Total: {total}]")
+        logger.info("🚀 Starting PARALLEL workflow [Project: %s] [Total: %s]", project_id, total)
         
         # Initialize metrics tracking
         metrics = get_metrics(project_id)
@@ -781,133 +1099,113 @@ Issues Identified:
                 "total": str(total),
             })
 
-        # Loop until all documents are processed
-        wave_number = 0
-        while pending_docs:
-            wave_number += 1
-            wave_start_time = time.time()
-            
-            # Find documents whose dependencies are all met
-            ready_batch = []
-            for doc_id in pending_docs:
-                deps = get_all_dependencies(doc_id)
-                # Check if all dependencies are in completed_docs
-                # Note: Deps must be in 'generated_docs' which implies they finished successfully.
-                if all(dep in completed_docs for dep in deps if dep in execution_plan):
-                    # Also verify deps that are NOT in execution plan (e.g. pre-existing)? 
-                    # resolve_dependencies ensures all needed deps are in the plan.
-                    ready_batch.append(doc_id)
-            
-            if not ready_batch:
-                # This shouldn't happen if resolve_dependencies passed, unless there's a logic bug
-                # or a cycle passed through (unlikely).
-                logger.error("Deadlock detected in generation: pending docs have unmet dependencies but no progress can be made.")
-                logger.error(f"Pending: {pending_docs}")
-                logger.error(f"Completed: {completed_docs}")
-                break
-
-            # Sort batch to be deterministic (e.g. by index in execution_plan) to reduce chaos
-            ready_batch.sort(key=lambda x: execution_plan.index(x))
-            
-            logger.info(f"⚡ Processing parallel batch {wave_number}: {ready_batch}")
-            
-            # Record metrics for this wave
-            for doc_id in ready_batch:
-                metrics.record_document_start(doc_id)
-            
-            # Execute batch in parallel
-            tasks = []
-            for doc_id in ready_batch:
-                tasks.append(self._generate_single_doc(
-                    document_id=doc_id,
-                    project_id=project_id,
-                    user_idea=user_idea,
-                    generated_docs=generated_docs,
-                    progress_callback=progress_callback,
-                    total=total,
-                    completed_count=len(completed_docs)
-                ))
-            
-            # Wait for all in batch to complete
-            # We use return_exceptions=True to continue even if some fail
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            wave_duration = time.time() - wave_start_time
-            
-            for i, res in enumerate(batch_results):
-                doc_id = ready_batch[i]
-                if isinstance(res, Exception):
-                    logger.error(f"Error generating {doc_id}: {res}")
-                    # Record failure in metrics
-                    metrics.record_document_complete(doc_id, success=False)
-                    
-                    # If a doc fails, we cannot generate its dependents.
-                    # We remove it from pending but do NOT add to completed.
-                    # This will naturally block dependents.
-                    pending_docs.remove(doc_id)
-                    
-                    # Don't update project status here - wait until all waves complete
-                    # to determine final status (complete, partial_failure, or failed)
-                else:
-                    # Success
-                    d_id, d_result = res
-                    generated_docs[d_id] = d_result
-                    completed_docs.add(d_id)
-                    pending_docs.remove(d_id)
-                    
-                    # Record success in metrics
-                    metrics.record_document_complete(d_id, success=True)
-                    
-                    # Add to results
-                    definition = self.definitions.get(d_id)
-                    results["files"][d_id] = {
-                        "content": d_result.get("content", ""),
-                        "path": d_result.get("file_path", ""),
-                        "file_path": d_result.get("file_path", ""),
-                    }
-                    
-                    if definition:
-                        results["documents"].append({
-                            "id": d_id,
-                    "name": definition.name,
-                    "category": definition.category,
-                            "file_path": d_result.get("file_path", ""),
-                            "generated_at": d_result.get("generated_at"),
-                    "dependencies": definition.dependencies,
-                        })
-                    
-                    # Update status incrementally
-            self.context_manager.update_project_status(
+        pending_outputs: Optional[List[Any]] = [] if self.aggregate_context_writes else None
+        background_writes: Set[asyncio.Future] = set()
+        background_save_slots = asyncio.Semaphore(self.MAX_CONCURRENT_BACKGROUND_SAVES)
+
+        async def run_document(doc_id: str) -> Any:
+            metrics.record_document_start(doc_id)
+            return await self._generate_single_doc(
+                document_id=doc_id,
                 project_id=project_id,
-                status="in_progress",
-                        user_idea=user_idea,
-                        completed_agents=list(completed_docs),
-                results=results,
-                selected_documents=selected_documents,
+                user_idea=user_idea,
+                generated_docs=generated_docs,
+                progress_callback=progress_callback,
+                total=total,
+                completed_count=len(completed_docs),
+                pending_outputs=pending_outputs,
+                background_writes=background_writes,
+                background_save_slots=background_save_slots,
             )
 
-            # Calculate parallel efficiency after all documents in batch have completed
-            # Sum up actual durations of successfully completed documents in this wave
-            sequential_estimate = sum(
-                metrics.document_times.get(doc_id, {}).get("duration", 0)
-                for doc_id in ready_batch
-                if doc_id in metrics.document_times and metrics.document_times[doc_id].get("duration") is not None
-            )
-            parallel_efficiency = (sequential_estimate / wave_duration * 100) if wave_duration > 0 and sequential_estimate > 0 else 0
-            
-            # Record wave metrics
-            metrics.record_wave_execution(
-                wave_number=wave_number,
-                documents=ready_batch,
-                execution_time=wave_duration,
-                parallel_efficiency=parallel_efficiency
-            )
+        async def on_done(doc_id: str, res: Any) -> None:
+            if isinstance(res, Exception):
+                logger.error("Error generating %s: %s", doc_id, res)
+                # Dependents of a failed document are never scheduled
+                metrics.record_document_complete(doc_id, success=False)
+            else:
+                d_id, d_result = res
+                generated_docs[d_id] = d_result
+                completed_docs.add(d_id)
+                metrics.record_document_complete(d_id, success=True)
+
+                definition = self.definitions.get(d_id)
+                results["files"][d_id] = {
+                    "content": d_result.get("content", ""),
+                    "path": d_result.get("file_path", ""),
+                    "file_path": d_result.get("file_path", ""),
+                }
+                if definition:
+                    results["documents"].append({
+                        "id": d_id,
+                        "name": definition.name,
+                        "category": definition.category,
+                        "file_path": d_result.get("file_path", ""),
+                        "generated_at": d_result.get("generated_at"),
+                        "dependencies": definition.dependencies,
+                    })
+
+            # Improved documents are saved in the background (dependents read them from
+            # memory); those queued while the save slots are busy share one transaction
+            if pending_outputs:
+                flush = asyncio.ensure_future(
+                    self._flush_improved_outputs(project_id, pending_outputs, background_save_slots)
+                )
+                background_writes.add(flush)
+                flush.add_done_callback(background_writes.discard)
+
+            # Update status incrementally, off the scheduling path: dependents are
+            # released without waiting for the write (snapshot, written in order)
+            status_write = asyncio.ensure_future(write_status(
+                list(completed_docs),
+                {"files": dict(results["files"]), "documents": list(results["documents"])},
+            ))
+            status_writes.add(status_write)
+            status_write.add_done_callback(status_writes.discard)
+
+        status_lock = asyncio.Lock()
+        status_writes: Set[asyncio.Future] = set()
+
+        async def write_status(completed_agents: List[str], results_snapshot: Dict[str, Any]) -> None:
+            async with status_lock:
+                try:
+                    await run_agent_io(
+                        self.context_manager.update_project_status,
+                        project_id=project_id,
+                        status="in_progress",
+                        user_idea=user_idea,
+                        completed_agents=completed_agents,
+                        results=results_snapshot,
+                        selected_documents=selected_documents,
+                    )
+                except Exception as e:
+                    logger.error("Failed to update progress for project %s: %s", project_id, e)
+
+        dag_start_time = time.time()
+        remaining_plan = [doc_id for doc_id in execution_plan if doc_id not in completed_docs]
+        await self._run_dag(remaining_plan, run_document, on_done, max_concurrency=self.max_concurrency)
+        dag_duration = time.time() - dag_start_time
+        # The final status below must not be overwritten by a late progress update
+        # (nor land before the improved documents are saved)
+        if status_writes or background_writes:
+            await asyncio.gather(*status_writes, *background_writes)
+
+        # Parallel efficiency of the whole DAG run: summed document time over wall time
+        sequential_estimate = metrics.sequential_time
+        parallel_efficiency = (sequential_estimate / dag_duration * 100) if dag_duration > 0 and sequential_estimate > 0 else 0
+        metrics.record_wave_execution(
+            wave_number=1,
+            documents=remaining_plan,
+            execution_time=dag_duration,
+            parallel_efficiency=parallel_efficiency
+        )
 
         # Finalize
         workflow_duration = time.time() - workflow_start_time
         
-        # Log metrics summary
-        metrics.log_summary()
+        # Log metrics summary (computed once, also stored in the results)
+        metrics_summary = metrics.get_summary()
+        metrics.log_summary(metrics_summary)
         
         # Determine final status based on completed vs failed documents
         total_completed = len(completed_docs)
@@ -927,17 +1225,19 @@ Issues Identified:
             else:
                 error_message = f"{total_completed}/{total} documents completed"
         
-        logger.info(f"🎉 Workflow completed in {workflow_duration:.2f}s. Generated {total_completed}/{total} docs. Failed: {total_failed}")
+        logger.info("🎉 Workflow completed in %.2fs. Generated %s/%s docs. Failed: %s", workflow_duration, total_completed, total, total_failed)
 
         results["summary"] = {
             "project_id": project_id,
             "generated_at": datetime.now().isoformat(),
             "total_documents": total_completed,
             "selected_documents": selected_documents,
-            "metrics": metrics.get_summary(),  # Include metrics in results
+            "metrics": metrics_summary,  # Include metrics in results
         }
         
-        self.context_manager.update_project_status(
+        # Blocking database write; keep it off the event loop like the progress writes
+        await run_agent_io(
+            self.context_manager.update_project_status,
             project_id=project_id,
             status=final_status,
             user_idea=user_idea,
@@ -27,9 +27,15 @@ class ParallelExecutionMetrics:
         self.total_documents = 0
         self.completed_documents = 0
         self.failed_documents = 0
+        # Running totals, so summaries need not re-scan documents and waves
+        self.sequential_time = 0.0  # Summed duration of finished documents
+        self.wave_document_count = 0
         
     def record_document_start(self, document_id: str) -> None:
         """Record when a document starts generation"""
+        previous = self.document_times.get(document_id)
+        if previous and previous.get("duration") is not None:
+            self.sequential_time -= previous["duration"]
         self.document_times[document_id] = {
             "start": time.time(),
             "end": None,
@@ -40,9 +46,11 @@ class ParallelExecutionMetrics:
         """Record when a document completes generation"""
         if document_id in self.document_times:
             end_time = time.time()
-            self.document_times[document_id]["end"] = end_time
-            duration = end_time - self.document_times[document_id]["start"]
-            self.document_times[document_id]["duration"] = duration
+            times = self.document_times[document_id]
+            times["end"] = end_time
+            duration = end_time - times["start"]
+            self.sequential_time += duration - (times["duration"] or 0.0)
+            times["duration"] = duration
             
             if success:
                 self.completed_documents += 1
@@ -62,6 +70,7 @@ class ParallelExecutionMetrics:
         parallel_efficiency: float
     ) -> None:
         """Record a wave of parallel execution"""
+        self.wave_document_count += len(documents)
         self.wave_executions.append({
             "wave_number": wave_number,
             "documents": documents,
@@ -79,10 +88,7 @@ class ParallelExecutionMetrics:
         
         # Calculate parallelization efficiency
         # If all docs ran sequentially, what would the time be?
-        sequential_time = sum(
-            doc.get("duration", 0) for doc in self.document_times.values()
-            if doc.get("duration") is not None
-        )
+        sequential_time = self.sequential_time
         
         parallel_efficiency = (
             (sequential_time / total_time) * 100 if total_time > 0 else 0
@@ -90,7 +96,7 @@ class ParallelExecutionMetrics:
         
         # Calculate average wave size (number of documents per wave)
         avg_wave_size = (
-            sum(len(w["documents"]) for w in self.wave_executions) / len(self.wave_executions)
+            self.wave_document_count / len(self.wave_executions)
             if self.wave_executions else 0
         )
         
@@ -114,9 +120,10 @@ class ParallelExecutionMetrics:
             }
         }
     
-    def log_summary(self) -> None:
-        """Log execution summary"""
-        summary = self.get_summary()
+    def log_summary(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        """Log execution summary (summary: get_summary() result, if already computed)"""
+        if summary is None:
+            summary = self.get_summary()
         
         logger.info(
             f"📊 Parallel Execution Metrics [Project: {self.project_id}]:\n"
@@ -6,7 +6,7 @@ Supports both sync and async operations.
 For async support, implement async_generate() method.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List
 import asyncio
 
 
@@ -78,15 +78,11 @@ class BaseLLMProvider(ABC):
         logger = get_logger(__name__)
         logger.debug(f"BaseLLMProvider.async_generate: prompt length: {len(prompt)}, model: {model}")
         
-        loop = asyncio.get_event_loop()
         start_time = time.time()
         try:
             # Add timeout to prevent hanging (4 minutes for the sync call)
             result = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: self.generate(prompt, model, temperature, max_tokens, **kwargs)
-                ),
+                asyncio.to_thread(self.generate, prompt, model, temperature, max_tokens, **kwargs),
                 timeout=240.0  # 4 minutes timeout
             )
             elapsed = time.time() - start_time
@@ -101,6 +97,32 @@ class BaseLLMProvider(ABC):
             logger.error(f"LLM generation failed after {elapsed:.2f}s: {type(e).__name__}: {str(e)}", exc_info=True)
             raise
     
+    def generate_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Generate text from prompt, yielding chunks as they arrive
+        
+        Default implementation yields the full generate() response as one chunk.
+        Override this method for native streaming support.
+        
+        Args:
+            prompt: Input prompt
+            model: Model name (if None, uses default)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Provider-specific parameters
+            
+        Yields:
+            Text chunks
+        """
+        yield self.generate(prompt, model, temperature, max_tokens, **kwargs)
+    
     @abstractmethod
     def get_available_models(self) -> list:
         """
@@ -121,6 +143,46 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    def supports_batch(self) -> bool:
+        """Whether the provider offers an asynchronous batch endpoint"""
+        return False
+    
+    def submit_batch(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """
+        Submit prompts to the provider's batch endpoint
+        
+        Args:
+            prompts: Input prompts
+            model: Model name (if None, uses default)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate per prompt
+            system_prompt: Static instructions shared by every prompt
+            
+        Returns:
+            Provider batch ID
+        """
+        raise NotImplementedError(f"{self.get_provider_name()} does not support batch requests")
+    
+    def poll_batch(self, batch_id: str, count: int) -> Optional[List[Optional[str]]]:
+        """
+        Check a submitted batch
+        
+        Args:
+            batch_id: Batch ID returned by submit_batch
+            count: Number of prompts in the batch
+            
+        Returns:
+            Responses in prompt order (None for failed items), or None while still running
+        """
+        raise NotImplementedError(f"{self.get_provider_name()} does not support batch requests")
+    
     def validate_config(self) -> bool:
         """
         Validate provider configuration
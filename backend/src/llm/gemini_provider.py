@@ -5,7 +5,7 @@ Implements BaseLLMProvider for Google Gemini API
 import os
 import time
 import random
-from typing import Optional
+from typing import Iterator, Optional
 import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
 from src.llm.base_provider import BaseLLMProvider
@@ -186,6 +186,14 @@ class GeminiProvider(BaseLLMProvider):
                     )
                 raise RuntimeError(f"Failed to initialize any Gemini model: {e}")
     
+    def _get_model(self, model_name: str, system_prompt: Optional[str] = None):
+        """Model instance for a request; a system prompt is set as the system instruction"""
+        if system_prompt:
+            return genai.GenerativeModel(model_name, system_instruction=system_prompt)
+        if model_name != self.default_model_name:
+            return genai.GenerativeModel(model_name)
+        return self._model
+    
     def generate(
         self,
         prompt: str,
@@ -194,6 +202,7 @@ class GeminiProvider(BaseLLMProvider):
         max_tokens: Optional[int] = None,
         max_retries: int = 5,
         initial_retry_delay: float = 2.0,
+        system_prompt: Optional[str] = None,
         **kwargs
     ) -> str:
         """
@@ -206,6 +215,7 @@ class GeminiProvider(BaseLLMProvider):
             max_tokens: Max tokens (Gemini uses max_output_tokens)
             max_retries: Maximum number of retries for rate limit errors (default: 5)
             initial_retry_delay: Initial delay in seconds before retry (default: 2.0)
+            system_prompt: Static instructions passed as the model's system instruction
             **kwargs: Additional Gemini parameters
             
         Returns:
@@ -217,11 +227,7 @@ class GeminiProvider(BaseLLMProvider):
         # Use provided model or default
         model_name = model or self.default_model_name
         
-        # Create model instance if different from default
-        if model_name != self.default_model_name:
-            gen_model = genai.GenerativeModel(model_name)
-        else:
-            gen_model = self._model
+        gen_model = self._get_model(model_name, system_prompt)
         
         # Configure generation parameters
         generation_config = {
@@ -412,6 +418,56 @@ class GeminiProvider(BaseLLMProvider):
         # Should not reach here, but just in case
         raise RuntimeError("Gemini API call failed for unknown reason")
     
+    def generate_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Generate text using Gemini API, yielding chunks as they arrive
+        
+        Rate limit errors are not retried here (a partially streamed response
+        cannot be replayed); callers fall back to generate() if needed.
+        
+        Args:
+            prompt: Input prompt
+            model: Model name (uses default if None)
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Max tokens (Gemini uses max_output_tokens)
+            system_prompt: Static instructions passed as the model's system instruction
+            **kwargs: Additional Gemini parameters
+            
+        Yields:
+            Text chunks
+        """
+        model_name = model or self.default_model_name
+        gen_model = self._get_model(model_name, system_prompt)
+        
+        generation_config = {
+            "temperature": temperature,
+            **kwargs
+        }
+        if max_tokens:
+            generation_config["max_output_tokens"] = max_tokens
+        
+        try:
+            response = gen_model.generate_content(
+                prompt,
+                generation_config=generation_config,
+                stream=True
+            )
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except google_exceptions.ResourceExhausted as e:
+            raise RuntimeError(f"Gemini API rate limit exceeded (429): {str(e)}")
+        except google_exceptions.GoogleAPIError as e:
+            raise RuntimeError(f"Gemini API error: {str(e)}")
+    
     def get_available_models(self) -> list:
         """Get list of available Gemini models"""
         try:
@@ -5,7 +5,7 @@ Supports both sync and async operations
 """
 import os
 import time
-from typing import Optional
+from typing import List, Optional
 import requests
 from requests.exceptions import ConnectionError, RequestException
 import aiohttp
@@ -109,12 +109,21 @@ class OllamaProvider(BaseLLMProvider):
         except (ConnectionError, RequestException):
             return False
     
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[dict]:
+        """Chat messages with the static system prompt first and the dynamic prompt last"""
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        return messages
+    
     def generate(
         self,
         prompt: str,
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
         **kwargs
     ) -> str:
         """
@@ -126,6 +135,7 @@ class OllamaProvider(BaseLLMProvider):
             temperature: Sampling temperature (0.0-1.0)
             max_tokens: Maximum tokens to generate (defaults to 8192 if not provided)
                        This ensures longer outputs similar to Gemini's default behavior
+            system_prompt: Static instructions sent as a leading system message
             **kwargs: Additional Ollama parameters (e.g., top_p, top_k)
             
         Returns:
@@ -140,9 +150,7 @@ class OllamaProvider(BaseLLMProvider):
         # Prepare request payload
         payload = {
             "model": model_name,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
+            "messages": self._build_messages(prompt, system_prompt),
             "stream": False,
             "options": {
                 "temperature": temperature,
@@ -372,6 +380,7 @@ class OllamaProvider(BaseLLMProvider):
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
         **kwargs
     ) -> str:
         """
@@ -382,6 +391,7 @@ class OllamaProvider(BaseLLMProvider):
             model: Model name (uses default if None)
             temperature: Sampling temperature (0.0-1.0)
             max_tokens: Maximum tokens to generate (defaults to 8192 if not provided)
+            system_prompt: Static instructions sent as a leading system message
             **kwargs: Additional Ollama parameters
         
         Returns:
@@ -392,9 +402,7 @@ class OllamaProvider(BaseLLMProvider):
         # Prepare request payload (same as sync version)
         payload = {
             "model": model_name,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
+            "messages": self._build_messages(prompt, system_prompt),
             "stream": False,
             "options": {
                 "temperature": temperature,
@@ -2,8 +2,10 @@
 OpenAI GPT LLM Provider
 Implements BaseLLMProvider for OpenAI API
 """
+import io
+import json
 import os
-from typing import Optional
+from typing import Iterator, List, Optional
 from src.llm.base_provider import BaseLLMProvider
 
 # OpenAI will be imported only when needed
@@ -58,6 +60,7 @@ class OpenAIProvider(BaseLLMProvider):
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
         **kwargs
     ) -> str:
         """
@@ -68,6 +71,8 @@ class OpenAIProvider(BaseLLMProvider):
             model: Model name (uses default if None)
             temperature: Sampling temperature (0.0-2.0)
             max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions sent as a leading system message
+                (a stable prefix that OpenAI prompt caching can reuse)
             **kwargs: Additional OpenAI parameters
             
         Returns:
@@ -78,9 +83,7 @@ class OpenAIProvider(BaseLLMProvider):
         try:
             response = self.client.chat.completions.create(
                 model=model_name,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._build_messages(prompt, system_prompt),
                 temperature=temperature,
                 max_tokens=max_tokens,
                 **kwargs
@@ -89,6 +92,146 @@ class OpenAIProvider(BaseLLMProvider):
         except Exception as e:
             raise RuntimeError(f"OpenAI API error: {str(e)}")
     
+    def generate_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Generate text using OpenAI API, yielding chunks as they arrive
+        
+        Args:
+            prompt: Input prompt
+            model: Model name (uses default if None)
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions sent as a leading system message
+            **kwargs: Additional OpenAI parameters
+            
+        Yields:
+            Text chunks
+        """
+        model_name = model or self.default_model_name
+        
+        try:
+            stream = self.client.chat.completions.create(
+                model=model_name,
+                messages=self._build_messages(prompt, system_prompt),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **kwargs
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {str(e)}")
+    
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[dict]:
+        """Chat messages with the static system prompt first and the dynamic prompt last"""
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        return messages
+    
+    def supports_batch(self) -> bool:
+        """OpenAI supports the Batch API"""
+        return True
+    
+    def submit_batch(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """
+        Upload prompts as a JSONL file and create a Batch API job
+        
+        Args:
+            prompts: Input prompts
+            model: Model name (uses default if None)
+            temperature: Sampling temperature (0.0-2.0)
+            max_tokens: Maximum tokens to generate per prompt
+            system_prompt: Static instructions sent as a leading system message
+            
+        Returns:
+            Batch ID
+        """
+        model_name = model or self.default_model_name
+        lines = []
+        for index, prompt in enumerate(prompts):
+            body = {
+                "model": model_name,
+                "messages": self._build_messages(prompt, system_prompt),
+                "temperature": temperature,
+            }
+            if max_tokens is not None:
+                body["max_tokens"] = max_tokens
+            lines.append(json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }))
+        
+        try:
+            batch_file = self.client.files.create(
+                file=("batch.jsonl", io.BytesIO("\n".join(lines).encode("utf-8"))),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            return batch.id
+        except Exception as e:
+            raise RuntimeError(f"OpenAI batch submission error: {str(e)}")
+    
+    def poll_batch(self, batch_id: str, count: int) -> Optional[List[Optional[str]]]:
+        """
+        Check a Batch API job and collect its output once finished
+        
+        Args:
+            batch_id: Batch ID returned by submit_batch
+            count: Number of prompts in the batch
+            
+        Returns:
+            Responses in prompt order (None for failed items), or None while still running
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+        except Exception as e:
+            raise RuntimeError(f"OpenAI batch status error: {str(e)}")
+        
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"OpenAI batch {batch_id} ended with status: {batch.status}")
+        if batch.status != "completed":
+            return None
+        
+        results: List[Optional[str]] = [None] * count
+        if batch.output_file_id:
+            output = self.client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                choices = response.get("body", {}).get("choices") or []
+                if choices:
+                    results[int(item["custom_id"])] = choices[0]["message"]["content"]
+        return results
+    
     def get_available_models(self) -> list:
         """Get list of available OpenAI models"""
         # Common OpenAI models
@@ -3,14 +3,24 @@ Document Type-Aware Quality Checker
 Provides document-type-specific quality checking with appropriate thresholds
 Uses quality_rules.json for configuration
 """
+import copy
+import hashlib
 import json
 import re
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
+from threading import Lock
 from typing import Dict, List, Optional
 from src.quality.quality_checker import QualityChecker
 from src.context.shared_context import AgentType
 from src.utils.logger import get_logger
 
+try:
+    import xxhash
+except ImportError:  # xxhash is optional, blake2b is used instead
+    xxhash = None
+
 logger = get_logger(__name__)
 
 # Load quality rules from JSON file
@@ -26,18 +36,72 @@ def _load_quality_rules() -> Dict[str, Dict]:
         if config_path.exists():
             with open(config_path, 'r', encoding='utf-8') as f:
                 rules = json.load(f)
-                logger.info(f"Loaded quality rules from {config_path}")
+                logger.info("Loaded quality rules from %s", config_path)
                 return rules
         else:
-            logger.warning(f"Quality rules file not found at {config_path}, using defaults")
+            logger.warning("Quality rules file not found at %s, using defaults", config_path)
             return {}
     except Exception as e:
-        logger.error(f"Error loading quality rules: {e}", exc_info=True)
+        logger.error("Error loading quality rules: %s", e, exc_info=True)
         return {}
 
 # Load rules at module level
 QUALITY_RULES = _load_quality_rules()
 
+# Common document names mapped to agent types, in match order (substring match,
+# so the first key contained in a name wins)
+_DOCUMENT_NAME_TO_TYPE: Dict[str, str] = {
+    "requirements": AgentType.REQUIREMENTS_ANALYST.value,
+    "project_charter": AgentType.PROJECT_CHARTER.value,
+    "charter": AgentType.PROJECT_CHARTER.value,
+    "pm_documentation": AgentType.PM_DOCUMENTATION.value,
+    "project_plan": AgentType.PM_DOCUMENTATION.value,
+    "pm": AgentType.PM_DOCUMENTATION.value,
+    "user_stories": AgentType.USER_STORIES.value,
+    "technical_documentation": AgentType.TECHNICAL_DOCUMENTATION.value,
+    "technical_spec": AgentType.TECHNICAL_DOCUMENTATION.value,
+    "technical": AgentType.TECHNICAL_DOCUMENTATION.value,
+    "database_schema": AgentType.DATABASE_SCHEMA.value,
+    "database": AgentType.DATABASE_SCHEMA.value,
+    "api_documentation": AgentType.API_DOCUMENTATION.value,
+    "api": AgentType.API_DOCUMENTATION.value,
+    "setup_guide": AgentType.SETUP_GUIDE.value,
+    "setup": AgentType.SETUP_GUIDE.value,
+    "developer_documentation": AgentType.DEVELOPER_DOCUMENTATION.value,
+    "developer_guide": AgentType.DEVELOPER_DOCUMENTATION.value,
+    "developer": AgentType.DEVELOPER_DOCUMENTATION.value,
+    "stakeholder_communication": AgentType.STAKEHOLDER_COMMUNICATION.value,
+    "stakeholder": AgentType.STAKEHOLDER_COMMUNICATION.value,
+    "test_documentation": AgentType.TEST_DOCUMENTATION.value,
+    "test": AgentType.TEST_DOCUMENTATION.value,
+    "user_documentation": AgentType.USER_DOCUMENTATION.value,
+    "user_guide": AgentType.USER_DOCUMENTATION.value,
+    "user": AgentType.USER_DOCUMENTATION.value,
+    "business_model": AgentType.BUSINESS_MODEL.value,
+    "business": AgentType.BUSINESS_MODEL.value,
+    "marketing_plan": AgentType.MARKETING_PLAN.value,
+    "marketing": AgentType.MARKETING_PLAN.value,
+    "support_playbook": AgentType.SUPPORT_PLAYBOOK.value,
+    "support": AgentType.SUPPORT_PLAYBOOK.value,
+    "legal_compliance": AgentType.LEGAL_COMPLIANCE.value,
+    "legal": AgentType.LEGAL_COMPLIANCE.value,
+}
+
+
+# Bounded cache of quality reports keyed by (content digest, document type),
+# so re-checking an unchanged document (e.g. on a workflow retry) is free
+QUALITY_RESULT_CACHE_SIZE = 128
+_quality_result_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+_quality_result_cache_lock = Lock()
+
+
+def _content_digest(content: str) -> bytes:
+    """128-bit digest of document content for in-memory cache keys (not persisted)"""
+    data = content.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
 # Legacy document type-specific quality requirements (fallback)
 DOCUMENT_TYPE_REQUIREMENTS = {
     AgentType.REQUIREMENTS_ANALYST: {
@@ -224,7 +288,8 @@ class DocumentTypeQualityChecker:
         """Initialize document type quality checker"""
         self.base_checker = QualityChecker()
     
-    def _convert_section_to_regex(self, section_name: str) -> str:
+    @staticmethod
+    def _convert_section_to_regex(section_name: str) -> str:
         """Convert section name to regex pattern for matching markdown headings"""
         # Escape special regex characters, but allow / and spaces
         escaped = re.escape(section_name)
@@ -235,7 +300,8 @@ class DocumentTypeQualityChecker:
         # Match any heading level (#, ##, ###, etc.)
         return rf"^#+\s+{escaped}"
     
-    def _parse_readability_target(self, target_str: str) -> float:
+    @staticmethod
+    def _parse_readability_target(target_str: str) -> float:
         """Parse readability target range (e.g., '50-65') and return minimum value"""
         try:
             if '-' in target_str:
@@ -257,6 +323,16 @@ class DocumentTypeQualityChecker:
         Returns:
             Dict with min_words, required_sections, min_readability, and optional fields
         """
+        # The rules are static, so the (fuzzy) lookup is done once per document type
+        return dict(DocumentTypeQualityChecker._lookup_requirements(document_type))
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _lookup_requirements(document_type: str) -> Dict:
+        """Uncached body of get_requirements_for_type; callers must not mutate the result"""
+        convert = DocumentTypeQualityChecker._convert_section_to_regex
+        parse_readability = DocumentTypeQualityChecker._parse_readability_target
+        
         # Normalize document type for matching
         doc_type_normalized = document_type.strip()
         doc_type_lower = doc_type_normalized.lower().replace('_', ' ').replace('-', ' ')
@@ -268,14 +344,14 @@ class DocumentTypeQualityChecker:
                 rules = QUALITY_RULES[doc_type_normalized]
                 # Convert to format expected by QualityChecker
                 required_sections = [
-                    self._convert_section_to_regex(section)
+                    convert(section)
                     for section in rules.get("required_sections", [])
                 ]
                 
                 return {
                     "min_words": rules.get("min_word_count", 500),
                     "required_sections": required_sections,
-                    "min_readability": self._parse_readability_target(
+                    "min_readability": parse_readability(
                         rules.get("readability_target", "50-70")
                     ),
                     "readability_target": rules.get("readability_target", "50-70"),
@@ -293,14 +369,14 @@ class DocumentTypeQualityChecker:
                     doc_type_normalized.lower() == rule_name_lower):
                     # Convert to format expected by QualityChecker
                     required_sections = [
-                        self._convert_section_to_regex(section)
+                        convert(section)
                         for section in rules.get("required_sections", [])
                     ]
                     
                     return {
                         "min_words": rules.get("min_word_count", 500),
                         "required_sections": required_sections,
-                        "min_readability": self._parse_readability_target(
+                        "min_readability": parse_readability(
                             rules.get("readability_target", "50-70")
                         ),
                         "readability_target": rules.get("readability_target", "50-70"),
@@ -424,6 +500,32 @@ class DocumentTypeQualityChecker:
         Returns:
             Comprehensive quality report with auto_fail checks
         """
+        # Custom weights change the overall score, so only default-weight reports are cached
+        if weights is not None:
+            return self._run_quality_check(content, document_type, weights)
+        
+        key = (_content_digest(content), str(document_type))
+        with _quality_result_cache_lock:
+            cached = _quality_result_cache.get(key)
+            if cached is not None:
+                _quality_result_cache.move_to_end(key)
+                return copy.deepcopy(cached)
+        
+        result = self._run_quality_check(content, document_type)
+        
+        with _quality_result_cache_lock:
+            _quality_result_cache[key] = copy.deepcopy(result)
+            while len(_quality_result_cache) > QUALITY_RESULT_CACHE_SIZE:
+                _quality_result_cache.popitem(last=False)
+        return result
+    
+    def _run_quality_check(
+        self,
+        content: str,
+        document_type: str,
+        weights: Optional[Dict[str, float]] = None
+    ) -> Dict:
+        """Run the type-specific quality check (uncached)"""
         # Get requirements for this document type
         requirements = self.get_requirements_for_type(document_type)
         
@@ -448,7 +550,9 @@ class DocumentTypeQualityChecker:
                 result["passed"] = False
                 result["overall_score"] = min(result.get("overall_score", 100), 40)  # Cap at 40 if auto-fail
                 logger.warning(
-                    f"Document {document_type} auto-failed due to: {auto_fail_result['auto_fail_violations']}"
+                    "Document %s auto-failed due to: %s",
+                    document_type,
+                    auto_fail_result["auto_fail_violations"],
                 )
         
         # Add document type info and additional metadata to result
@@ -472,7 +576,9 @@ class DocumentTypeQualityChecker:
             for agent_type, requirements in DOCUMENT_TYPE_REQUIREMENTS.items()
         }
     
-    def get_checklist_for_agent(self, agent_type: AgentType) -> Optional[List[str]]:
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def get_checklist_for_agent(agent_type: AgentType) -> Optional[List[str]]:
         """
         Get quality checklist for a specific agent type
         
@@ -541,47 +647,9 @@ class DocumentTypeQualityChecker:
         # Remove file extension
         doc_name = doc_name.replace('.md', '').replace('.txt', '')
         
-        # Map common names to agent types
-        name_mapping = {
-            "requirements": AgentType.REQUIREMENTS_ANALYST.value,
-            "project_charter": AgentType.PROJECT_CHARTER.value,
-            "charter": AgentType.PROJECT_CHARTER.value,
-            "pm_documentation": AgentType.PM_DOCUMENTATION.value,
-            "project_plan": AgentType.PM_DOCUMENTATION.value,
-            "pm": AgentType.PM_DOCUMENTATION.value,
-            "user_stories": AgentType.USER_STORIES.value,
-            "technical_documentation": AgentType.TECHNICAL_DOCUMENTATION.value,
-            "technical_spec": AgentType.TECHNICAL_DOCUMENTATION.value,
-            "technical": AgentType.TECHNICAL_DOCUMENTATION.value,
-            "database_schema": AgentType.DATABASE_SCHEMA.value,
-            "database": AgentType.DATABASE_SCHEMA.value,
-            "api_documentation": AgentType.API_DOCUMENTATION.value,
-            "api": AgentType.API_DOCUMENTATION.value,
-            "setup_guide": AgentType.SETUP_GUIDE.value,
-            "setup": AgentType.SETUP_GUIDE.value,
-            "developer_documentation": AgentType.DEVELOPER_DOCUMENTATION.value,
-            "developer_guide": AgentType.DEVELOPER_DOCUMENTATION.value,
-            "developer": AgentType.DEVELOPER_DOCUMENTATION.value,
-            "stakeholder_communication": AgentType.STAKEHOLDER_COMMUNICATION.value,
-            "stakeholder": AgentType.STAKEHOLDER_COMMUNICATION.value,
-            "test_documentation": AgentType.TEST_DOCUMENTATION.value,
-            "test": AgentType.TEST_DOCUMENTATION.value,
-            "user_documentation": AgentType.USER_DOCUMENTATION.value,
-            "user_guide": AgentType.USER_DOCUMENTATION.value,
-            "user": AgentType.USER_DOCUMENTATION.value,
-            "business_model": AgentType.BUSINESS_MODEL.value,
-            "business": AgentType.BUSINESS_MODEL.value,
-            "marketing_plan": AgentType.MARKETING_PLAN.value,
-            "marketing": AgentType.MARKETING_PLAN.value,
-            "support_playbook": AgentType.SUPPORT_PLAYBOOK.value,
-            "support": AgentType.SUPPORT_PLAYBOOK.value,
-            "legal_compliance": AgentType.LEGAL_COMPLIANCE.value,
-            "legal": AgentType.LEGAL_COMPLIANCE.value,
-        }
-        
         # Try to find matching type
         doc_name_lower = doc_name.lower()
-        for key, agent_type in name_mapping.items():
+        for key, agent_type in _DOCUMENT_NAME_TO_TYPE.items():
             if key in doc_name_lower:
                 return agent_type
         
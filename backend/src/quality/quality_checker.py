@@ -10,6 +10,13 @@ try:
 except ImportError:
     TEXTSTAT_AVAILABLE = False
 
+# Overall score weights used when check_quality is not given any
+DEFAULT_WEIGHTS = {
+    "word_count": 0.2,
+    "completeness": 0.5,
+    "readability": 0.3
+}
+
 
 class QualityChecker:
     """Handles all quality checks for documentation"""
@@ -167,11 +174,7 @@ class QualityChecker:
             Comprehensive quality report
         """
         if weights is None:
-            weights = {
-                "word_count": 0.2,
-                "completeness": 0.5,
-                "readability": 0.3
-            }
+            weights = DEFAULT_WEIGHTS
         
         # Run all checks
         word_count_result = self.check_word_count(content)
@@ -182,7 +185,7 @@ class QualityChecker:
         
         # Handle readability score - if unavailable, adjust weights
         readability_score = readability_result.get("readability_score", 0)
-        adjusted_weights = weights.copy()  # Start with original weights
+        adjusted_weights = weights.copy()  # Start with original weights (the report gets its own dict)
         
         if readability_score == 0 and readability_result.get("note") == "textstat not installed":
             # If textstat not available, redistribute readability weight to other metrics
@@ -247,9 +250,9 @@ class QualityChecker:
         Returns:
             Quality report
         """
-        from src.utils.file_manager import FileManager
+        from src.utils.file_manager import get_file_manager
         
-        file_manager = FileManager()
+        file_manager = get_file_manager()
         content = file_manager.read_file(filepath)
         return self.check_quality(content)
 
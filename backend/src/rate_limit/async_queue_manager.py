@@ -121,14 +121,10 @@ class AsyncRequestQueue:
             return self.cache[cache_key]
         
         # Check daily limit first
-        # Run synchronous can_make_request in executor to avoid blocking
-        import asyncio
-        loop = asyncio.get_event_loop()
+        # This is an in-memory counter check under a briefly held lock, so it is
+        # called directly; a thread pool handoff would cost more than the check itself
         try:
-            can_make_request, error_msg = await loop.run_in_executor(
-                None,
-                self.daily_limit_manager.can_make_request
-            )
+            can_make_request, error_msg = self.daily_limit_manager.can_make_request()
         except Exception as e:
             logger.error(f"Error checking daily limit: {type(e).__name__}: {str(e)}", exc_info=True)
             raise
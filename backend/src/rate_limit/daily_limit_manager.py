@@ -71,8 +71,8 @@ class DailyLimitManager:
         """
         today_key = self._get_today_key()
         
-        # Use blocking acquire - this will be run in executor, so blocking is OK
-        # The timeout is handled at the async level in AsyncRequestQueue
+        # The lock is only held for an in-memory counter check, so this is cheap
+        # enough to call directly from AsyncRequestQueue on the event loop
         self.lock.acquire()
         
         try:
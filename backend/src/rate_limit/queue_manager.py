@@ -4,12 +4,13 @@ Implements request queuing to stay within Google Gemini free tier limits:
 - Free tier: 2 requests/minute (RPM)
 - Free tier: 50 requests/day (RPD)
 """
+import asyncio
 import time
 import random
 from collections import deque
 from functools import wraps
 from threading import Lock
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from src.utils.logger import get_logger
 from src.rate_limit.daily_limit_manager import get_daily_limit_manager
 
@@ -80,25 +81,16 @@ class RequestQueue:
             # Record this request
             self.request_times.append(time.time())
     
-    def execute(self, func, *args, **kwargs):
+    def acquire(self):
         """
-        Execute a function with rate limiting (both per-minute and daily limits)
-        Also implements basic caching to reduce API calls
+        Wait for a request slot (daily and per-minute limits) without executing anything
         
-        Note: Rate limit errors (429) should be handled by the provider's retry logic.
-        This method focuses on preventing rate limits through request throttling.
+        Used directly by callers that cannot go through execute(), such as streaming
+        responses, and by execute() itself.
         
         Raises:
             ValueError: If daily limit is reached
         """
-        # Generate cache key
-        cache_key = f"{func.__name__}_{str(args)}_{str(kwargs)}"
-        
-        # Check cache first
-        if cache_key in self.cache:
-            logger.debug("✅ Using cached result")
-            return self.cache[cache_key]
-        
         # Check daily limit first
         can_make_request, error_msg = self.daily_limit_manager.can_make_request()
         if not can_make_request:
@@ -122,7 +114,28 @@ class RequestQueue:
         self._wait_if_needed()
         
         # Record the request for daily tracking
-        daily_count = self.daily_limit_manager.record_request()
+        self.daily_limit_manager.record_request()
+    
+    def execute(self, func, *args, **kwargs):
+        """
+        Execute a function with rate limiting (both per-minute and daily limits)
+        Also implements basic caching to reduce API calls
+        
+        Note: Rate limit errors (429) should be handled by the provider's retry logic.
+        This method focuses on preventing rate limits through request throttling.
+        
+        Raises:
+            ValueError: If daily limit is reached
+        """
+        # Generate cache key
+        cache_key = f"{func.__name__}_{str(args)}_{str(kwargs)}"
+        
+        # Check cache first
+        if cache_key in self.cache:
+            logger.debug("✅ Using cached result")
+            return self.cache[cache_key]
+        
+        self.acquire()
         
         # Execute function
         # Note: If this raises a 429 error, the GeminiProvider will handle retries
@@ -173,3 +186,171 @@ class RequestQueue:
                 "cache_size": len(self.cache)
             }
 
+
+
+# Published per-model limits (requests/minute, tokens/minute) used for proactive throttling
+MODEL_RATE_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gpt-4o": (10_000, 1_000_000),
+    "gpt-4o-mini": (10_000, 10_000_000),
+    "gpt-4-turbo": (10_000, 800_000),
+    "gpt-4": (10_000, 300_000),
+    "gpt-3.5-turbo": (10_000, 10_000_000),
+    "gemini-2.0-flash": (2_000, 4_000_000),
+    "gemini-2.5-flash": (1_000, 1_000_000),
+    "gemini-2.5-pro": (150, 2_000_000),
+}
+
+
+class TokenBucket:
+    """
+    Proactive request/token throttle for one (provider, model)
+    
+    Requests wait *before* submission until both the request and token buckets
+    have capacity, instead of being rejected with 429 and retried with backoff.
+    Capacity refills continuously based on a monotonic clock.
+    
+    Rate limit responses lower the limits temporarily (never below
+    MIN_RATE_FRACTION of the configured ones); they climb back to the
+    configured limits over RECOVERY_SECONDS without further penalties.
+    """
+    
+    # Lowest fraction of the configured limits that penalties can shrink the bucket to
+    MIN_RATE_FRACTION = 0.25
+    # Seconds for a penalized bucket to climb from zero back to the configured limits
+    RECOVERY_SECONDS = 60.0
+    
+    def __init__(self, rpm: int, tpm: int):
+        """
+        Args:
+            rpm: Requests per minute
+            tpm: Tokens per minute
+        """
+        self.max_rpm = rpm
+        self.max_tpm = tpm
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last_refill = time.monotonic()
+        self.lock = Lock()
+    
+    def _refill(self):
+        """Add capacity for the time elapsed since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        # Recover from earlier penalties, linearly back to the configured limits
+        if self.rpm < self.max_rpm or self.tpm < self.max_tpm:
+            recovered = elapsed / self.RECOVERY_SECONDS
+            self.rpm = min(self.max_rpm, self.rpm + self.max_rpm * recovered)
+            self.tpm = min(self.max_tpm, self.tpm + self.max_tpm * recovered)
+        self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60.0)
+    
+    def _reserve(self, estimated_tokens: int) -> float:
+        """
+        Take capacity if available
+        
+        Returns:
+            0.0 if capacity was taken, otherwise seconds to wait before trying again
+        """
+        # A single request larger than the whole bucket would never fit
+        estimated_tokens = min(estimated_tokens, self.tpm)
+        with self.lock:
+            self._refill()
+            if self._requests >= 1 and self._tokens >= estimated_tokens:
+                self._requests -= 1
+                self._tokens -= estimated_tokens
+                return 0.0
+            request_wait = max(0.0, 1 - self._requests) * 60.0 / self.rpm
+            token_wait = max(0.0, estimated_tokens - self._tokens) * 60.0 / self.tpm
+            return max(request_wait, token_wait, 0.01)
+    
+    def acquire(self, estimated_tokens: int = 0):
+        """Block until the request fits within the RPM/TPM limits"""
+        wait_time = self._reserve(estimated_tokens)
+        while wait_time > 0:
+            logger.debug(f"Token bucket throttling: waiting {wait_time:.2f}s")
+            time.sleep(wait_time)
+            wait_time = self._reserve(estimated_tokens)
+    
+    async def async_acquire(self, estimated_tokens: int = 0):
+        """Wait (without blocking the event loop) until the request fits within the limits"""
+        wait_time = self._reserve(estimated_tokens)
+        while wait_time > 0:
+            logger.debug(f"Token bucket throttling: waiting {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
+            wait_time = self._reserve(estimated_tokens)
+    
+    def penalize(self, retry_after: Optional[float] = None):
+        """
+        Shrink the bucket after a rate limit response (adaptive throttling)
+        
+        The reduction is temporary: the limits recover over RECOVERY_SECONDS.
+        
+        Args:
+            retry_after: Seconds the provider asked us to wait (from the retry-after header)
+        """
+        with self.lock:
+            # Credit any recovery due before applying the new penalty
+            self._refill()
+            self.rpm = max(1, self.max_rpm * self.MIN_RATE_FRACTION, self.rpm * 0.8)
+            self.tpm = max(1, self.max_tpm * self.MIN_RATE_FRACTION, self.tpm * 0.8)
+            if retry_after:
+                # Drain the bucket so nothing is sent before retry_after has passed
+                self._requests = min(self._requests, 1 - retry_after * self.rpm / 60.0)
+            else:
+                self._requests = min(self._requests, 0.0)
+        logger.warning("Rate limited: reduced token bucket to %.0f RPM / %.0f TPM", self.rpm, self.tpm)
+
+
+_token_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_token_buckets_lock = Lock()
+
+
+def get_token_bucket(provider: str, model: str) -> Optional[TokenBucket]:
+    """
+    Get the shared token bucket for a provider/model
+    
+    Returns:
+        TokenBucket, or None when no limits are known for the model
+    """
+    limits = MODEL_RATE_LIMITS.get(model)
+    if limits is None:
+        return None
+    with _token_buckets_lock:
+        bucket = _token_buckets.get((provider, model))
+        if bucket is None:
+            bucket = TokenBucket(*limits)
+            _token_buckets[(provider, model)] = bucket
+        return bucket
+
+
+_provider_semaphores: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Semaphore] = {}
+_provider_semaphores_lock = Lock()
+
+
+def get_provider_semaphore(provider: str, limit: int) -> asyncio.Semaphore:
+    """
+    Get the semaphore capping in-flight async requests to a provider
+    
+    Semaphores are kept per running event loop, so callers that start a fresh
+    loop per job (e.g. asyncio.run in a worker task) do not share one across loops.
+    
+    Args:
+        provider: Provider name
+        limit: Maximum concurrent requests (used when the semaphore is created)
+    
+    Returns:
+        asyncio.Semaphore shared by all agents using the provider on this loop
+    """
+    loop = asyncio.get_running_loop()
+    with _provider_semaphores_lock:
+        semaphore = _provider_semaphores.get((loop, provider))
+        if semaphore is None:
+            # Drop semaphores of loops that have finished
+            for key in [key for key in _provider_semaphores if key[0].is_closed()]:
+                del _provider_semaphores[key]
+            semaphore = asyncio.Semaphore(max(1, limit))
+            _provider_semaphores[(loop, provider)] = semaphore
+        return semaphore
@@ -4,13 +4,16 @@ Celery tasks for document generation
 import asyncio
 import logging
 import sys
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Dict, List, Optional
 
 from celery import Task
 
 from src.coordination.coordinator import WorkflowCoordinator
 from src.context.context_manager import ContextManager
+from src.config.settings import get_settings
 try:
     from src.tasks.celery_app import celery_app
     CELERY_AVAILABLE = celery_app is not None
@@ -19,6 +22,11 @@ except (ImportError, AttributeError):
     CELERY_AVAILABLE = False
 from src.utils.logger import get_logger
 
+try:
+    import uvloop  # libuv-based event loop (Unix only)
+except ImportError:
+    uvloop = None
+
 logger = get_logger(__name__)
 
 # In Celery worker, ensure all handlers work correctly
@@ -44,12 +52,66 @@ for handler in list(logger.handlers):
         pass
 
 
+# One event loop per process, run on a daemon thread and shared by all generation jobs
+# (created lazily, so forked Celery workers each start their own)
+_generation_loop: Optional[asyncio.AbstractEventLoop] = None
+_generation_loop_lock = threading.Lock()
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, using uvloop's lower per-task overhead when installed"""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def _get_generation_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide generation event loop, starting it on first use"""
+    global _generation_loop
+    with _generation_loop_lock:
+        if _generation_loop is None or _generation_loop.is_closed():
+            loop = _new_event_loop()
+            # Sized for the blocking work handed to it with asyncio.to_thread (GENERATION_THREADS)
+            loop.set_default_executor(ThreadPoolExecutor(
+                max_workers=get_settings().generation_threads, thread_name_prefix="generation"
+            ))
+            threading.Thread(target=loop.run_forever, name="generation-loop", daemon=True).start()
+            _generation_loop = loop
+        return _generation_loop
+
+
+def run_on_generation_loop(coro: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine on the shared generation loop and wait for its result
+    
+    Jobs reuse one loop instead of bootstrapping a new one with asyncio.run,
+    so per-loop state (provider semaphores, async rate limiters, provider
+    clients) is kept between jobs and shared by concurrent ones.
+    
+    Args:
+        coro: Coroutine to run
+        
+    If the wait is interrupted (a soft time limit, a revoke, any BaseException),
+    the coroutine is cancelled so the job does not keep running on the loop.
+    
+    Returns:
+        The coroutine's result (its exception is re-raised in the caller)
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_generation_loop())
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
 def run_document_generation_sync(
     project_id: str,
     user_idea: str,
     selected_documents: List[str],
     provider_name: Optional[str] = None,
     codebase_path: Optional[str] = None,
+    resume: bool = False,
 ) -> Dict:
     """
     Synchronous helper function to generate documents.
@@ -61,6 +123,8 @@ def run_document_generation_sync(
         selected_documents: List of document IDs to generate
         provider_name: Optional LLM provider name
         codebase_path: Optional codebase path
+        resume: Reuse the documents a previous attempt of this project
+            already generated (retries only generate the rest)
         
     Returns:
         Dictionary with generation results
@@ -86,6 +150,11 @@ def run_document_generation_sync(
             "project_id": project_id,
         })
         
+        previous_results = None
+        if resume:
+            previous_status = context_manager.get_project_status(project_id)
+            previous_results = previous_status.get("results") if previous_status else None
+        
         # Create initial project status
         context_manager.update_project_status(
             project_id=project_id,
@@ -109,26 +178,24 @@ def run_document_generation_sync(
             send_websocket_notification(project_id, message)
         
         # Run generation
-        results = asyncio.run(
+        results = run_on_generation_loop(
             coordinator.async_generate_all_docs(
                 user_idea=user_idea,
                 project_id=project_id,
                 selected_documents=selected_documents,
                 codebase_path=codebase_path,
                 progress_callback=progress_callback,
+                previous_results=previous_results,
             )
         )
         
         generation_duration = time.time() - generation_start_time
         
-        # Update project status
+        # Update project status (the coordinator has already stored the results,
+        # completed documents and selection; None leaves those columns as they are)
         context_manager.update_project_status(
             project_id=project_id,
             status="complete",
-            user_idea=user_idea,
-            completed_agents=list(results.get("files", {}).keys()),
-            results=results,
-            selected_documents=selected_documents,
         )
         
         # Send success notification
@@ -291,6 +358,7 @@ if CELERY_AVAILABLE and celery_app:
                 selected_documents=selected_documents,
                 provider_name=provider_name,
                 codebase_path=codebase_path,
+                resume=self.request.retries > 0,
             )
             
             total_duration = time.time() - task_start_time
@@ -3,7 +3,8 @@ Async Parallel Executor
 Executes async tasks in parallel while respecting dependencies using asyncio
 """
 import asyncio
-from typing import Dict, List, Optional, Callable, Any, Coroutine
+import inspect
+from typing import AsyncIterator, Dict, List, Optional, Callable, Any, Coroutine, Tuple
 from enum import Enum
 from dataclasses import dataclass
 from src.utils.logger import get_logger
@@ -30,6 +31,14 @@ class AsyncTask:
     error: Optional[Exception] = None
 
 
+@dataclass
+class TaskResult:
+    """Outcome of an executed task (status, value and error together)"""
+    status: TaskStatus
+    value: Any = None
+    error: Optional[Exception] = None
+
+
 class AsyncParallelExecutor:
     """
     Executes async tasks in parallel while respecting dependencies
@@ -108,7 +117,60 @@ class AsyncParallelExecutor:
                 logger.error(f"Task {task.task_id} failed: {e}", exc_info=True)
                 raise
     
-    async def execute(self, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    async def as_completed(self) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run all tasks, yielding each one as soon as it finishes
+        
+        A task starts the moment its last dependency completes, so a slow task
+        only holds up its own dependents. Tasks whose dependencies failed (or
+        can never complete) are yielded as failed without being run. If the
+        consumer stops early, running tasks are cancelled and the coroutines of
+        tasks that never started are closed.
+        
+        Yields:
+            (task_id, result) tuples in completion order; result is the
+            exception for failed tasks
+        """
+        running: Dict[asyncio.Task, AsyncTask] = {}
+        
+        def start_ready() -> None:
+            for task in self._get_ready_tasks():
+                task.status = TaskStatus.RUNNING
+                running[asyncio.ensure_future(self._execute_task(task))] = task
+        
+        try:
+            start_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    if future.exception() is not None:
+                        yield task.task_id, future.exception()
+                    else:
+                        yield task.task_id, future.result()
+                start_ready()
+        finally:
+            for future in running:
+                future.cancel()
+            # Coroutines that never started (still pending, or cancelled before
+            # their first step) would otherwise warn that they were never awaited
+            for task in self.tasks.values():
+                if inspect.getcoroutinestate(task.coro) == inspect.CORO_CREATED:
+                    task.coro.close()
+        
+        # Whatever is still pending is blocked by a failed (or missing) dependency
+        for task in self.tasks.values():
+            if task.status == TaskStatus.PENDING:
+                blocked_by = [
+                    dep_id for dep_id in task.dependencies
+                    if dep_id not in self.tasks or self.tasks[dep_id].status != TaskStatus.COMPLETE
+                ]
+                task.status = TaskStatus.FAILED
+                task.error = Exception(f"Dependencies failed: {blocked_by}")
+                task.coro.close()
+                yield task.task_id, task.error
+    
+    async def execute(self, progress_callback: Optional[Callable] = None) -> Dict[str, TaskResult]:
         """
         Execute all tasks respecting dependencies (async)
         
@@ -117,65 +179,18 @@ class AsyncParallelExecutor:
                 Called with (completed_count, total_count, task_id)
         
         Returns:
-            Dict mapping task IDs to results
+            Dict mapping task IDs to their TaskResult, so callers need not
+            re-read executor.tasks to tell failures from None results
         """
         results = {}
         total_tasks = len(self.tasks)
         completed_count = 0
         
-        # Continue until all tasks are done
-        while completed_count < total_tasks:
-            # Get tasks ready to run
-            ready_tasks = self._get_ready_tasks()
-            
-            if not ready_tasks:
-                # Check for remaining tasks
-                remaining = [t for t in self.tasks.values() if t.status == TaskStatus.PENDING]
-                if remaining:
-                    # Some tasks might be blocked by failed dependencies
-                    for task in remaining:
-                        failed_deps = [
-                            dep_id for dep_id in task.dependencies
-                            if self.tasks[dep_id].status == TaskStatus.FAILED
-                        ]
-                        if failed_deps:
-                            task.status = TaskStatus.FAILED
-                            task.error = Exception(f"Dependencies failed: {failed_deps}")
-                            results[task.task_id] = None
-                            completed_count += 1
-                            
-                            if progress_callback:
-                                await progress_callback(completed_count, total_tasks, task.task_id)
-                    
-                    # If still stuck, break
-                    if completed_count < total_tasks and not remaining:
-                        break
-                else:
-                    break
-            
-            # Execute ready tasks in parallel
-            if ready_tasks:
-                task_coros = [self._execute_task(task) for task in ready_tasks]
-                
-                # Use asyncio.gather to run tasks in parallel
-                # Return exceptions instead of raising them
-                task_results = await asyncio.gather(*task_coros, return_exceptions=True)
-                
-                # Process results
-                for task, result in zip(ready_tasks, task_results):
-                    if isinstance(result, Exception):
-                        # Task failed
-                        task.status = TaskStatus.FAILED
-                        task.error = result
-                        results[task.task_id] = None
-                    else:
-                        # Task succeeded
-                        results[task.task_id] = result
-                    
-                    completed_count += 1
-                    
-                    if progress_callback:
-                        await progress_callback(completed_count, total_tasks, task.task_id)
+        async for task_id, _ in self.as_completed():
+            task = self.tasks[task_id]
+            results[task_id] = TaskResult(status=task.status, value=task.result, error=task.error)
+            completed_count += 1
+            if progress_callback:
+                await progress_callback(completed_count, total_tasks, task_id)
         
         return results
-
@@ -1,12 +1,12 @@
 """
 Redis-based caching utilities for OmniDoc
 """
-import json
 import logging
 import os
 from typing import Any, Optional, Dict
 import redis
 from functools import wraps
+from src.utils import json_utils
 
 logger = logging.getLogger(__name__)
 
@@ -75,7 +75,7 @@ def cache_result(ttl: int = 3600, key_prefix: str = "cache"):
                 try:
                     cached = redis_client.get(cache_key)
                     if cached:
-                        return json.loads(cached)
+                        return json_utils.loads(cached)
                 except Exception:
                     pass
                 
@@ -87,7 +87,7 @@ def cache_result(ttl: int = 3600, key_prefix: str = "cache"):
                     redis_client.setex(
                         cache_key,
                         ttl,
-                        json.dumps(result, default=str)
+                        json_utils.dumpb(result)
                     )
                 except Exception:
                     pass
@@ -106,7 +106,7 @@ def cache_result(ttl: int = 3600, key_prefix: str = "cache"):
                 try:
                     cached = redis_client.get(cache_key)
                     if cached:
-                        return json.loads(cached)
+                        return json_utils.loads(cached)
                 except Exception:
                     pass
                 
@@ -118,7 +118,7 @@ def cache_result(ttl: int = 3600, key_prefix: str = "cache"):
                     redis_client.setex(
                         cache_key,
                         ttl,
-                        json.dumps(result, default=str)
+                        json_utils.dumpb(result)
                     )
                 except Exception:
                     pass
@@ -136,7 +136,7 @@ def get_cached(key: str) -> Optional[Any]:
     try:
         cached = redis_client.get(key)
         if cached:
-            return json.loads(cached)
+            return json_utils.loads(cached)
     except Exception:
         pass
     
@@ -149,7 +149,7 @@ def set_cached(key: str, value: Any, ttl: int = 3600) -> bool:
         return False
     
     try:
-        redis_client.setex(key, ttl, json.dumps(value, default=str))
+        redis_client.setex(key, ttl, json_utils.dumpb(value))
         return True
     except Exception:
         return False
@@ -243,7 +243,7 @@ def cache_llm_response(ttl: int = 3600):
                     if cached:
                         logger = logging.getLogger(__name__)
                         logger.debug(f"✅ LLM cache hit for {func.__name__}")
-                        return json.loads(cached)
+                        return json_utils.loads(cached)
                 except Exception as e:
                     logger = logging.getLogger(__name__)
                     logger.warning(f"Cache read error: {e}")
@@ -256,7 +256,7 @@ def cache_llm_response(ttl: int = 3600):
                     redis_client.setex(
                         cache_key,
                         ttl,
-                        json.dumps(result, default=str)
+                        json_utils.dumpb(result)
                     )
                     logger = logging.getLogger(__name__)
                     logger.debug(f"✅ LLM response cached for {func.__name__}")
@@ -285,7 +285,7 @@ def cache_llm_response(ttl: int = 3600):
                     if cached:
                         logger = logging.getLogger(__name__)
                         logger.debug(f"✅ LLM cache hit for {func.__name__}")
-                        return json.loads(cached)
+                        return json_utils.loads(cached)
                 except Exception as e:
                     logger = logging.getLogger(__name__)
                     logger.warning(f"Cache read error: {e}")
@@ -298,7 +298,7 @@ def cache_llm_response(ttl: int = 3600):
                     redis_client.setex(
                         cache_key,
                         ttl,
-                        json.dumps(result, default=str)
+                        json_utils.dumpb(result)
                     )
                     logger = logging.getLogger(__name__)
                     logger.debug(f"✅ LLM response cached for {func.__name__}")
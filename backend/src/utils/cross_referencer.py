@@ -3,11 +3,24 @@ Cross-Referencing System
 Creates links and references between related documents
 """
 from typing import Dict, List, Optional
-from pathlib import Path
+import os
 import re
 from src.context.shared_context import CrossReference, AgentType, DocumentStatus
 
 
+# One-line purpose of each document type in the index's quick navigation table
+DOCUMENT_PURPOSES: Dict[AgentType, str] = {
+    AgentType.REQUIREMENTS_ANALYST: "Project requirements and specifications",
+    AgentType.PM_DOCUMENTATION: "Project management and planning",
+    AgentType.TECHNICAL_DOCUMENTATION: "Technical architecture and design",
+    AgentType.API_DOCUMENTATION: "API endpoints and integration",
+    AgentType.DEVELOPER_DOCUMENTATION: "Developer setup and workflow",
+    AgentType.STAKEHOLDER_COMMUNICATION: "Business summary for stakeholders",
+    AgentType.USER_DOCUMENTATION: "End-user guide",
+    AgentType.TEST_DOCUMENTATION: "Testing strategy and test cases"
+}
+
+
 class CrossReferencer:
     """
     Creates cross-references between related documents
@@ -123,7 +136,7 @@ class CrossReferencer:
         
         for link_type, doc_content, file_path in available_links:
             doc_name = self.document_types.get(link_type, {}).get("name", link_type.value)
-            filename = Path(file_path).name if file_path else f"{link_type.value}.md"
+            filename = os.path.basename(file_path) if file_path else f"{link_type.value}.md"
             
             section += f"- **[{doc_name}]({filename})**\n"
             
@@ -189,7 +202,7 @@ class CrossReferencer:
                 
                 for doc_type, doc_content, file_path in category_docs:
                     doc_name = self.document_types.get(doc_type, {}).get("name", doc_type.value)
-                    filename = Path(file_path).name if file_path else f"{doc_type.value}.md"
+                    filename = os.path.basename(file_path) if file_path else f"{doc_type.value}.md"
                     
                     # Get brief description
                     description = ""
@@ -217,21 +230,9 @@ class CrossReferencer:
             for dt in all_documents.keys()
         ]:
             doc_name = self.document_types.get(doc_type, {}).get("name", doc_type.value)
-            filename = Path(file_path).name if file_path else f"{doc_type.value}.md"
-            
-            # Get purpose from document type
-            purposes = {
-                AgentType.REQUIREMENTS_ANALYST: "Project requirements and specifications",
-                AgentType.PM_DOCUMENTATION: "Project management and planning",
-                AgentType.TECHNICAL_DOCUMENTATION: "Technical architecture and design",
-                AgentType.API_DOCUMENTATION: "API endpoints and integration",
-                AgentType.DEVELOPER_DOCUMENTATION: "Developer setup and workflow",
-                AgentType.STAKEHOLDER_COMMUNICATION: "Business summary for stakeholders",
-                AgentType.USER_DOCUMENTATION: "End-user guide",
-                AgentType.TEST_DOCUMENTATION: "Testing strategy and test cases"
-            }
+            filename = os.path.basename(file_path) if file_path else f"{doc_type.value}.md"
             
-            purpose = purposes.get(doc_type, "Documentation")
+            purpose = DOCUMENT_PURPOSES.get(doc_type, "Documentation")
             
             index += f"| [{doc_name}]({filename}) | {purpose} |\n"
         
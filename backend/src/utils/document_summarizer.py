@@ -2,7 +2,7 @@
 Document Summarizer Utility
 Replaces truncation with intelligent LLM-based summarization
 """
-from typing import Optional
+from typing import Any, Dict, Optional
 from src.llm.base_provider import BaseLLMProvider
 from src.utils.logger import get_logger
 from src.config.settings import get_settings
@@ -194,31 +194,79 @@ Now, summarize the following {document_type}:
         return self.summarize(document_content, document_type, focus_areas)
     
     def _smart_truncate(self, text: str, max_length: int) -> str:
-        """
-        Fallback: Smart truncation at sentence boundary
-        
-        Args:
-            text: Text to truncate
-            max_length: Maximum length
-        
-        Returns:
-            Truncated text ending at sentence boundary
-        """
-        if len(text) <= max_length:
-            return text
-        
-        # Try to truncate at sentence boundary
-        truncated = text[:max_length]
-        last_period = truncated.rfind(".")
-        last_newline = truncated.rfind("\n")
-        
-        # Use the later of period or newline
-        cut_point = max(last_period, last_newline)
-        
-        if cut_point > max_length * 0.8:  # Only if we're keeping at least 80% of target length
-            return truncated[:cut_point + 1] + "..."
-        else:
-            return truncated + "..."
+        """Fallback: Smart truncation at sentence boundary"""
+        return smart_truncate(text, max_length)
+
+
+def smart_truncate(text: str, max_length: int) -> str:
+    """
+    Truncate text at a sentence boundary
+    
+    Args:
+        text: Text to truncate
+        max_length: Maximum length
+    
+    Returns:
+        Truncated text ending at sentence boundary
+    """
+    if len(text) <= max_length:
+        return text
+    
+    # Try to truncate at sentence boundary
+    truncated = text[:max_length]
+    last_period = truncated.rfind(".")
+    last_newline = truncated.rfind("\n")
+    
+    # Use the later of period or newline
+    cut_point = max(last_period, last_newline)
+    
+    if cut_point > max_length * 0.8:  # Only if we're keeping at least 80% of target length
+        return truncated[:cut_point + 1] + "..."
+    else:
+        return truncated + "..."
+
+
+# Short fields that carry the project's intent; never truncated
+CONDENSE_KEEP_KEYS = ("user_idea", "project_overview", "core_features", "business_objectives", "constraints")
+
+
+def condense_summary(
+    summary: Dict[str, Any],
+    max_chars: int = 8000,
+    max_field_chars: int = 3000
+) -> Dict[str, Any]:
+    """
+    Shrink a requirements summary before it is put into a prompt (extractive, no LLM call)
+    
+    Empty fields are dropped and the remaining free-text fields share the
+    character budget (budget left over by short fields goes to the longer
+    ones), each cut at a sentence boundary.
+    
+    Args:
+        summary: Requirements summary (as built for the prompt functions)
+        max_chars: Character budget for the free-text fields together
+        max_field_chars: Cap per field; the prompt functions LLM-summarize
+            dependency documents longer than 3000 characters, so the default
+            keeps them from making that extra call
+    
+    Returns:
+        Condensed copy of the summary
+    """
+    condensed = {key: value for key, value in summary.items() if value not in (None, "", [], {})}
+    text_keys = [
+        key for key, value in condensed.items()
+        if isinstance(value, str) and key not in CONDENSE_KEEP_KEYS
+    ]
+    # Shortest first, so each field's unused share is passed on to the longer ones
+    text_keys.sort(key=lambda key: len(condensed[key]))
+    budget = max_chars
+    for index, key in enumerate(text_keys):
+        share = min(budget // (len(text_keys) - index), max_field_chars)
+        if len(condensed[key]) > share:
+            # Leave room for the "..." marker
+            condensed[key] = smart_truncate(condensed[key], max(share - 3, 1))
+        budget -= len(condensed[key])
+    return condensed
 
 
 # Global instance for easy access
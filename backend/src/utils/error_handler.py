@@ -5,6 +5,7 @@ Supports both sync and async functions
 """
 from typing import Callable, Any, Optional, TypeVar, List, Coroutine
 import time
+import random
 import asyncio
 from functools import wraps
 import logging
@@ -15,11 +16,22 @@ T = TypeVar('T')
 logger = logging.getLogger(__name__)
 
 
+def _backoff_delay(delay: float, max_delay: Optional[float], jitter: bool) -> float:
+    """Seconds to sleep before the next attempt: capped, and randomized to [delay/2, delay] with jitter"""
+    if max_delay is not None:
+        delay = min(delay, max_delay)
+    if jitter:
+        delay = random.uniform(delay / 2, delay)
+    return delay
+
+
 def retry_with_backoff(
     max_retries: int = 3,
     initial_delay: float = 1.0,
     backoff_factor: float = 2.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    max_delay: Optional[float] = None,
+    jitter: bool = False
 ):
     """
     Decorator for retrying function calls with exponential backoff
@@ -30,6 +42,9 @@ def retry_with_backoff(
         initial_delay: Initial delay between retries (seconds)
         backoff_factor: Multiplier for delay between retries
         exceptions: Tuple of exceptions to catch and retry on
+        max_delay: Upper bound for a single delay (seconds, None = unbounded)
+        jitter: Randomize each delay so concurrent callers that failed
+            together (e.g. on a rate limit) do not retry in lockstep
     
     Example:
         @retry_with_backoff(max_retries=3)
@@ -57,11 +72,12 @@ def retry_with_backoff(
                     except exceptions as e:
                         last_exception = e
                         if attempt < max_retries - 1:
+                            sleep_for = _backoff_delay(delay, max_delay, jitter)
                             logger.warning(
                                 f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}): {e}. "
-                                f"Retrying in {delay:.1f}s..."
+                                f"Retrying in {sleep_for:.1f}s..."
                             )
-                            await asyncio.sleep(delay)
+                            await asyncio.sleep(sleep_for)
                             delay *= backoff_factor
                         else:
                             logger.error(
@@ -86,11 +102,12 @@ def retry_with_backoff(
                     except exceptions as e:
                         last_exception = e
                         if attempt < max_retries - 1:
+                            sleep_for = _backoff_delay(delay, max_delay, jitter)
                             logger.warning(
                                 f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}): {e}. "
-                                f"Retrying in {delay:.1f}s..."
+                                f"Retrying in {sleep_for:.1f}s..."
                             )
-                            time.sleep(delay)
+                            time.sleep(sleep_for)
                             delay *= backoff_factor
                         else:
                             logger.error(
@@ -2,12 +2,19 @@
 File Management Utility Class
 Handles all file operations in an OOP style
 """
+import os
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional, Union
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Content above this size is written in WRITE_CHUNK_SIZE pieces
+LARGE_WRITE_THRESHOLD = 1024 * 1024
+WRITE_CHUNK_SIZE = 64 * 1024
+
 
 class FileManager:
     """Manages file operations for documentation generation"""
@@ -23,6 +30,21 @@ class FileManager:
         self.base_dir.mkdir(parents=True, exist_ok=True)
         logger.debug(f"FileManager initialized with base_dir: {self.base_dir.absolute()}")
     
+    def resolve_path(self, filepath: str) -> Path:
+        """
+        Resolve a path the way write_file() does (relative paths are under base_dir)
+        
+        Args:
+            filepath: Relative or absolute path
+            
+        Returns:
+            Resolved path
+        """
+        path = Path(filepath)
+        if not path.is_absolute():
+            path = self.base_dir / path
+        return path
+    
     def write_file(self, filepath: str, content: str, encoding: str = "utf-8") -> str:
         """
         Write content to file
@@ -38,21 +60,30 @@ class FileManager:
         Raises:
             IOError: If file writing fails
         """
-        path = Path(filepath)
-        
-        # If relative path, make it relative to base_dir
-        if not path.is_absolute():
-            path = self.base_dir / path
+        path = self.resolve_path(filepath)
         
         # Create parent directories if needed
         path.parent.mkdir(parents=True, exist_ok=True)
         logger.debug(f"Creating directories if needed: {path.parent}")
         
-        # Write file
+        # Write file: encode once, write to a temp file and rename it into place
+        # (atomic, and a single write() call for typical document sizes)
         try:
-            content_size = len(content.encode(encoding))
-            logger.info(f"Writing file: {path} (size: {content_size} bytes, encoding: {encoding})")
-            path.write_text(content, encoding=encoding)
+            data = content.encode(encoding)
+            logger.info(f"Writing file: {path} (size: {len(data)} bytes, encoding: {encoding})")
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    written = os.write(fd, view[:WRITE_CHUNK_SIZE] if len(view) > LARGE_WRITE_THRESHOLD else view)
+                    view = view[written:]
+            except BaseException:
+                os.close(fd)
+                tmp_path.unlink(missing_ok=True)
+                raise
+            os.close(fd)
+            os.replace(tmp_path, path)
             abs_path = str(path.absolute())
             logger.info(f"File written successfully: {abs_path}")
             return abs_path
@@ -60,6 +91,30 @@ class FileManager:
             logger.error(f"Failed to write file {path}: {str(e)}", exc_info=True)
             raise IOError(f"Failed to write file {path}: {str(e)}")
     
+    def open_stream(self, filepath: str, encoding: str = "utf-8") -> IO[str]:
+        """
+        Open a file for incremental writing (e.g. while an LLM response streams in)
+        
+        Args:
+            filepath: Path where file should be written (can be relative or absolute)
+            encoding: File encoding (default: utf-8)
+            
+        Returns:
+            Text file object opened for writing (caller closes it)
+            
+        Raises:
+            IOError: If the file cannot be opened
+        """
+        path = self.resolve_path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            logger.info("Opening file for streaming: %s", path)
+            return open(path, "w", encoding=encoding)
+        except Exception as e:
+            logger.error("Failed to open file %s: %s", path, e, exc_info=True)
+            raise IOError(f"Failed to open file {path}: {str(e)}")
+    
     def read_file(self, filepath: str, encoding: str = "utf-8") -> str:
         """
         Read content from file
@@ -148,3 +203,24 @@ class FileManager:
         self.base_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"FileManager base directory changed: {old_dir} -> {self.base_dir.absolute()}")
 
+
+@lru_cache(maxsize=None)
+def _shared_file_manager(base_dir: str) -> FileManager:
+    return FileManager(base_dir=base_dir)
+
+
+def get_file_manager(base_dir: Union[str, Path] = "docs") -> FileManager:
+    """
+    Get the shared FileManager for a base directory
+    
+    Agents writing under the same directory reuse one instance instead of
+    each constructing (and mkdir-ing) their own. Do not call set_base_dir()
+    on a shared instance; construct a FileManager for that instead.
+    
+    Args:
+        base_dir: Base directory for the files
+        
+    Returns:
+        FileManager for base_dir
+    """
+    return _shared_file_manager(str(base_dir))
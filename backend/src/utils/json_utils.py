@@ -0,0 +1,88 @@
+"""
+JSON Serialization Helpers
+Uses orjson when it is installed and falls back to the standard library json module
+"""
+import json
+import mmap
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Serialize an object to a compact JSON string
+
+    Args:
+        obj: Object to serialize (non-JSON values are converted with str())
+        sort_keys: Whether to sort dictionary keys (useful for cache keys)
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option).decode("utf-8")
+    return json.dumps(obj, default=str, sort_keys=sort_keys, separators=(",", ":"))
+
+
+def dumpb(obj: Any) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON bytes
+
+    Use this when the consumer takes bytes (sockets, Redis, files): orjson's
+    output is returned as-is, without the copy dumps() makes to decode it.
+
+    Args:
+        obj: Object to serialize (non-JSON values are converted with str())
+
+    Returns:
+        JSON document as UTF-8 bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON string or bytes
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    """
+    Parse a JSON file
+
+    With orjson the file is memory-mapped and parsed in place, so no copy of
+    its contents is made; otherwise it is read and parsed with json.
+
+    Args:
+        path: JSON file path
+
+    Returns:
+        Parsed Python object
+    """
+    path = Path(path)
+    if orjson is not None:
+        with open(path, "rb") as f:
+            # Zero-length files cannot be mapped
+            if path.stat().st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+    return loads(path.read_bytes())
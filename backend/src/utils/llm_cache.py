@@ -0,0 +1,183 @@
+"""
+Persistent LLM Response Cache
+Exact-match cache for LLM responses backed by SQLite, keyed on the prompt and the
+parameters that affect the output (model, provider and sampling settings)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from src.utils.logger import get_logger
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, zlib is used instead
+    zstandard = None
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_PATH = "~/.cache/auto-repo-agents/llm.sqlite"
+NO_CACHE_ENV_VAR = "AUTO_REPO_NO_CACHE"
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def cache_disabled() -> bool:
+    """Return True when the cache is turned off with AUTO_REPO_NO_CACHE=1"""
+    return os.getenv(NO_CACHE_ENV_VAR, "").strip().lower() in ("1", "true", "yes")
+
+
+def make_cache_key(
+    prompt: str,
+    model: Optional[str],
+    provider: Optional[str],
+    system_prompt: Optional[str] = None,
+    prompt_version: Optional[int] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None
+) -> str:
+    """
+    Build a cache key from the parameters that affect the LLM output
+
+    Args:
+        prompt: Full prompt sent to the LLM
+        model: Model name
+        provider: Provider name
+        system_prompt: System prompt sent alongside the prompt, if any
+        prompt_version: Prompt set version (bumping it invalidates older entries)
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = json.dumps(
+        {
+            "prompt": prompt,
+            "model": model,
+            "provider": provider,
+            "system_prompt": system_prompt,
+            "prompt_version": prompt_version,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _compress(text: str) -> bytes:
+    data = text.encode("utf-8")
+    if zstandard is not None:
+        return zstandard.ZstdCompressor().compress(data)
+    return zlib.compress(data)
+
+
+def _decompress(blob: bytes) -> str:
+    if blob[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("zstandard is required to read this cache entry")
+        return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+    return zlib.decompress(blob).decode("utf-8")
+
+
+class LLMCache:
+    """SQLite-backed exact-match cache of LLM responses"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database path (created on first use)
+            ttl: Entry lifetime in seconds (None keeps entries forever)
+        """
+        self.path = Path(os.path.expanduser(path))
+        self.ttl = ttl
+        self._init_lock = Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=5.0)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS llm_cache ("
+                        "key TEXT PRIMARY KEY, value BLOB, created_at INT, model TEXT)"
+                    )
+                    conn.commit()
+                    self._initialized = True
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response
+
+        Args:
+            key: Cache key (see make_cache_key)
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        if not self.path.exists():
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl is not None and time.time() - created_at > self.ttl:
+                return None
+            return _decompress(value)
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: str, model: Optional[str] = None) -> None:
+        """
+        Store a response
+
+        Args:
+            key: Cache key (see make_cache_key)
+            value: Response text
+            model: Model that produced the response (informational)
+        """
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, model) VALUES (?, ?, ?, ?)",
+                    (key, _compress(value), int(time.time()), model),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+
+_llm_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Get the shared LLM cache instance"""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache()
+    return _llm_cache
@@ -1,9 +1,53 @@
 """Registry mapping document IDs to specialized prompt functions."""
 from __future__ import annotations
 
+from collections import OrderedDict
+from functools import partial
+from threading import Lock
 from typing import Any, Callable, Dict, Optional
 
+import hashlib
+
 from prompts import system_prompts
+from src.utils import json_utils
+from src.utils.document_summarizer import condense_summary
+
+# Bounded cache of assembled prompts keyed by a digest of their inputs
+PROMPT_CACHE_SIZE = 32
+_prompt_cache: "OrderedDict[str, str]" = OrderedDict()
+_prompt_cache_lock = Lock()
+
+
+def get_cached_prompt(name: str, inputs: Any, builder: Callable[[], str]) -> str:
+    """
+    Return a prompt built by ``builder``, reusing it when ``inputs`` are unchanged.
+
+    Args:
+        name: Prompt name (keeps keys of different prompt builders apart)
+        inputs: JSON-serializable inputs the prompt is built from, or a string
+            already serialized by the caller (hashed as is)
+        builder: Zero-argument callable that assembles the prompt
+
+    Returns:
+        Assembled prompt text
+    """
+    payload = inputs if isinstance(inputs, str) else json_utils.dumps(inputs, sort_keys=True)
+    digest = hashlib.md5(payload.encode("utf-8")).hexdigest()
+    key = f"{name}:{digest}"
+
+    with _prompt_cache_lock:
+        cached = _prompt_cache.get(key)
+        if cached is not None:
+            _prompt_cache.move_to_end(key)
+            return cached
+
+    prompt = builder()
+
+    with _prompt_cache_lock:
+        _prompt_cache[key] = prompt
+        while len(_prompt_cache) > PROMPT_CACHE_SIZE:
+            _prompt_cache.popitem(last=False)
+    return prompt
 
 
 def _extract_requirements_summary(
@@ -119,151 +163,161 @@ def _extract_requirements_summary(
     return summary
 
 
+# Specialized prompt builders by document ID, called with (user_idea, requirements summary)
+_PROMPT_BUILDERS: Dict[str, Callable[[str, Dict[str, Any]], str]] = {
+    "requirements": lambda user_idea, req_summary: system_prompts.get_requirements_prompt(user_idea),
+    "project_charter": lambda user_idea, req_summary: system_prompts.get_project_charter_prompt(req_summary),
+    "user_stories": lambda user_idea, req_summary: system_prompts.get_user_stories_prompt(
+        req_summary, req_summary.get("project_charter_summary")
+    ),
+    "pm_documentation": lambda user_idea, req_summary: system_prompts.get_pm_prompt(
+        req_summary, req_summary.get("project_charter_summary")
+    ),
+    "pm_management_doc": lambda user_idea, req_summary: system_prompts.get_pm_prompt(
+        req_summary, req_summary.get("project_charter_summary")
+    ),
+    "wbs": lambda user_idea, req_summary: system_prompts.get_wbs_prompt(
+        req_summary, req_summary.get("project_charter_summary"), req_summary.get("pm_summary")
+    ),
+    "technical_documentation": lambda user_idea, req_summary: system_prompts.get_technical_prompt(
+        req_summary, req_summary.get("project_charter_summary"), req_summary.get("user_stories")
+    ),
+    "tad": lambda user_idea, req_summary: system_prompts.get_technical_prompt(
+        req_summary, req_summary.get("project_charter_summary"), req_summary.get("user_stories")
+    ),
+    "api_documentation": lambda user_idea, req_summary: system_prompts.get_api_prompt(
+        req_summary, req_summary.get("technical_summary")
+    ),
+    "database_schema": lambda user_idea, req_summary: system_prompts.get_database_schema_prompt(
+        req_summary, req_summary.get("technical_summary")
+    ),
+    "developer_guide": lambda user_idea, req_summary: system_prompts.get_developer_prompt(
+        req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
+    ),
+    "developer_documentation": lambda user_idea, req_summary: system_prompts.get_developer_prompt(
+        req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
+    ),
+    "setup_guide": lambda user_idea, req_summary: system_prompts.get_setup_guide_prompt(
+        req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
+    ),
+    "user_documentation": lambda user_idea, req_summary: system_prompts.get_user_prompt(req_summary),
+    "test_documentation": lambda user_idea, req_summary: system_prompts.get_test_prompt(
+        req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
+    ),
+    "test_plan": lambda user_idea, req_summary: system_prompts.get_test_prompt(
+        req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
+    ),
+    "stakeholder_communication": lambda user_idea, req_summary: system_prompts.get_stakeholder_prompt(
+        req_summary, req_summary.get("pm_summary")
+    ),
+    "stakeholders_doc": lambda user_idea, req_summary: system_prompts.get_stakeholder_prompt(
+        req_summary, req_summary.get("pm_summary")
+    ),
+    "business_model": lambda user_idea, req_summary: system_prompts.get_business_model_prompt(
+        req_summary, req_summary.get("project_charter_summary")
+    ),
+    "gtm_strategy": lambda user_idea, req_summary: system_prompts.get_marketing_plan_prompt(
+        req_summary,
+        req_summary.get("project_charter_summary"),
+        req_summary.get("business_model"),
+    ),
+    "feature_roadmap": lambda user_idea, req_summary: system_prompts.get_feature_roadmap_prompt(
+        req_summary,
+        req_summary.get("project_charter_summary"),
+        req_summary.get("business_model"),
+    ),
+    "support_playbook": lambda user_idea, req_summary: system_prompts.get_support_playbook_prompt(req_summary),
+    "legal_compliance": lambda user_idea, req_summary: system_prompts.get_legal_compliance_prompt(req_summary),
+    # Brick-and-Mortar documents
+    "business_overview": lambda user_idea, req_summary: system_prompts.get_business_overview_prompt(
+        req_summary,
+        req_summary.get("market_research_summary"),
+    ),
+    "operations_plan": lambda user_idea, req_summary: system_prompts.get_operations_plan_prompt(
+        req_summary,
+        req_summary.get("business_overview_summary"),
+    ),
+    "market_research": lambda user_idea, req_summary: system_prompts.get_market_research_prompt(req_summary),
+    "financial_model": lambda user_idea, req_summary: system_prompts.get_financial_model_prompt(
+        req_summary,
+        req_summary.get("business_overview_summary"),
+        req_summary.get("operations_plan_summary"),
+    ),
+    "licensing_checklist": lambda user_idea, req_summary: system_prompts.get_licensing_checklist_prompt(
+        req_summary,
+        req_summary.get("business_overview_summary"),
+    ),
+    "sop": lambda user_idea, req_summary: system_prompts.get_sop_prompt(
+        req_summary,
+        req_summary.get("operations_plan_summary"),
+    ),
+    "hr_staffing_guide": lambda user_idea, req_summary: system_prompts.get_hr_staffing_guide_prompt(
+        req_summary,
+        req_summary.get("operations_plan_summary"),
+    ),
+    "marketing_plan": lambda user_idea, req_summary: system_prompts.get_marketing_branding_plan_prompt(
+        req_summary,
+        req_summary.get("business_overview_summary"),
+        req_summary.get("market_research_summary"),
+    ),
+    "risk_management_plan": lambda user_idea, req_summary: system_prompts.get_risk_management_plan_prompt(
+        req_summary,
+        req_summary.get("business_overview_summary"),
+        req_summary.get("operations_plan_summary"),
+        req_summary.get("financial_model_summary"),
+    ),
+    "customer_experience_playbook": lambda user_idea, req_summary: system_prompts.get_customer_experience_playbook_prompt(
+        req_summary,
+        req_summary.get("sop_summary"),
+        req_summary.get("operations_plan_summary"),
+    ),
+    "growth_expansion_plan": lambda user_idea, req_summary: system_prompts.get_growth_expansion_plan_prompt(
+        req_summary,
+        req_summary.get("business_overview_summary"),
+        req_summary.get("financial_model_summary"),
+    ),
+    "execution_roadmap": lambda user_idea, req_summary: system_prompts.get_execution_roadmap_prompt(
+        req_summary,
+        req_summary.get("licensing_checklist_summary"),
+        req_summary.get("operations_plan_summary"),
+        req_summary.get("marketing_plan_summary") or req_summary.get("marketing_plan"),
+    ),
+}
+
+
+def _build_prompt(
+    builder: Callable[[str, Dict[str, Any]], str],
+    user_idea: str,
+    dependency_documents: Dict[str, Dict[str, str]],
+    condense_chars: Optional[int],
+) -> str:
+    """Assemble a specialized prompt from the raw inputs (cache-miss path)."""
+    req_summary = _extract_requirements_summary(user_idea, dependency_documents)
+    if condense_chars:
+        req_summary = condense_summary(req_summary, max_chars=condense_chars)
+    return builder(user_idea, req_summary)
+
+
 def _get_prompt_for_document(
     document_id: str,
     user_idea: str,
     dependency_documents: Dict[str, Dict[str, str]],
+    condense_chars: Optional[int] = None,
 ) -> Optional[str]:
     """Get specialized prompt for a document ID, or None if not available."""
-    req_summary = _extract_requirements_summary(user_idea, dependency_documents)
-
-    # Map document IDs to prompt functions
-    prompt_map: Dict[str, Callable] = {
-        "requirements": lambda: system_prompts.get_requirements_prompt(user_idea),
-        "project_charter": lambda: system_prompts.get_project_charter_prompt(req_summary),
-        "user_stories": lambda: system_prompts.get_user_stories_prompt(
-            req_summary, req_summary.get("project_charter_summary")
-        ),
-        "pm_documentation": lambda: system_prompts.get_pm_prompt(
-            req_summary, req_summary.get("project_charter_summary")
-        ),
-        "pm_management_doc": lambda: system_prompts.get_pm_prompt(
-            req_summary, req_summary.get("project_charter_summary")
-        ),
-        "wbs": lambda: system_prompts.get_wbs_prompt(
-            req_summary, req_summary.get("project_charter_summary"), req_summary.get("pm_summary")
-        ),
-        "technical_documentation": lambda: system_prompts.get_technical_prompt(
-            req_summary, req_summary.get("project_charter_summary"), req_summary.get("user_stories")
-        ),
-        "tad": lambda: system_prompts.get_technical_prompt(
-            req_summary, req_summary.get("project_charter_summary"), req_summary.get("user_stories")
-        ),
-        "api_documentation": lambda: system_prompts.get_api_prompt(
-            req_summary, req_summary.get("technical_summary")
-        ),
-        "database_schema": lambda: system_prompts.get_database_schema_prompt(
-            req_summary, req_summary.get("technical_summary")
-        ),
-        "developer_guide": lambda: system_prompts.get_developer_prompt(
-            req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
-        ),
-        "developer_documentation": lambda: system_prompts.get_developer_prompt(
-            req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
-        ),
-        "setup_guide": lambda: system_prompts.get_setup_guide_prompt(
-            req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
-        ),
-        "user_documentation": lambda: system_prompts.get_user_prompt(req_summary),
-        "test_documentation": lambda: system_prompts.get_test_prompt(
-            req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
-        ),
-        "test_plan": lambda: system_prompts.get_test_prompt(
-            req_summary, req_summary.get("technical_summary"), req_summary.get("api_summary")
-        ),
-        "stakeholder_communication": lambda: system_prompts.get_stakeholder_prompt(
-            req_summary, req_summary.get("pm_summary")
-        ),
-        "stakeholders_doc": lambda: system_prompts.get_stakeholder_prompt(
-            req_summary, req_summary.get("pm_summary")
-        ),
-        "business_model": lambda: system_prompts.get_business_model_prompt(
-            req_summary, req_summary.get("project_charter_summary")
-        ),
-        "marketing_plan": lambda: system_prompts.get_marketing_plan_prompt(
-            req_summary,
-            req_summary.get("project_charter_summary"),
-            req_summary.get("business_model"),
-        ),
-        "gtm_strategy": lambda: system_prompts.get_marketing_plan_prompt(
-            req_summary,
-            req_summary.get("project_charter_summary"),
-            req_summary.get("business_model"),
-        ),
-        "feature_roadmap": lambda: system_prompts.get_feature_roadmap_prompt(
-            req_summary,
-            req_summary.get("project_charter_summary"),
-            req_summary.get("business_model"),
-        ),
-        "risk_management_plan": lambda: system_prompts.get_risk_management_prompt(
-            req_summary,
-            req_summary.get("project_charter_summary"),
-            req_summary.get("business_model"),
-        ),
-        "support_playbook": lambda: system_prompts.get_support_playbook_prompt(req_summary),
-        "legal_compliance": lambda: system_prompts.get_legal_compliance_prompt(req_summary),
-        # Brick-and-Mortar documents
-        "business_overview": lambda: system_prompts.get_business_overview_prompt(
-            req_summary,
-            req_summary.get("market_research_summary"),
-        ),
-        "operations_plan": lambda: system_prompts.get_operations_plan_prompt(
-            req_summary,
-            req_summary.get("business_overview_summary"),
-        ),
-        "market_research": lambda: system_prompts.get_market_research_prompt(req_summary),
-        "financial_model": lambda: system_prompts.get_financial_model_prompt(
-            req_summary,
-            req_summary.get("business_overview_summary"),
-            req_summary.get("operations_plan_summary"),
-        ),
-        "licensing_checklist": lambda: system_prompts.get_licensing_checklist_prompt(
-            req_summary,
-            req_summary.get("business_overview_summary"),
-        ),
-        "sop": lambda: system_prompts.get_sop_prompt(
-            req_summary,
-            req_summary.get("operations_plan_summary"),
-        ),
-        "hr_staffing_guide": lambda: system_prompts.get_hr_staffing_guide_prompt(
-            req_summary,
-            req_summary.get("operations_plan_summary"),
-        ),
-        "marketing_plan": lambda: system_prompts.get_marketing_branding_plan_prompt(
-            req_summary,
-            req_summary.get("business_overview_summary"),
-            req_summary.get("market_research_summary"),
-        ),
-        "risk_management_plan": lambda: system_prompts.get_risk_management_plan_prompt(
-            req_summary,
-            req_summary.get("business_overview_summary"),
-            req_summary.get("operations_plan_summary"),
-            req_summary.get("financial_model_summary"),
-        ),
-        "customer_experience_playbook": lambda: system_prompts.get_customer_experience_playbook_prompt(
-            req_summary,
-            req_summary.get("sop_summary"),
-            req_summary.get("operations_plan_summary"),
-        ),
-        "growth_expansion_plan": lambda: system_prompts.get_growth_expansion_plan_prompt(
-            req_summary,
-            req_summary.get("business_overview_summary"),
-            req_summary.get("financial_model_summary"),
-        ),
-        "execution_roadmap": lambda: system_prompts.get_execution_roadmap_prompt(
-            req_summary,
-            req_summary.get("licensing_checklist_summary"),
-            req_summary.get("operations_plan_summary"),
-            req_summary.get("marketing_plan_summary") or req_summary.get("marketing_plan"),
-        ),
-    }
-
-    prompt_fn = prompt_map.get(document_id)
-    if not prompt_fn:
+    builder = _PROMPT_BUILDERS.get(document_id)
+    if not builder:
         return None
 
+    # The summary is derived from these inputs (and repeats the dependency
+    # contents under "all_dependencies"), so serialize the raw inputs once instead
+    inputs_key = json_utils.dumps([user_idea, dependency_documents, condense_chars], sort_keys=True)
     try:
-        return prompt_fn()
+        return get_cached_prompt(
+            document_id,
+            inputs_key,
+            partial(_build_prompt, builder, user_idea, dependency_documents, condense_chars),
+        )
     except Exception as exc:
         # Log error but don't fail - fall back to generic prompt
         from src.utils.logger import get_logger
@@ -277,7 +331,33 @@ def get_prompt_for_document(
     document_id: str,
     user_idea: str,
     dependency_documents: Dict[str, Dict[str, str]],
+    condense_chars: Optional[int] = None,
 ) -> Optional[str]:
-    """Public interface to get specialized prompt for a document."""
-    return _get_prompt_for_document(document_id, user_idea, dependency_documents)
+    """
+    Public interface to get specialized prompt for a document.
+
+    Args:
+        document_id: Catalog document ID
+        user_idea: User's project idea
+        dependency_documents: Generated dependency documents by ID
+        condense_chars: If set, cap the free-text dependency fields of the
+            requirements summary to this many characters in total
+
+    Returns:
+        Specialized prompt, or None if the document has none
+    """
+    return _get_prompt_for_document(document_id, user_idea, dependency_documents, condense_chars)
+
+
+
+# Documents whose specialized prompt starts with static instructions that can be
+# sent separately as a system prompt (a stable prefix for provider prompt caching)
+_SYSTEM_PROMPTS: Dict[str, Callable[[], str]] = {
+    "wbs": system_prompts.get_wbs_system_prompt,
+}
+
 
+def get_system_prompt_for_document(document_id: str) -> Optional[str]:
+    """Static system prompt for a document ID, or None if its prompt has no separable prefix."""
+    prompt_fn = _SYSTEM_PROMPTS.get(document_id)
+    return prompt_fn() if prompt_fn else None
@@ -0,0 +1,273 @@
+"""
+Semantic Response Cache
+Returns a previously generated document when a new user idea is a near duplicate
+of one seen before (cosine similarity of sentence embeddings above a threshold)
+
+Requires the optional sentence-transformers package; FAISS is used for the
+similarity search when installed, numpy otherwise.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from src.config.settings import get_settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+DEFAULT_CACHE_NAME = "ideas"
+# Embeddings of recently looked-up texts, so storing the document generated after
+# a miss does not embed the same text a second time
+RECENT_EMBEDDINGS_SIZE = 32
+
+# Politeness/filler phrases that do not change what is being asked for
+_FILLER_PATTERN = re.compile(
+    r"\b(please|can you|could you|would you|i want you to|i would like you to|help me)\b"
+)
+
+
+def canonicalize(text: str) -> str:
+    """
+    Normalize a user idea before embedding
+
+    Args:
+        text: Raw user idea
+
+    Returns:
+        Lowercased text with filler phrases and extra whitespace removed
+    """
+    text = _FILLER_PATTERN.sub(" ", text.lower())
+    return " ".join(text.split())
+
+
+def semantic_cache_path(name: str) -> str:
+    """
+    Path of a named semantic cache under settings.semantic_cache_dir
+
+    Args:
+        name: Cache name (e.g. a document type id)
+
+    Returns:
+        Absolute path of the cache's SQLite file
+    """
+    return os.path.expanduser(os.path.join(get_settings().semantic_cache_dir, f"{name}.sqlite"))
+
+
+class SemanticCache:
+    """Embedding-similarity cache of generated documents"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        model_name: str = DEFAULT_MODEL_NAME,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Initialize the cache (the embedding model is loaded on first use)
+
+        Args:
+            path: SQLite database holding ideas, documents and embeddings
+                (default: the "ideas" cache under settings.semantic_cache_dir)
+            model_name: sentence-transformers model name
+            ttl: Seconds an entry stays valid (None = never expires)
+            max_entries: Keep at most this many entries, evicting the least
+                recently used (None = unbounded)
+        """
+        self.path = Path(os.path.expanduser(path or semantic_cache_path(DEFAULT_CACHE_NAME)))
+        self.model_name = model_name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._model = None
+        self._index = None
+        self._vectors = None
+        # (row id, idea, document, file_path, created_at) in index order, plus their embeddings
+        self._entries: List[Tuple[int, str, str, Optional[str], float]] = []
+        self._embeddings: list = []
+        self._recent_embeddings: "OrderedDict[bytes, object]" = OrderedDict()
+        self._lock = Lock()
+        self._loaded = False
+
+    def _get_model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _embed(self, text: str):
+        import numpy as np
+        vector = self._get_model().encode([canonicalize(text)], normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+    def _embed_recent(self, text: str):
+        """Embed text, reusing the vector of a recent lookup or add of the same text (caller holds the lock)"""
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        vector = self._recent_embeddings.get(key)
+        if vector is None:
+            vector = self._embed(text)
+            self._recent_embeddings[key] = vector
+            while len(self._recent_embeddings) > RECENT_EMBEDDINGS_SIZE:
+                self._recent_embeddings.popitem(last=False)
+        else:
+            self._recent_embeddings.move_to_end(key)
+        return vector
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=5.0)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, idea TEXT, document TEXT, "
+            "file_path TEXT, embedding BLOB, created_at REAL, last_used REAL)"
+        )
+        # Databases written before entries were timestamped
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(semantic_cache)")}
+        for column in ("created_at", "last_used"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE semantic_cache ADD COLUMN {column} REAL")
+        return conn
+
+    def _add_to_index(self, vectors) -> None:
+        import numpy as np
+        try:
+            import faiss
+        except ImportError:
+            faiss = None
+
+        if faiss is not None:
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(vectors.shape[1])
+            self._index.add(vectors)
+        elif self._vectors is None:
+            self._vectors = vectors
+        else:
+            self._vectors = np.vstack([self._vectors, vectors])
+
+    def _rebuild_index(self) -> None:
+        import numpy as np
+        self._index = None
+        self._vectors = None
+        if self._embeddings:
+            self._add_to_index(np.vstack(self._embeddings))
+
+    def _evict(self, conn: sqlite3.Connection) -> bool:
+        """Drop expired entries and trim to max_entries (LRU); returns True if any were removed"""
+        removed = 0
+        if self.ttl is not None:
+            removed += conn.execute(
+                "DELETE FROM semantic_cache WHERE COALESCE(created_at, 0) < ?",
+                (time.time() - self.ttl,),
+            ).rowcount
+        if self.max_entries is not None:
+            removed += conn.execute(
+                "DELETE FROM semantic_cache WHERE id NOT IN ("
+                "SELECT id FROM semantic_cache ORDER BY COALESCE(last_used, 0) DESC, id DESC LIMIT ?)",
+                (self.max_entries,),
+            ).rowcount
+        return removed > 0
+
+    def _load(self, force: bool = False) -> None:
+        if self._loaded and not force:
+            return
+        import numpy as np
+
+        self._entries = []
+        self._embeddings = []
+        if self.path.exists():
+            conn = self._connect()
+            try:
+                if self._evict(conn):
+                    conn.commit()
+                rows = conn.execute(
+                    "SELECT id, idea, document, file_path, embedding, COALESCE(created_at, 0) "
+                    "FROM semantic_cache ORDER BY id"
+                ).fetchall()
+            finally:
+                conn.close()
+            self._entries = [(row[0], row[1], row[2], row[3], row[5]) for row in rows]
+            self._embeddings = [np.frombuffer(row[4], dtype=np.float32).reshape(1, -1) for row in rows]
+            logger.debug(f"Semantic cache loaded {len(rows)} entries from {self.path}")
+        self._rebuild_index()
+        self._loaded = True
+
+    def _search(self, query, top_k: int) -> List[Tuple[float, int]]:
+        import numpy as np
+
+        if not self._entries:
+            return []
+        top_k = min(top_k, len(self._entries))
+        if self._index is not None:
+            scores, ids = self._index.search(query, top_k)
+            return [(float(s), int(i)) for s, i in zip(scores[0], ids[0]) if i >= 0]
+        scores = self._vectors @ query[0]
+        best = np.argsort(-scores)[:top_k]
+        return [(float(scores[i]), int(i)) for i in best]
+
+    def lookup(self, user_idea: str, threshold: float = 0.90, top_k: int = 5) -> Optional[str]:
+        """
+        Find a cached document for a similar user idea
+
+        Args:
+            user_idea: User's project idea
+            threshold: Minimum cosine similarity for a hit
+            top_k: Number of nearest neighbours to consider
+
+        Returns:
+            Cached document, or None on a miss
+        """
+        with self._lock:
+            self._load()
+            matches = self._search(self._embed_recent(user_idea), top_k)
+            expired_before = time.time() - self.ttl if self.ttl is not None else None
+            for score, idx in matches:
+                row_id, _, document, _, created_at = self._entries[idx]
+                if expired_before is not None and created_at < expired_before:
+                    continue
+                if score >= threshold:
+                    conn = self._connect()
+                    try:
+                        conn.execute("UPDATE semantic_cache SET last_used = ? WHERE id = ?", (time.time(), row_id))
+                        conn.commit()
+                    finally:
+                        conn.close()
+                    logger.info(f"Semantic cache hit (similarity: {score:.3f})")
+                    return document
+        return None
+
+    def add(self, user_idea: str, document: str, file_path: Optional[str] = None) -> None:
+        """
+        Store a generated document for a user idea
+
+        Args:
+            user_idea: User's project idea
+            document: Generated document content
+            file_path: Optional path of the saved document
+        """
+        with self._lock:
+            self._load()
+            vector = self._embed_recent(user_idea)
+            now = time.time()
+            conn = self._connect()
+            try:
+                row_id = conn.execute(
+                    "INSERT INTO semantic_cache (idea, document, file_path, embedding, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (user_idea, document, file_path, vector.tobytes(), now, now),
+                ).lastrowid
+                evicted = self._evict(conn)
+                conn.commit()
+            finally:
+                conn.close()
+            if evicted:
+                self._load(force=True)
+            else:
+                self._entries.append((row_id, user_idea, document, file_path, now))
+                self._embeddings.append(vector)
+                self._add_to_index(vector)
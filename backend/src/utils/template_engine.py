@@ -6,6 +6,9 @@ from typing import Dict, Optional, Any
 from pathlib import Path
 import os
 from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class TemplateEngine:
@@ -212,7 +215,7 @@ class TemplateEngine:
             return template.render(**context)
         except Exception as e:
             # Fallback to default if template not found
-            print(f"⚠️  Template {template_name} not found, using default format")
+            logger.warning("Template %s not found, using default format: %s", template_name, e)
             return self._render_fallback(template_name, context)
     
     def _render_fallback(self, template_name: str, context: Dict[str, Any]) -> str:
@@ -243,7 +246,7 @@ class TemplateEngine:
         """Save a custom template"""
         template_path = self.template_dir / template_name
         template_path.write_text(content)
-        print(f"✅ Template saved: {template_path}")
+        logger.info("Template saved: %s", template_path)
     
     def list_templates(self) -> list:
         """List all available templates"""
@@ -41,7 +41,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 from starlette.exceptions import HTTPException
 
-from src.config.document_catalog import load_document_definitions
+from src.config.document_catalog import CatalogNotFoundError, load_document_definitions, warm as warm_catalog
 from src.coordination.coordinator import WorkflowCoordinator
 from src.context.context_manager import ContextManager
 from src.utils.logger import get_logger
@@ -215,8 +215,9 @@ async def lifespan(app: FastAPI):
     set_projects_limiter(limiter)
     set_documents_limiter(limiter)
     
-    # Load and cache document catalog on startup
-    # This is already cached with @lru_cache, but we trigger load now
+    # Load the document catalog (and its dependency order) on startup so the
+    # first request does not pay for reading and parsing it
+    warm_catalog()
     definitions = load_document_definitions()
     app.state.document_definitions = definitions
     logger.info(f"Loaded {len(definitions)} document definitions at startup")
@@ -266,6 +267,11 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     
     return response
 
+@app.exception_handler(CatalogNotFoundError)
+async def catalog_not_found_handler(request: Request, exc: CatalogNotFoundError):
+    # The catalog loader is framework-agnostic; report a missing catalog as a server error here
+    return await http_exception_handler(request, HTTPException(status_code=500, detail=str(exc)))
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     origin = request.headers.get("origin")
@@ -1,11 +1,12 @@
 """Project-related API endpoints"""
 from __future__ import annotations
 
+import asyncio
 import os
-import uuid
-from datetime import datetime
+import secrets
+import time
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 
 from fastapi import APIRouter, HTTPException, Request, Query, Depends, BackgroundTasks
 from fastapi.responses import FileResponse
@@ -14,6 +15,7 @@ from slowapi import Limiter
 
 from src.config.document_catalog import get_document_by_id
 from src.context.context_manager import ContextManager
+from src.context.shared_context import agent_type_for_document
 from src.utils.logger import get_logger
 from src.tasks.celery_app import REDIS_AVAILABLE, check_redis_available
 from src.web.utils import parse_json_field
@@ -55,6 +57,11 @@ def set_limiter(lim: Limiter) -> None:
     limiter = lim
 
 
+def _new_project_id() -> str:
+    """Build a project ID: creation time plus 8 random hex characters"""
+    return f"project_{time.strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}"
+
+
 def apply_rate_limit(limit_str: str):
     """
     Helper decorator to apply rate limiting if limiter is available.
@@ -134,7 +141,7 @@ async def create_project(
     # Sanitize user input (basic sanitization)
     user_idea = project_request.user_idea.strip()[:5000]
     
-    project_id = f"project_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    project_id = _new_project_id()
     # Remove duplicates while preserving order
     selected_documents = list(dict.fromkeys(project_request.selected_documents))
 
@@ -274,7 +281,7 @@ async def create_brick_and_mortar_project(
     user_idea = project_request.user_idea.strip()[:5000]
     
     # Generate project ID
-    project_id = f"project_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    project_id = _new_project_id()
     
     # Use all 12 brick-and-mortar documents
     selected_documents = BRICK_AND_MORTAR_DOCUMENTS.copy()
@@ -416,6 +423,61 @@ async def get_project_status(
     )
 
 
+def _read_document_content(cm: ContextManager, project_id: str, document_id: str) -> Optional[str]:
+    """
+    Read a document's latest content from the agent outputs table.
+    
+    Args:
+        cm: Context manager
+        project_id: Project identifier
+        document_id: Document identifier
+    
+    Returns:
+        Document content, or None if not stored (or the read failed)
+    """
+    try:
+        # Map document_id to agent_type if possible, otherwise look up by document_type
+        agent_type = agent_type_for_document(document_id)
+        if agent_type is None:
+            return cm.get_document_content_by_type(project_id, document_id)
+        
+        agent_output = cm.get_agent_output(project_id, agent_type)
+        return agent_output.content if agent_output else None
+    except Exception as exc:
+        logger.warning("Failed to read document %s from database: %s", document_id, exc)
+        return None
+
+
+# Agent-output reads run at once per request (well below the context manager's pool size)
+MAX_CONCURRENT_CONTENT_READS = 4
+
+
+async def _read_document_contents(
+    cm: ContextManager, project_id: str, document_ids: List[str]
+) -> Dict[str, Optional[str]]:
+    """
+    Read several documents' content from the agent outputs table concurrently.
+    
+    Each read runs on a worker thread, so the event loop is not blocked.
+    
+    Args:
+        cm: Context manager
+        project_id: Project identifier
+        document_ids: Document identifiers
+    
+    Returns:
+        Dict mapping each document ID to its content (None if not stored)
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CONTENT_READS)
+
+    async def read(document_id: str) -> Optional[str]:
+        async with semaphore:
+            return await asyncio.to_thread(_read_document_content, cm, project_id, document_id)
+
+    contents = await asyncio.gather(*(read(document_id) for document_id in document_ids))
+    return dict(zip(document_ids, contents))
+
+
 @router.get("/{project_id}/documents", response_model=ProjectDocumentsResponse)
 @apply_rate_limit("60/minute")  # 文档列表查询限制：60次/分钟
 async def get_project_documents(
@@ -452,55 +514,39 @@ async def get_project_documents(
         results_raw = {}
 
     files = results_raw.get("files", {})
-    all_documents: List[GeneratedDocument] = []
     
     # Parse completed_agents to check document status
     completed_agents = parse_json_field(status_row.get("completed_agents"), default=[])
     completed_agents_set: Set[str] = set(completed_agents) if isinstance(completed_agents, list) else set()
     
-    for doc_id, file_path in files.items():
+    # Apply pagination before reading any content: only the requested page is built
+    start_idx = (page - 1) * page_size
+    page_files = list(files.items())[start_idx:start_idx + page_size]
+    # The status row already carries the final content of each generated document
+    page_contents: Dict[str, Optional[str]] = {
+        doc_id: file_entry.get("content") if isinstance(file_entry, dict) else None
+        for doc_id, file_entry in page_files
+    }
+    missing_ids = [doc_id for doc_id, content in page_contents.items() if not content]
+    if missing_ids:
+        page_contents.update(await _read_document_contents(cm, project_id, missing_ids))
+    
+    documents: List[GeneratedDocument] = []
+    for doc_id, file_entry in page_files:
         definition = get_document_by_id(doc_id)
         doc_name = definition.name if definition else doc_id.replace("_", " ").title()
-        path_value = file_path.get("path") if isinstance(file_path, dict) else file_path
-        content: Optional[str] = None
+        path_value = file_entry.get("path") if isinstance(file_entry, dict) else file_entry
 
-        # Get content from database (agent_outputs table)
-        try:
-            # Try to get from agent_outputs by document_type
-            from src.context.shared_context import AgentType
-            # Map document_id to agent_type if possible
-            agent_type = None
-            try:
-                agent_type = AgentType(doc_id)
-            except ValueError:
-                # Not a standard AgentType, try to find by document_type
-                pass
-            
-            if agent_type:
-                agent_output = cm.get_agent_output(project_id, agent_type)
-                if agent_output:
-                    content = agent_output.content
-            else:
-                # Try to find by document_type directly
-                content = cm.get_document_content_by_type(project_id, doc_id)
-        except Exception as exc:
-            logger.warning("Failed to read document %s from database: %s", doc_id, exc)
-
-        all_documents.append(
+        documents.append(
             GeneratedDocument(
                 id=doc_id,
                 name=doc_name,
                 status="complete" if doc_id in completed_agents_set else "pending",
                 file_path=path_value if isinstance(path_value, str) else None,  # Virtual path for reference
-                content=content,  # Content from database
+                content=page_contents[doc_id],  # From the status row, else the database
             )
         )
 
-    # Apply pagination
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    documents = all_documents[start_idx:end_idx]
-
     return ProjectDocumentsResponse(project_id=project_id, documents=documents)
 
 
@@ -552,27 +598,14 @@ async def get_single_document(
     completed_agents = parse_json_field(status_row.get("completed_agents"), default=[])
     completed_agents_set: Set[str] = set(completed_agents) if isinstance(completed_agents, list) else set()
 
-    path_value = files[document_id].get("path") if isinstance(files[document_id], dict) else files[document_id]
-    content: Optional[str] = None
+    file_entry = files[document_id]
+    path_value = file_entry.get("path") if isinstance(file_entry, dict) else file_entry
+    # The status row already carries the final content of each generated document
+    content: Optional[str] = file_entry.get("content") if isinstance(file_entry, dict) else None
     
-    # Try to get content from database first (preferred)
-    try:
-        from src.context.shared_context import AgentType
-        agent_type = None
-        try:
-            agent_type = AgentType(document_id)
-        except ValueError:
-            pass
-        
-        if agent_type:
-            agent_output = cm.get_agent_output(project_id, agent_type)
-            if agent_output:
-                content = agent_output.content
-        else:
-            # Try to find by document_type directly
-            content = cm.get_document_content_by_type(project_id, document_id)
-    except Exception as exc:
-        logger.warning("Failed to read document %s from database: %s", document_id, exc)
+    # Otherwise get content from the agent outputs table
+    if not content:
+        content = _read_document_content(cm, project_id, document_id)
     
     # Fallback to file system if database content not found
     if not content and isinstance(path_value, str) and Path(path_value).exists():
@@ -9,6 +9,7 @@ from __future__ import annotations
 import json
 from typing import Any
 
+from src.utils import json_utils
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -41,7 +42,7 @@ def parse_json_field(value: Any, default: Any = None) -> Any:
     
     if isinstance(value, str):
         try:
-            return json.loads(value)
+            return json_utils.loads(value)
         except json.JSONDecodeError:
             logger.warning("Failed to parse JSON field: %s", value[:100] if len(str(value)) > 100 else value)
             return default
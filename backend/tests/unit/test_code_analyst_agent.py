@@ -327,3 +327,50 @@ class BrokenClass:
         assert documentation is not None
         assert len(documentation) > 0
 
+    def test_analyze_and_update_docs_overlaps_existing_docs_lookup(self):
+        """Test the existing API docs are read while the codebase is analyzed"""
+        import threading
+        from unittest.mock import MagicMock, patch
+        
+        agent = CodeAnalystAgent.__new__(CodeAnalystAgent)
+        lookup_started = threading.Event()
+        context_manager = MagicMock()
+        
+        def get_agent_output(project_id, agent_type):
+            lookup_started.set()
+            return MagicMock(content="# Existing API docs")
+        
+        def analyze_codebase(codebase_path):
+            # Only returns once the lookup has started on another thread
+            assert lookup_started.wait(timeout=5)
+            return {"modules": [], "classes": [], "functions": []}
+        
+        context_manager.get_agent_output.side_effect = get_agent_output
+        with patch.object(agent, "analyze_codebase", side_effect=analyze_codebase), \
+                patch.object(agent, "generate_code_documentation", return_value="# Docs") as generate, \
+                patch.object(agent, "_persist"):
+            path = agent.analyze_and_update_docs("src/", project_id="p", context_manager=context_manager)
+        
+        assert path == "docs/code_analysis_docs.md"
+        assert generate.call_args.args[1] == "# Existing API docs"
+
+    def test_generate_code_documentation_reuses_summary(self):
+        """Test a prebuilt code summary is used as-is instead of being rebuilt"""
+        from unittest.mock import patch
+        
+        agent = CodeAnalystAgent.__new__(CodeAnalystAgent)
+        code_analysis = {
+            "modules": [],
+            "classes": [{"name": "Widget", "file": "widget.py", "docstring": None, "methods": [], "bases": []}],
+            "functions": [],
+        }
+        summary = agent.summarize_code_analysis(code_analysis)
+        
+        with patch.object(agent, "summarize_code_analysis") as summarize, \
+                patch.object(agent, "_call_llm", return_value="# Docs") as call_llm:
+            agent.generate_code_documentation(code_analysis, code_summary=summary)
+            agent.generate_code_documentation(code_analysis, "# Old", code_summary=summary)
+        
+        summarize.assert_not_called()
+        assert "### Widget (in widget.py)" in summary
+        assert all(summary in call.args[0] for call in call_llm.call_args_list)
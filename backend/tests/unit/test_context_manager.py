@@ -8,7 +8,8 @@ from src.context.shared_context import (
     RequirementsDocument,
     AgentOutput,
     AgentType,
-    DocumentStatus
+    DocumentStatus,
+    agent_type_for_document
 )
 from datetime import datetime
 
@@ -66,7 +67,36 @@ class TestContextManager:
         assert retrieved.agent_type == AgentType.REQUIREMENTS_ANALYST
         assert retrieved.content == "# Requirements"
         assert retrieved.status == DocumentStatus.COMPLETE
-    
+
+    def test_batch_save_agent_outputs(self, context_manager, test_project_id):
+        """Test saving several agent outputs in one transaction"""
+        outputs = [
+            AgentOutput(
+                agent_type=AgentType.REQUIREMENTS_ANALYST,
+                document_type="requirements",
+                content="# Requirements",
+                status=DocumentStatus.COMPLETE,
+                generated_at=datetime.now()
+            ),
+            AgentOutput(
+                agent_type=AgentType.TECHNICAL_DOCUMENTATION,
+                document_type="technical_documentation",
+                content="# Technical",
+                status=DocumentStatus.COMPLETE,
+                generated_at=datetime.now()
+            ),
+        ]
+
+        context_manager.create_project(test_project_id, "Test")
+        context_manager.batch_save(test_project_id, outputs)
+
+        retrieved = context_manager.get_agent_output(test_project_id, AgentType.REQUIREMENTS_ANALYST)
+        assert retrieved is not None
+        assert retrieved.content == "# Requirements"
+        retrieved = context_manager.get_agent_output(test_project_id, AgentType.TECHNICAL_DOCUMENTATION)
+        assert retrieved is not None
+        assert retrieved.content == "# Technical"
+
     def test_get_shared_context(self, context_manager, test_project_id):
         """Test getting complete shared context"""
         context_manager.create_project(test_project_id, "Test idea")
@@ -103,3 +133,16 @@ class TestContextManager:
         assert retrieved is not None
         assert retrieved.user_idea == "Persistent idea"
 
+
+@pytest.mark.unit
+class TestAgentTypeForDocument:
+    """Test document id to AgentType mapping"""
+    
+    def test_known_document_maps_to_agent_type(self):
+        """Standard document ids resolve to their enum member"""
+        for member in AgentType:
+            assert agent_type_for_document(member.value) is member
+    
+    def test_unknown_document_returns_none(self):
+        """Documents without a dedicated agent type return None instead of raising"""
+        assert agent_type_for_document("competitive_analysis") is None
@@ -0,0 +1,567 @@
+"""
+Unit Tests: WorkflowCoordinator
+Fast, isolated tests for DAG scheduling
+"""
+import asyncio
+
+import pytest
+from src.coordination import coordinator as coordinator_module
+from src.coordination.coordinator import WorkflowCoordinator
+
+
+@pytest.fixture
+def dag(monkeypatch):
+    """Coordinator without agents, scheduling over the given dependency map"""
+    def install(dependencies):
+        monkeypatch.setattr(
+            coordinator_module, "get_all_dependencies", lambda doc_id: dependencies.get(doc_id, [])
+        )
+        return WorkflowCoordinator.__new__(WorkflowCoordinator)
+    return install
+
+
+@pytest.mark.unit
+class TestRunDag:
+    """Test WorkflowCoordinator._run_dag"""
+
+    @pytest.mark.asyncio
+    async def test_dependent_starts_before_unrelated_straggler(self, dag):
+        """Test a document starts as soon as its own dependencies finish"""
+        coordinator = dag({"a": [], "slow": [], "b": ["a"]})
+        events = []
+
+        async def run_document(doc_id):
+            events.append(("start", doc_id))
+            await asyncio.sleep(0.2 if doc_id == "slow" else 0)
+            events.append(("end", doc_id))
+            return doc_id
+
+        async def on_done(doc_id, result):
+            pass
+
+        await coordinator._run_dag(["a", "slow", "b"], run_document, on_done)
+
+        assert events.index(("start", "b")) > events.index(("end", "a"))
+        assert events.index(("start", "b")) < events.index(("end", "slow"))
+
+    @pytest.mark.asyncio
+    async def test_failure_blocks_only_dependents(self, dag):
+        """Test dependents of a failed document are skipped and the rest still run"""
+        coordinator = dag({"a": [], "b": ["a"], "c": ["b"], "d": []})
+        done = {}
+
+        async def run_document(doc_id):
+            if doc_id == "a":
+                raise RuntimeError("boom")
+            return doc_id
+
+        async def on_done(doc_id, result):
+            done[doc_id] = result
+
+        await asyncio.wait_for(
+            coordinator._run_dag(["a", "b", "c", "d"], run_document, on_done), timeout=5
+        )
+
+        assert set(done) == {"a", "d"}
+        assert isinstance(done["a"], RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency(self, dag):
+        """Test no more than max_concurrency documents run at once"""
+        coordinator = dag({})
+        running = 0
+        peak = 0
+
+        async def run_document(doc_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        async def on_done(doc_id, result):
+            pass
+
+        await coordinator._run_dag([f"doc_{i}" for i in range(6)], run_document, on_done, max_concurrency=2)
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_longest_chain_dispatched_first(self, dag):
+        """Test ready documents heading longer dependent chains start before the rest"""
+        coordinator = dag({"a": [], "b": [], "c": ["b"], "d": ["c"]})
+        started = []
+
+        async def run_document(doc_id):
+            started.append(doc_id)
+
+        async def on_done(doc_id, result):
+            pass
+
+        await coordinator._run_dag(["a", "b", "c", "d"], run_document, on_done, max_concurrency=1)
+
+        assert started == ["b", "c", "a", "d"]
+
+
+@pytest.mark.unit
+class TestGenerateAllDocs:
+    """Test WorkflowCoordinator.async_generate_all_docs bookkeeping"""
+
+    @pytest.mark.asyncio
+    async def test_progress_writes_do_not_hold_dependents(self, dag, monkeypatch):
+        """Test dependents start without waiting for progress writes, which land before the final status"""
+        import threading
+        from unittest.mock import MagicMock
+
+        coordinator = dag({"a": [], "b": ["a"]})
+        monkeypatch.setattr(coordinator_module, "resolve_dependencies", lambda selected: ["a", "b"])
+        coordinator.definitions = {}
+        coordinator.aggregate_context_writes = False
+        coordinator.max_concurrency = None
+        coordinator.context_manager = MagicMock()
+        release_write = threading.Event()
+        statuses = []
+
+        def update_project_status(**kwargs):
+            if kwargs["status"] == "in_progress":
+                release_write.wait(timeout=5)
+            statuses.append(kwargs["status"])
+
+        coordinator.context_manager.update_project_status.side_effect = update_project_status
+
+        async def generate_single_doc(document_id, **kwargs):
+            if document_id == "b":
+                # "a"'s progress write is still blocked while its dependent runs
+                assert statuses == []
+                release_write.set()
+            return document_id, {"content": document_id}
+
+        coordinator._generate_single_doc = generate_single_doc
+
+        results = await coordinator.async_generate_all_docs("idea", "p", ["b"])
+
+        assert set(results["files"]) == {"a", "b"}
+        assert statuses == ["in_progress", "in_progress", "complete"]
+
+
+    @pytest.mark.asyncio
+    async def test_batched_saves_do_not_hold_dependents(self, dag, monkeypatch):
+        """Test aggregated improved-document saves run in the background and land before the final status"""
+        import threading
+        from unittest.mock import MagicMock
+
+        coordinator = dag({"a": [], "b": ["a"]})
+        monkeypatch.setattr(coordinator_module, "resolve_dependencies", lambda selected: ["a", "b"])
+        coordinator.definitions = {}
+        coordinator.aggregate_context_writes = True
+        coordinator.max_concurrency = None
+        coordinator.context_manager = MagicMock()
+        release_save = threading.Event()
+        writes = []
+
+        def batch_save(project_id, outputs):
+            release_save.wait(timeout=5)
+            writes.append(list(outputs))
+
+        coordinator.context_manager.batch_save.side_effect = batch_save
+        coordinator.context_manager.update_project_status.side_effect = (
+            lambda **kwargs: writes.append(kwargs["status"])
+        )
+
+        async def generate_single_doc(document_id, pending_outputs, **kwargs):
+            if document_id == "b":
+                # "a"'s improved document is still being saved while its dependent runs
+                assert ["a"] not in writes
+                release_save.set()
+            pending_outputs.append(document_id)
+            return document_id, {"content": document_id}
+
+        coordinator._generate_single_doc = generate_single_doc
+
+        await coordinator.async_generate_all_docs("idea", "p", ["b"])
+
+        saved = [write for write in writes if isinstance(write, list)]
+        assert sorted(doc for batch in saved for doc in batch) == ["a", "b"]
+        assert writes[-1] == "complete"
+
+    @pytest.mark.asyncio
+    async def test_retry_reuses_previous_documents(self, dag, monkeypatch):
+        """Test a resumed run only generates the documents the failed run did not finish"""
+        from unittest.mock import MagicMock
+
+        coordinator = dag({"a": [], "b": ["a"]})
+        monkeypatch.setattr(coordinator_module, "resolve_dependencies", lambda selected: ["a", "b"])
+        coordinator.definitions = {}
+        coordinator.aggregate_context_writes = False
+        coordinator.max_concurrency = None
+        coordinator.context_manager = MagicMock()
+        generated = []
+
+        async def generate_single_doc(document_id, generated_docs, **kwargs):
+            generated.append(document_id)
+            assert generated_docs["a"]["content"] == "# A"
+            return document_id, {"content": "# B", "file_path": "p/b.md"}
+
+        coordinator._generate_single_doc = generate_single_doc
+        previous = {"files": {"a": {"content": "# A", "path": "p/a.md", "file_path": "p/a.md"}}, "documents": []}
+
+        results = await coordinator.async_generate_all_docs("idea", "p", ["b"], previous_results=previous)
+
+        assert generated == ["b"]
+        assert set(results["files"]) == {"a", "b"}
+        final_status = coordinator.context_manager.update_project_status.call_args_list[-1].kwargs
+        assert final_status["status"] == "complete"
+
+    @pytest.mark.asyncio
+    async def test_final_status_written_off_event_loop(self, dag, monkeypatch):
+        """Test the final status write runs on a worker thread, not the event loop"""
+        import threading
+        from unittest.mock import MagicMock
+
+        coordinator = dag({"a": []})
+        monkeypatch.setattr(coordinator_module, "resolve_dependencies", lambda selected: ["a"])
+        coordinator.definitions = {}
+        coordinator.aggregate_context_writes = False
+        coordinator.max_concurrency = None
+        coordinator.context_manager = MagicMock()
+        loop_thread = threading.current_thread()
+        final_threads = []
+
+        def update_project_status(**kwargs):
+            if kwargs["status"] == "complete":
+                final_threads.append(threading.current_thread())
+
+        coordinator.context_manager.update_project_status.side_effect = update_project_status
+
+        async def generate_single_doc(document_id, **kwargs):
+            return document_id, {"content": document_id}
+
+        coordinator._generate_single_doc = generate_single_doc
+
+        await coordinator.async_generate_all_docs("idea", "p", ["a"])
+
+        assert len(final_threads) == 1
+        assert final_threads[0] is not loop_thread
+
+    @pytest.mark.asyncio
+    async def test_improved_document_saved_in_background(self, dag):
+        """Test the improved document is returned before its save completes, which the caller can await"""
+        import threading
+        from unittest.mock import AsyncMock, MagicMock
+
+        coordinator = dag({"a": []})
+        coordinator.definitions = {"a": MagicMock(category="planning")}
+        agent = MagicMock()
+        agent.generate_and_save = AsyncMock(return_value={"content": "# Draft", "file_path": "p/a.md"})
+        coordinator.agents = {"a": agent}
+        coordinator._review_and_improve_document = AsyncMock(return_value="# Improved")
+        coordinator.context_manager = MagicMock()
+        release_save = threading.Event()
+        coordinator.context_manager.save_agent_output.side_effect = lambda project_id, output: release_save.wait(timeout=5)
+        background_writes = set()
+
+        doc_id, result = await coordinator._generate_single_doc(
+            document_id="a",
+            project_id="p",
+            user_idea="idea",
+            generated_docs={},
+            progress_callback=None,
+            total=1,
+            completed_count=0,
+            background_writes=background_writes,
+        )
+
+        assert (doc_id, result["content"]) == ("a", "# Improved")
+        assert len(background_writes) == 1
+        release_save.set()
+        await asyncio.gather(*background_writes)
+        saved = coordinator.context_manager.save_agent_output.call_args.args[1]
+        assert saved.content == "# Improved"
+
+    @pytest.mark.asyncio
+    async def test_start_event_overlaps_generation(self, dag):
+        """Test the document-started notification does not hold up generation"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        coordinator = dag({"a": []})
+        coordinator.definitions = {"a": MagicMock(category="planning")}
+        generation_started = asyncio.Event()
+        events = []
+
+        async def generate_and_save(**kwargs):
+            generation_started.set()
+            return {"content": "", "file_path": "p/a.md"}
+
+        async def progress_callback(event):
+            if event["type"] == "document_started":
+                await generation_started.wait()
+            events.append(event["type"])
+
+        agent = MagicMock()
+        agent.generate_and_save = generate_and_save
+        coordinator.agents = {"a": agent}
+        coordinator._review_and_improve_document = AsyncMock()
+
+        doc_id, _ = await asyncio.wait_for(
+            coordinator._generate_single_doc(
+                document_id="a",
+                project_id="p",
+                user_idea="idea",
+                generated_docs={},
+                progress_callback=progress_callback,
+                total=1,
+                completed_count=0,
+            ),
+            timeout=5,
+        )
+
+        assert doc_id == "a"
+        assert events == ["document_started", "document_completed"]
+
+    @pytest.mark.asyncio
+    async def test_failed_start_event_does_not_fail_document(self, dag):
+        """Test a failing document-started notification is logged and the document still succeeds"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        coordinator = dag({"a": []})
+        coordinator.definitions = {"a": MagicMock(category="planning")}
+        events = []
+
+        async def progress_callback(event):
+            if event["type"] == "document_started":
+                raise ConnectionError("websocket closed")
+            events.append(event["type"])
+
+        agent = MagicMock()
+        agent.generate_and_save = AsyncMock(return_value={"content": "", "file_path": "p/a.md"})
+        coordinator.agents = {"a": agent}
+        coordinator._review_and_improve_document = AsyncMock()
+
+        doc_id, result = await coordinator._generate_single_doc(
+            document_id="a",
+            project_id="p",
+            user_idea="idea",
+            generated_docs={},
+            progress_callback=progress_callback,
+            total=1,
+            completed_count=0,
+        )
+
+        assert (doc_id, result["file_path"]) == ("a", "p/a.md")
+        assert events == ["document_completed"]
+
+
+    @pytest.mark.asyncio
+    async def test_background_saves_are_bounded(self, dag):
+        """Test background saves holding the same slots never exceed the slot count"""
+        import threading
+        from unittest.mock import MagicMock
+        from src.context.shared_context import AgentOutput, AgentType, DocumentStatus
+
+        coordinator = dag({})
+        coordinator.context_manager = MagicMock()
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, peak
+
+        def save_agent_output(project_id, output):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            threading.Event().wait(0.05)
+            with lock:
+                in_flight[0] -= 1
+
+        coordinator.context_manager.save_agent_output.side_effect = save_agent_output
+        slots = asyncio.Semaphore(2)
+        output = AgentOutput(
+            agent_type=AgentType.TECHNICAL_DOCUMENTATION,
+            document_type="a",
+            content="# Improved",
+            file_path="p/a.md",
+            status=DocumentStatus.COMPLETE,
+        )
+
+        await asyncio.gather(*(coordinator._save_improved_output("p", output, slots) for _ in range(5)))
+
+        assert coordinator.context_manager.save_agent_output.call_count == 5
+        assert in_flight[1] <= 2
+
+    @pytest.mark.asyncio
+    async def test_flushes_queued_behind_busy_slots_share_a_transaction(self, dag):
+        """Test flushes waiting for a save slot pick up everything queued meanwhile in one batch"""
+        import threading
+        from unittest.mock import MagicMock
+
+        coordinator = dag({})
+        coordinator.context_manager = MagicMock()
+        release_save = threading.Event()
+        batches = []
+
+        def batch_save(project_id, outputs):
+            release_save.wait(timeout=5)
+            batches.append(list(outputs))
+
+        coordinator.context_manager.batch_save.side_effect = batch_save
+        slots = asyncio.Semaphore(1)
+        pending = ["a"]
+        first = asyncio.ensure_future(coordinator._flush_improved_outputs("p", pending, slots))
+        await asyncio.sleep(0.01)
+        pending.extend(["b", "c"])
+        waiting = [
+            asyncio.ensure_future(coordinator._flush_improved_outputs("p", pending, slots)) for _ in range(2)
+        ]
+        release_save.set()
+        await asyncio.gather(first, *waiting)
+
+        assert batches == [["a"], ["b", "c"]]
+
+@pytest.mark.unit
+class TestReviewAndImprove:
+    """Test WorkflowCoordinator._review_and_improve_document"""
+
+    async def review(self, automated_scores, skip_review=True):
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        coordinator = WorkflowCoordinator.__new__(WorkflowCoordinator)
+        coordinator.skip_review_on_automated_pass = skip_review
+        coordinator.quality_reviewer = MagicMock()
+        coordinator.quality_reviewer.async_generate_structured_feedback = AsyncMock(
+            return_value={"score": 9.0}
+        )
+        with patch(
+            "src.quality.document_type_quality_checker.DocumentTypeQualityChecker.check_quality_for_type",
+            return_value=automated_scores,
+        ):
+            content = await coordinator._review_and_improve_document(
+                document_id="wbs",
+                document_name="Work Breakdown Structure",
+                document_type="planning",
+                original_content="# WBS\n\nContent",
+                user_idea="idea",
+                dependency_documents={},
+                agent=MagicMock(),
+                output_rel_path="p/wbs.md",
+                project_id="p",
+            )
+        return content, coordinator.quality_reviewer.async_generate_structured_feedback
+
+    @pytest.mark.asyncio
+    async def test_automated_pass_skips_llm_review(self):
+        """Test a clearly passing document is accepted without the LLM reviewer"""
+        content, llm_review = await self.review({"passed": True, "overall_score": 92.0})
+
+        assert content == "# WBS\n\nContent"
+        llm_review.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_borderline_document_gets_llm_review(self):
+        """Test documents below the automated pass score still go to the LLM reviewer"""
+        _, llm_review = await self.review({"passed": True, "overall_score": 70.0})
+        llm_review.assert_awaited_once()
+
+        _, llm_review = await self.review({"passed": True, "overall_score": 92.0}, skip_review=False)
+        llm_review.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_progress_event_overlaps_automated_check(self):
+        """Test the review-started notification does not hold up the automated quality check"""
+        from unittest.mock import MagicMock, patch
+
+        coordinator = WorkflowCoordinator.__new__(WorkflowCoordinator)
+        coordinator.skip_review_on_automated_pass = True
+        loop = asyncio.get_running_loop()
+        check_started = asyncio.Event()
+        events = []
+
+        def check_quality_for_type(self, content, document_type):
+            loop.call_soon_threadsafe(check_started.set)
+            return {"passed": True, "overall_score": 95.0}
+
+        async def progress_callback(event):
+            if event["type"] == "quality_review_started":
+                await check_started.wait()
+            events.append(event["type"])
+
+        with patch(
+            "src.quality.document_type_quality_checker.DocumentTypeQualityChecker.check_quality_for_type",
+            check_quality_for_type,
+        ):
+            content = await asyncio.wait_for(
+                coordinator._review_and_improve_document(
+                    document_id="wbs",
+                    document_name="Work Breakdown Structure",
+                    document_type="planning",
+                    original_content="# WBS",
+                    user_idea="idea",
+                    dependency_documents={},
+                    agent=MagicMock(),
+                    output_rel_path="p/wbs.md",
+                    project_id="p",
+                    progress_callback=progress_callback,
+                ),
+                timeout=5,
+            )
+
+        assert content == "# WBS"
+        assert events == ["quality_review_started", "quality_review_completed"]
+
+    def test_format_quality_feedback(self):
+        """Test reviewer feedback is rendered for the improver"""
+        text = WorkflowCoordinator._format_quality_feedback(6.5, {
+            "feedback": "Thin {content}",
+            "missing_sections": ["Scope", "Risks"],
+            "weaknesses": ["No estimates"],
+            "priority_improvements": [{"area": "Scope", "issue": "Missing", "suggestion": "Add it"}, "ignored"],
+        })
+
+        assert text.startswith("Quality Review Results:\n- Quality Score: 6.5/10\n- Overall Feedback: Thin {content}\n")
+        assert "- Primary Suggestion: No specific suggestion\n" in text
+        assert text.endswith(
+            "- Missing Sections: Scope, Risks\n"
+            "- Weaknesses:\n  • No estimates\n"
+            "- Priority Improvements:\n  • Scope: Missing\n    → Suggestion: Add it\n"
+        )
+
+    def test_extract_sections(self):
+        """Test only real markdown headings are picked up"""
+        coordinator = WorkflowCoordinator.__new__(WorkflowCoordinator)
+        content = "# Scope\n## Risks \n#\nNot a heading\n####### Too deep\n#NoSpace\n### Budget\r\nEnd"
+
+        assert coordinator._extract_sections(content) == ["Scope", "Risks", "Budget"]
+
+    def test_improved_output(self):
+        """Test improved documents are recorded under their own agent type when one exists"""
+        from src.context.shared_context import AgentType, DocumentStatus
+
+        output = WorkflowCoordinator._improved_output(
+            "requirements_analyst", {"file_path": "p/requirements.md", "quality_score": 80.0}, "# Improved"
+        )
+        assert output.agent_type is AgentType.REQUIREMENTS_ANALYST
+        assert output.status is DocumentStatus.COMPLETE
+        assert (output.content, output.file_path) == ("# Improved", "p/requirements.md")
+        assert output.generated_at is not None
+
+        other = WorkflowCoordinator._improved_output("not_an_agent_type", {}, "# Improved")
+        assert other.agent_type is AgentType.TECHNICAL_DOCUMENTATION
+
+
+@pytest.mark.unit
+class TestLazyAgents:
+    """Test on-demand agent construction"""
+
+    def test_agents_built_on_first_access(self, monkeypatch):
+        """Test agents are constructed once, when their document is first requested"""
+        from unittest.mock import MagicMock
+
+        generic_agent = MagicMock()
+        monkeypatch.setattr(coordinator_module, "GenericDocumentAgent", generic_agent)
+        monkeypatch.setattr(coordinator_module, "QualityReviewerAgent", MagicMock())
+
+        coordinator = WorkflowCoordinator(context_manager=MagicMock(), provider_name="gemini")
+
+        generic_agent.assert_not_called()
+        coordinator_module.QualityReviewerAgent.assert_not_called()
+        assert "wbs" in coordinator.agents
+        assert coordinator.agents["wbs"] is coordinator.agents.get("wbs")
+        generic_agent.assert_called_once()
+        assert coordinator.agents.get("does_not_exist") is None
@@ -0,0 +1,157 @@
+"""
+Unit Tests: Document Catalog
+Fast, isolated tests for catalog loading and dependency resolution
+"""
+import pytest
+from src.config import document_catalog
+from src.config.document_catalog import (
+    DocumentDefinition,
+    load_document_definitions,
+    resolve_dependencies,
+)
+
+
+def make_definition(doc_id, dependencies):
+    """Build a minimal document definition"""
+    return DocumentDefinition(
+        id=doc_id,
+        name=doc_id.title(),
+        prompt_key=None,
+        agent_class="generic",
+        dependencies=dependencies,
+        category=None,
+        description=None,
+        priority=None,
+        owner=None,
+        status=None,
+        audience=None,
+        stage_label=None,
+        stage_notes=None,
+        must_have=None,
+        usage_frequency=None,
+        notes=None,
+    )
+
+
+@pytest.fixture
+def synthetic_catalog(monkeypatch):
+    """Replace the loaded catalog with the given definitions (no quality-rule dependencies)"""
+    def install(dependencies):
+        definitions = {
+            doc_id: make_definition(doc_id, deps) for doc_id, deps in dependencies.items()
+        }
+        monkeypatch.setattr(document_catalog, "_document_definitions_cache", definitions)
+        monkeypatch.setattr(document_catalog, "_load_quality_rules_dependencies", lambda: {})
+        return definitions
+    return install
+
+
+@pytest.mark.unit
+class TestResolveDependencies:
+    """Test resolve_dependencies"""
+
+    def test_dependencies_come_first(self):
+        """Test that every document is ordered after its dependencies"""
+        order = resolve_dependencies(["wbs"])
+
+        assert order[-1] == "wbs"
+        for dep in load_document_definitions()["wbs"].dependencies:
+            assert order.index(dep) < order.index("wbs")
+
+    def test_deep_chain(self, synthetic_catalog):
+        """Test that chains deeper than the recursion limit resolve"""
+        depth = 5000
+        synthetic_catalog({
+            f"doc_{i}": [f"doc_{i - 1}"] if i else [] for i in range(depth)
+        })
+
+        order = resolve_dependencies([f"doc_{depth - 1}"])
+
+        assert order == [f"doc_{i}" for i in range(depth)]
+
+    def test_circular_dependency(self, synthetic_catalog):
+        """Test that cycles are reported with their path"""
+        synthetic_catalog({"a": ["b"], "b": ["c"], "c": ["a"]})
+
+        with pytest.raises(ValueError, match="a -> b -> c -> a"):
+            resolve_dependencies(["a"])
+
+    def test_cycle_outside_selection(self, synthetic_catalog):
+        """Test that a cycle elsewhere in the catalog does not block other selections"""
+        synthetic_catalog({"a": ["b"], "b": ["a"], "c": ["d"], "d": []})
+
+        assert resolve_dependencies(["c"]) == ["d", "c"]
+
+    def test_graph_built_once_per_catalog(self, synthetic_catalog, monkeypatch):
+        """Test that repeated resolutions reuse the cached dependency graph"""
+        synthetic_catalog({"a": [], "b": ["a"], "c": ["b"]})
+        calls = []
+        get_all_dependencies = document_catalog.get_all_dependencies
+        monkeypatch.setattr(
+            document_catalog,
+            "get_all_dependencies",
+            lambda doc_id: calls.append(doc_id) or get_all_dependencies(doc_id),
+        )
+
+        assert resolve_dependencies(["c"]) == ["a", "b", "c"]
+        assert resolve_dependencies(["b"]) == ["a", "b"]
+        assert sorted(calls) == ["a", "b", "c"]
+
+    def test_all_dependencies_computed_once(self, synthetic_catalog, monkeypatch):
+        """Test that combined dependencies are memoized per catalog and returned as copies"""
+        synthetic_catalog({"a": [], "b": ["a"]})
+        calls = []
+        monkeypatch.setattr(
+            document_catalog,
+            "_load_quality_rules_dependencies",
+            lambda: calls.append(True) or {"b": ["c", "a"]},
+        )
+
+        first = document_catalog.get_all_dependencies("b")
+        first.append("mutated")
+
+        assert document_catalog.get_all_dependencies("b") == ["a", "c"]
+        assert len(calls) == 1
+
+        synthetic_catalog({"a": [], "b": []})
+        assert document_catalog.get_all_dependencies("b") == []
+
+    def test_unknown_document(self):
+        """Test that unknown IDs are rejected"""
+        with pytest.raises(ValueError, match="Unknown document IDs"):
+            resolve_dependencies(["does_not_exist"])
+
+
+@pytest.mark.unit
+class TestLoadDocumentDefinitions:
+    """Test load_document_definitions"""
+
+    def test_dependencies_deduplicated_in_order(self, temp_dir, monkeypatch):
+        """Test that dependencies keep their file order without duplicates"""
+        catalog_file = temp_dir / "document_definitions.json"
+        catalog_file.write_text(
+            '{"documents": [{"id": "wbs", "dependencies": ["b", "a", "", "b", "c"]}]}',
+            encoding="utf-8",
+        )
+        monkeypatch.setenv(document_catalog.DOCUMENT_CONFIG_ENV, str(catalog_file))
+        document_catalog.reload_catalog()
+        try:
+            definition = load_document_definitions()["wbs"]
+        finally:
+            monkeypatch.delenv(document_catalog.DOCUMENT_CONFIG_ENV)
+            document_catalog.reload_catalog()
+
+        assert definition.dependencies == ("b", "a", "c")
+
+    def test_warm_precomputes_catalog(self, synthetic_catalog, monkeypatch):
+        """Test that warm() leaves nothing to compute for the first resolution"""
+        synthetic_catalog({"a": [], "b": ["a"]})
+        document_catalog.warm()
+        monkeypatch.setattr(
+            document_catalog,
+            "get_all_dependencies",
+            lambda doc_id: pytest.fail("dependency graph rebuilt after warm()"),
+        )
+
+        assert document_catalog.list_document_ids() == ["a", "b"]
+        assert resolve_dependencies(["b"]) == ["a", "b"]
@@ -110,3 +110,19 @@ class TestErrorHandler:
         result = safe_execute(test_func, default_value="default")
         assert result == "default"
 
+    
+    def test_retry_decorator_delay_cap_and_jitter(self, monkeypatch):
+        """Test that delays are capped by max_delay and randomized within [delay/2, delay]"""
+        sleeps = []
+        monkeypatch.setattr("src.utils.error_handler.time.sleep", sleeps.append)
+        
+        @retry_with_backoff(max_retries=5, initial_delay=1.0, backoff_factor=4.0, max_delay=5.0, jitter=True)
+        def test_func():
+            raise ConnectionError("Temporary failure")
+        
+        with pytest.raises(ConnectionError):
+            test_func()
+        
+        assert len(sleeps) == 4
+        for sleep_for, delay in zip(sleeps, [1.0, 4.0, 5.0, 5.0]):
+            assert delay / 2 <= sleep_for <= delay
@@ -26,6 +26,14 @@ class TestFileManager:
         read_content = file_manager.read_file("test.txt")
         assert read_content == content
     
+    def test_open_stream(self, file_manager):
+        """Test writing a file incrementally"""
+        with file_manager.open_stream("nested/streamed.md") as f:
+            f.write("# Title\n")
+            f.write("Body")
+        
+        assert file_manager.read_file("nested/streamed.md") == "# Title\nBody"
+    
     def test_file_exists(self, file_manager):
         """Test file existence check"""
         assert not file_manager.file_exists("nonexistent.txt")
@@ -56,3 +64,18 @@ class TestFileManager:
         file_manager.write_file("test.txt", "content")
         assert (new_dir / "test.txt").exists()
 
+    
+    def test_resolve_path_matches_write_file(self, file_manager):
+        """Test resolve_path returns the path write_file writes to"""
+        file_path = file_manager.write_file("nested/doc.md", "content")
+        
+        assert str(file_manager.resolve_path("nested/doc.md").absolute()) == file_path
+    
+    def test_get_file_manager_shared_per_base_dir(self, temp_dir):
+        """Test get_file_manager returns one instance per base directory"""
+        from src.utils.file_manager import get_file_manager
+        
+        shared = get_file_manager(str(temp_dir / "a"))
+        
+        assert get_file_manager(temp_dir / "a") is shared
+        assert get_file_manager(str(temp_dir / "b")) is not shared
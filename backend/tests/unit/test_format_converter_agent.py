@@ -77,6 +77,24 @@ class TestFormatConverterAgent:
         assert "doc1.md" in results
         assert "doc2.md" in results
     
+    def test_convert_all_documents_renders_html_once(self, mock_llm_provider, file_manager):
+        """Test HTML and PDF output of a document share one Markdown rendering"""
+        from unittest.mock import patch
+        
+        agent = FormatConverterAgent(
+            llm_provider=mock_llm_provider,
+            file_manager=file_manager
+        )
+        
+        with patch.object(agent, "markdown_to_html", wraps=agent.markdown_to_html) as render, \
+                patch.object(agent, "html_to_pdf", return_value="docs/doc1/doc1.pdf") as to_pdf:
+            results = agent.convert_all_documents({"doc1.md": "# Document 1\n\nContent 1"}, ["html", "pdf"])
+        
+        assert render.call_count == 1
+        assert "Document 1" in to_pdf.call_args.args[0]
+        assert results["doc1.md"]["html"]["status"] == "success"
+        assert results["doc1.md"]["pdf"]["status"] == "success"
+    
     def test_markdown_to_pdf(self, mock_llm_provider, file_manager):
         """Test Markdown to PDF conversion"""
         agent = FormatConverterAgent(
@@ -136,3 +154,18 @@ class TestFormatConverterAgent:
         except (ImportError, Exception):
             pass  # DOCX might not be available
 
+    
+    def test_classify_markdown_lines(self):
+        """Test Markdown line classification used for DOCX output"""
+        markdown = "# Title\n\n## Section\n- Item 1\n* Item 2\nPlain text"
+        
+        blocks = FormatConverterAgent._classify_markdown_lines(markdown)
+        
+        assert blocks == [
+            ("Heading 1", "Title"),
+            (None, ""),
+            ("Heading 2", "Section"),
+            ("List Bullet", "Item 1"),
+            ("List Bullet", "Item 2"),
+            (None, "Plain text"),
+        ]
@@ -0,0 +1,122 @@
+"""
+Unit Tests: generation tasks
+Fast, isolated tests for the shared generation event loop
+"""
+import asyncio
+
+import pytest
+from src.tasks.generation_tasks import run_on_generation_loop
+
+
+@pytest.mark.unit
+class TestGenerationLoop:
+    """Test run_on_generation_loop"""
+
+    def test_jobs_share_one_loop(self):
+        """Test consecutive jobs run on the same background loop"""
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = run_on_generation_loop(current_loop())
+        second = run_on_generation_loop(current_loop())
+
+        assert first is second
+        assert first.is_running()
+
+    def test_uvloop_used_when_installed(self, monkeypatch):
+        """Test the generation loop comes from uvloop when available, asyncio otherwise"""
+        from unittest.mock import MagicMock
+        from src.tasks import generation_tasks
+
+        fake_uvloop = MagicMock()
+        monkeypatch.setattr(generation_tasks, "uvloop", fake_uvloop)
+        assert generation_tasks._new_event_loop() is fake_uvloop.new_event_loop.return_value
+
+        monkeypatch.setattr(generation_tasks, "uvloop", None)
+        loop = generation_tasks._new_event_loop()
+        try:
+            assert isinstance(loop, asyncio.AbstractEventLoop)
+        finally:
+            loop.close()
+
+    def test_thread_pool_sizes_from_settings(self, monkeypatch):
+        """Test pool sizes default from the CPU count and can be overridden"""
+        import os
+        from src.config.settings import get_settings
+
+        monkeypatch.delenv("AGENT_IO_WORKERS", raising=False)
+        monkeypatch.setenv("GENERATION_THREADS", "3")
+        monkeypatch.setattr(os, "cpu_count", lambda: 2)
+        settings = get_settings()
+
+        assert settings.agent_io_workers == 6
+        assert settings.generation_threads == 3
+
+    def test_exception_reaches_caller(self):
+        """Test a failing job raises in the calling thread"""
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            run_on_generation_loop(fail())
+
+    def test_interrupted_wait_cancels_job(self, monkeypatch):
+        """Test an interrupted caller (e.g. a Celery soft time limit) cancels the job on the loop"""
+        import threading
+        from src.tasks import generation_tasks
+
+        class Interrupted(BaseException):
+            pass
+
+        started = threading.Event()
+        cancelled = threading.Event()
+
+        async def job():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        run_coroutine_threadsafe = asyncio.run_coroutine_threadsafe
+
+        def submit(coro, loop):
+            future = run_coroutine_threadsafe(coro, loop)
+
+            def interrupted_result(timeout=None):
+                assert started.wait(timeout=5)
+                raise Interrupted()
+
+            future.result = interrupted_result
+            return future
+
+        monkeypatch.setattr(generation_tasks.asyncio, "run_coroutine_threadsafe", submit)
+
+        with pytest.raises(Interrupted):
+            run_on_generation_loop(job())
+
+        assert cancelled.wait(timeout=5)
+
+
+@pytest.mark.unit
+class TestRunDocumentGeneration:
+    """Test run_document_generation_sync"""
+
+    def test_results_not_written_twice(self, monkeypatch):
+        """Test the final status update does not re-send the results the coordinator stored"""
+        from unittest.mock import AsyncMock, MagicMock
+        from src.tasks import generation_tasks
+
+        context_manager = MagicMock()
+        coordinator = MagicMock()
+        coordinator.async_generate_all_docs = AsyncMock(return_value={"files": {"a": {"content": "# A"}}})
+        monkeypatch.setattr(generation_tasks, "ContextManager", lambda: context_manager)
+        monkeypatch.setattr(generation_tasks, "WorkflowCoordinator", lambda **kwargs: coordinator)
+        monkeypatch.setattr(generation_tasks, "send_websocket_notification", MagicMock())
+
+        result = generation_tasks.run_document_generation_sync("project_1", "idea", ["a"])
+
+        assert result["files_count"] == 1
+        final_update = context_manager.update_project_status.call_args_list[-1]
+        assert final_update.kwargs == {"project_id": "project_1", "status": "complete"}
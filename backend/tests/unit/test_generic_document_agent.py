@@ -7,7 +7,7 @@ from pathlib import Path
 from unittest.mock import Mock, AsyncMock, patch
 
 from src.agents.generic_document_agent import GenericDocumentAgent
-from src.config.document_catalog import DocumentDefinition
+from src.config.document_catalog import DocumentDefinition, load_document_definitions
 
 
 @pytest.mark.unit
@@ -181,3 +181,288 @@ class TestGenericDocumentAgent:
                 {}
             )
 
+
+    def test_specialized_prompt_reused_for_same_inputs(self):
+        """Test that a specialized prompt is built once per distinct set of inputs"""
+        from src.utils.prompt_registry import get_prompt_for_document
+
+        deps = {"requirements": {"name": "Requirements", "content": "# Requirements"}}
+        with patch("prompts.system_prompts.get_wbs_prompt", return_value="WBS prompt") as mock_builder:
+            first = get_prompt_for_document("wbs", "Reuse idea", deps)
+            second = get_prompt_for_document("wbs", "Reuse idea", deps)
+            get_prompt_for_document("wbs", "Another idea", deps)
+
+        assert first == second == "WBS prompt"
+        assert mock_builder.call_count == 2
+
+    def test_cached_prompt_skips_summary_extraction(self):
+        """Test that a prompt cache hit does not rebuild the requirements summary"""
+        from src.utils import prompt_registry
+
+        deps = {"requirements": {"name": "Requirements", "content": "# Summary reuse"}}
+        with patch.object(
+            prompt_registry,
+            "_extract_requirements_summary",
+            wraps=prompt_registry._extract_requirements_summary,
+        ) as extract:
+            first = prompt_registry.get_prompt_for_document("wbs", "Summary idea", deps)
+            second = prompt_registry.get_prompt_for_document("wbs", "Summary idea", deps)
+            assert prompt_registry.get_prompt_for_document("unknown_doc", "Summary idea", deps) is None
+
+        assert first == second
+        assert extract.call_count == 1
+
+
+    def test_split_system_prompt(self, mock_llm_provider, temp_dir):
+        """Test that the static WBS instructions are sent as a separate system prompt"""
+        from prompts.system_prompts import get_wbs_prompt, get_wbs_system_prompt
+
+        agent = GenericDocumentAgent(
+            definition=load_document_definitions()["wbs"],
+            base_output_dir=str(temp_dir),
+            api_key="test-key",
+        )
+        agent.llm_provider = mock_llm_provider
+
+        prompt = get_wbs_prompt({"user_idea": "Create a todo app"}, "Charter", "PM plan")
+        user_prompt, llm_kwargs = agent._split_system_prompt(prompt)
+
+        assert llm_kwargs == {"system_prompt": get_wbs_system_prompt()}
+        assert user_prompt.startswith("=== REQUIREMENTS CONTEXT ===")
+        assert user_prompt.index("Create a todo app") < user_prompt.index("PM plan")
+
+    def test_batch_generate_splits_system_prompt(self, temp_dir, monkeypatch):
+        """Test batch items are sent like generate(): system prompt split out, same temperature and cache key"""
+        from prompts.system_prompts import get_wbs_system_prompt
+
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        agent = GenericDocumentAgent(
+            definition=load_document_definitions()["wbs"],
+            base_output_dir=str(temp_dir),
+            api_key="test-key",
+        )
+        agent.provider_name, agent.model_name = "mock", "mock-model"
+        agent.llm_provider = Mock()
+        agent.llm_provider.supports_batch = Mock(return_value=True)
+        agent.llm_provider.submit_batch = Mock(return_value="batch-1")
+        agent.llm_provider.poll_batch = Mock(return_value=["# WBS one", "# WBS two"])
+        agent.default_temperature = 0.3
+        item = {"user_idea": "Create a todo app", "dependency_documents": {}}
+
+        results = agent.batch_generate([item, {**item, "user_idea": "Create a chat app"}])
+
+        assert results == ["# WBS one", "# WBS two"]
+        prompts = agent.llm_provider.submit_batch.call_args.args[0]
+        assert not prompts[0].startswith(get_wbs_system_prompt())
+        assert agent.llm_provider.submit_batch.call_args.kwargs["system_prompt"] == get_wbs_system_prompt()
+        assert agent.llm_provider.submit_batch.call_args.kwargs["temperature"] == 0.3
+
+        prompt, llm_kwargs = agent._split_system_prompt(agent._build_prompt(**item))
+        llm_kwargs["temperature"] = agent.default_temperature
+        cache = Mock(get=Mock(return_value=None))
+        with patch("src.agents.base_agent.get_llm_cache", return_value=cache):
+            monkeypatch.delenv("AUTO_REPO_NO_CACHE")
+            agent.batch_generate([item])
+        assert cache.get.call_args.args[0] == agent._llm_cache_key(prompt, **llm_kwargs)
+
+    def test_split_system_prompt_without_static_prefix(self, mock_llm_provider, temp_dir):
+        """Test that prompts without a registered system prompt are left unchanged"""
+        agent = GenericDocumentAgent(
+            definition=load_document_definitions()["project_charter"],
+            base_output_dir=str(temp_dir),
+            api_key="test-key",
+        )
+        agent.llm_provider = mock_llm_provider
+
+        assert agent._split_system_prompt("Some prompt") == ("Some prompt", {})
+
+    @pytest.mark.asyncio
+    async def test_generate_and_save_streams_to_file(self, temp_dir, monkeypatch):
+        """Test streamed generation writes chunks to the output file and returns the full text"""
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        agent = GenericDocumentAgent(
+            definition=load_document_definitions()["wbs"],
+            base_output_dir=str(temp_dir),
+            api_key="test-key",
+        )
+        agent.llm_provider = Mock()
+        agent.llm_provider.generate_stream = Mock(return_value=iter(["# Work ", "Breakdown\n", "Body"]))
+        agent.rate_limiter = Mock()
+
+        with patch("src.agents.base_agent.get_llm_cache"):
+            result = await agent.generate_and_save(
+                user_idea="Create a todo app",
+                dependency_documents={},
+                output_rel_path="test_project/wbs.md",
+                stream=True,
+            )
+
+        assert result["content"] == "# Work Breakdown\nBody"
+        assert Path(result["file_path"]).read_text() == result["content"]
+
+    @pytest.mark.asyncio
+    async def test_streamed_response_is_cleaned_before_caching(self, temp_dir, monkeypatch):
+        """Test a fenced streamed response is cleaned in the file and in the exact cache"""
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        agent = GenericDocumentAgent(
+            definition=load_document_definitions()["wbs"],
+            base_output_dir=str(temp_dir),
+            api_key="test-key",
+        )
+        agent.llm_provider = Mock()
+        agent.llm_provider.generate_stream = Mock(
+            return_value=iter(["```markdown\n", "# Work Breakdown\n", "```"])
+        )
+        agent.rate_limiter = Mock()
+        agent._llm_cache_store = Mock()
+
+        result = await agent.generate_and_save(
+            user_idea="Create a todo app",
+            dependency_documents={},
+            output_rel_path="test_project/wbs.md",
+            stream=True,
+        )
+
+        assert result["content"] == "# Work Breakdown"
+        assert Path(result["file_path"]).read_text() == "# Work Breakdown"
+        assert agent._llm_cache_store.call_args.args[1] == "# Work Breakdown"
+
+    @pytest.mark.asyncio
+    async def test_failed_stream_falls_back_to_call(self, temp_dir, monkeypatch):
+        """Test a stream that fails is retried without streaming and overwrites the file"""
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        agent = GenericDocumentAgent(
+            definition=load_document_definitions()["wbs"],
+            base_output_dir=str(temp_dir),
+            api_key="test-key",
+        )
+
+        async def broken_stream(prompt, **kwargs):
+            yield "# Part"
+            raise ConnectionError("stream dropped")
+
+        agent._async_stream_llm = broken_stream
+        agent._async_call_llm = AsyncMock(return_value="# Work Breakdown")
+
+        result = await agent.generate_and_save(
+            user_idea="Create a todo app",
+            dependency_documents={},
+            output_rel_path="test_project/wbs.md",
+            stream=True,
+        )
+
+        assert result["content"] == "# Work Breakdown"
+        assert Path(result["file_path"]).read_text() == "# Work Breakdown"
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_early_stops_producer(self, temp_dir):
+        """Test that a consumer stopping early does not wait for the whole provider stream"""
+        import asyncio
+        import threading
+
+        agent = GenericDocumentAgent(
+            definition=load_document_definitions()["wbs"],
+            base_output_dir=str(temp_dir),
+            api_key="test-key",
+        )
+        release = threading.Event()
+        closed = threading.Event()
+
+        def endless_stream(*args, **kwargs):
+            try:
+                while True:
+                    yield "chunk"
+                    release.wait(5)
+            finally:
+                closed.set()
+
+        agent._stream_llm = endless_stream
+
+        stream = agent._async_stream_llm("prompt")
+        assert await stream.__anext__() == "chunk"
+        await asyncio.wait_for(stream.aclose(), timeout=1)
+        release.set()
+
+        assert await asyncio.to_thread(closed.wait, 5)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self, temp_dir, monkeypatch):
+        """Test that identical in-flight generations are coalesced into one LLM call"""
+        import asyncio
+
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        agents = [
+            GenericDocumentAgent(
+                definition=load_document_definitions()["wbs"],
+                base_output_dir=str(temp_dir),
+                api_key="test-key",
+            )
+            for _ in range(2)
+        ]
+        calls = []
+
+        async def slow_llm(prompt, **kwargs):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return "# Work Breakdown"
+
+        for agent in agents:
+            agent._async_call_llm = slow_llm
+
+        results = await asyncio.gather(
+            *(agent.async_generate("Create a todo app", {}) for agent in agents)
+        )
+
+        assert results == ["# Work Breakdown", "# Work Breakdown"]
+        assert len(calls) == 1
+        assert not GenericDocumentAgent._inflight_llm_calls
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_over_to_waiting_request(self, temp_dir):
+        """Test a waiting request retries the call instead of failing when the leader is cancelled"""
+        import asyncio
+
+        agent = GenericDocumentAgent(
+            definition=load_document_definitions()["wbs"],
+            base_output_dir=str(temp_dir),
+            api_key="test-key",
+        )
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "# Work Breakdown"
+
+        leader = asyncio.create_task(agent._coalesce_inflight("key", slow_call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(agent._coalesce_inflight("key", slow_call))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await follower == "# Work Breakdown"
+        assert leader.cancelled()
+        assert len(calls) == 2
+        assert not GenericDocumentAgent._inflight_llm_calls
+
+    def test_condense_trims_dependency_text(self, mock_llm_provider, temp_dir):
+        """Test that condense=True caps long dependency documents in the specialized prompt"""
+        deps = {
+            "requirements": {"name": "Requirements", "content": "Requirement sentence. " * 2000},
+            "project_charter": {"name": "Project Charter", "content": "Short charter."},
+        }
+        prompts = {}
+        for condense in (False, True):
+            agent = GenericDocumentAgent(
+                definition=load_document_definitions()["wbs"],
+                base_output_dir=str(temp_dir),
+                api_key="test-key",
+                condense=condense,
+            )
+            agent.llm_provider = mock_llm_provider
+            prompts[condense] = agent._build_prompt("Create a todo app", deps)
+
+        assert len(prompts[True]) < len(prompts[False])
+        assert "=== REQUIREMENTS CONTEXT ===" in prompts[True]
+        assert "Short charter." in prompts[True]
+        assert "Create a todo app" in prompts[True]
@@ -0,0 +1,59 @@
+"""
+Unit Tests: json_utils
+Fast, isolated tests for JSON serialization helpers
+"""
+import pytest
+from src.utils import json_utils
+
+
+@pytest.mark.unit
+class TestJsonUtils:
+    """Test json_utils helpers"""
+    
+    def test_round_trip(self):
+        """Test dumps/loads round trip"""
+        data = {"doc": {"html": {"status": "success", "file_path": None}}}
+        
+        assert json_utils.loads(json_utils.dumps(data)) == data
+    
+    def test_dumps_is_compact(self):
+        """Test output has no extra whitespace"""
+        assert json_utils.dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+    
+    def test_dumps_sort_keys(self):
+        """Test sorted keys produce stable output"""
+        assert json_utils.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+    
+    def test_dumps_non_json_values(self):
+        """Test non-JSON values are stringified"""
+        from pathlib import Path
+        
+        assert json_utils.loads(json_utils.dumps({"path": Path("docs")})) == {"path": "docs"}
+    
+    def test_dumpb_matches_dumps(self):
+        """Test the bytes serializer produces the UTF-8 encoding of dumps, with and without orjson"""
+        data = {"doc": "Ünïcode", 1: [None, True]}
+        
+        assert json_utils.dumpb(data) == json_utils.dumps(data).encode("utf-8")
+        assert json_utils.loads(json_utils.dumpb(data)) == {"doc": "Ünïcode", "1": [None, True]}
+    
+    def test_dumpb_without_orjson(self, monkeypatch):
+        """Test the standard library fallback returns compact bytes"""
+        monkeypatch.setattr(json_utils, "orjson", None)
+        
+        assert json_utils.dumpb({"a": [1, 2]}) == b'{"a":[1,2]}'
+    
+    def test_load_file(self, temp_dir):
+        """Test parsing a JSON file"""
+        path = temp_dir / "data.json"
+        path.write_text('{"documents": [{"id": "wbs"}]}', encoding="utf-8")
+        
+        assert json_utils.load_file(path) == {"documents": [{"id": "wbs"}]}
+    
+    def test_load_file_without_orjson(self, temp_dir, monkeypatch):
+        """Test the standard library fallback"""
+        path = temp_dir / "data.json"
+        path.write_text('{"a": 1}', encoding="utf-8")
+        monkeypatch.setattr(json_utils, "orjson", None)
+        
+        assert json_utils.load_file(path) == {"a": 1}
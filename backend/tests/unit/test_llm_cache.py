@@ -0,0 +1,88 @@
+"""
+Unit Tests: LLMCache
+Fast, isolated tests for the persistent LLM response cache
+"""
+import pytest
+from src.utils.llm_cache import LLMCache, make_cache_key, cache_disabled
+
+
+@pytest.mark.unit
+class TestLLMCache:
+    """Test LLMCache class"""
+    
+    def test_set_and_get(self, tmp_path):
+        """Test stored responses are returned on a hit"""
+        cache = LLMCache(path=str(tmp_path / "llm.sqlite"))
+        key = make_cache_key("prompt", "gemini-2.0-flash", "gemini")
+        
+        assert cache.get(key) is None
+        cache.set(key, "# Requirements\n\nContent", model="gemini-2.0-flash")
+        assert cache.get(key) == "# Requirements\n\nContent"
+    
+    def test_ttl_expiry(self, tmp_path):
+        """Test entries older than the TTL are treated as misses"""
+        cache = LLMCache(path=str(tmp_path / "llm.sqlite"), ttl=-1)
+        cache.set("key", "value")
+        
+        assert cache.get("key") is None
+    
+    def test_key_depends_on_model_and_provider(self):
+        """Test keys differ for output-affecting parameters"""
+        key = make_cache_key("prompt", "model-a", "gemini")
+        
+        assert key == make_cache_key("prompt", "model-a", "gemini")
+        assert key != make_cache_key("prompt", "model-b", "gemini")
+        assert key != make_cache_key("prompt", "model-a", "openai")
+    
+    def test_key_depends_on_system_prompt_and_prompt_version(self):
+        """Test a system prompt or prompt version bump changes the key"""
+        key = make_cache_key("prompt", "model-a", "gemini", system_prompt="static", prompt_version=1)
+        
+        assert key != make_cache_key("prompt", "model-a", "gemini", prompt_version=1)
+        assert key != make_cache_key("prompt", "model-a", "gemini", system_prompt="static", prompt_version=2)
+    
+    def test_key_depends_on_sampling_settings(self):
+        """Test temperature and max_tokens change the key"""
+        key = make_cache_key("prompt", "model-a", "gemini", temperature=0.3, max_tokens=8192)
+        
+        assert key != make_cache_key("prompt", "model-a", "gemini", temperature=0.7, max_tokens=8192)
+        assert key != make_cache_key("prompt", "model-a", "gemini", temperature=0.3, max_tokens=1024)
+    
+    def test_agent_key_resolves_sampling_defaults(self):
+        """Test the agent key treats unset temperature/max_tokens as the agent defaults"""
+        from src.agents.generic_document_agent import GenericDocumentAgent
+        
+        agent = GenericDocumentAgent.__new__(GenericDocumentAgent)
+        agent.provider_name, agent.model_name = "mock", "mock-model"
+        agent.default_temperature = 0.3
+        
+        key = agent._llm_cache_key("prompt")
+        
+        assert key == agent._llm_cache_key("prompt", temperature=0.3, max_tokens=8192)
+        assert key != agent._llm_cache_key("prompt", temperature=0.0)
+        assert key != agent._llm_cache_key("prompt", max_tokens=2048)
+    
+    def test_agent_key_uses_phase_model(self, monkeypatch):
+        """Test a phase model override changes the key, matching the model the call resolves"""
+        from src.agents.generic_document_agent import GenericDocumentAgent
+        
+        monkeypatch.setenv("OPENAI_PHASE2_MODEL", "gpt-4o")
+        monkeypatch.delenv("OPENAI_PHASE1_MODEL", raising=False)
+        monkeypatch.delenv("OPENAI_DEFAULT_MODEL", raising=False)
+        agent = GenericDocumentAgent.__new__(GenericDocumentAgent)
+        agent.agent_name = "GenericDocumentAgent"
+        agent.provider_name, agent.model_name = "openai", "gpt-4o-mini"
+        agent.default_temperature = 0.3
+        
+        assert agent._resolve_model(phase_number=2) == "gpt-4o"
+        assert agent._llm_cache_key("prompt", phase_number=2) == agent._llm_cache_key("prompt", model="gpt-4o")
+        assert agent._llm_cache_key("prompt", phase_number=2) != agent._llm_cache_key("prompt")
+        assert agent._llm_cache_key("prompt", phase_number=1) == agent._llm_cache_key("prompt")
+    
+    def test_cache_disabled_env(self, monkeypatch):
+        """Test AUTO_REPO_NO_CACHE turns the cache off"""
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        assert cache_disabled() is True
+        
+        monkeypatch.delenv("AUTO_REPO_NO_CACHE")
+        assert cache_disabled() is False
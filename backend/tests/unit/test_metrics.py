@@ -0,0 +1,46 @@
+"""
+Unit Tests: ParallelExecutionMetrics
+Fast, isolated tests for workflow execution metrics
+"""
+import pytest
+from src.coordination.metrics import ParallelExecutionMetrics
+
+
+@pytest.mark.unit
+class TestParallelExecutionMetrics:
+    """Test ParallelExecutionMetrics class"""
+
+    def test_running_totals_match_recorded_documents(self, monkeypatch):
+        """Test the summary's sequential time and wave size come from running totals"""
+        from src.coordination import metrics as metrics_module
+
+        clock = iter([0.0, 1.0, 2.0, 4.0, 5.0, 10.0, 10.0])
+        monkeypatch.setattr(metrics_module.time, "time", lambda: next(clock))
+        metrics = ParallelExecutionMetrics("p")  # t=0
+
+        metrics.record_document_start("a")  # t=1
+        metrics.record_document_complete("a")  # t=2 (1s)
+        metrics.record_document_start("b")  # t=4
+        metrics.record_document_complete("b", success=False)  # t=5 (1s)
+        metrics.record_wave_execution(1, ["a", "b"], 4.0, 50.0)
+
+        summary = metrics.get_summary()  # t=10
+
+        assert summary["sequential_time_estimate"] == pytest.approx(2.0)
+        assert summary["average_wave_size"] == 2
+        assert (summary["completed_documents"], summary["failed_documents"]) == (1, 1)
+
+    def test_restarted_document_counted_once(self, monkeypatch):
+        """Test a document recorded twice only contributes its latest duration"""
+        from src.coordination import metrics as metrics_module
+
+        clock = iter([0.0, 1.0, 3.0, 4.0, 5.0])
+        monkeypatch.setattr(metrics_module.time, "time", lambda: next(clock))
+        metrics = ParallelExecutionMetrics("p")
+
+        metrics.record_document_start("a")
+        metrics.record_document_complete("a")  # 2s
+        metrics.record_document_start("a")
+        metrics.record_document_complete("a")  # 1s
+
+        assert metrics.sequential_time == pytest.approx(1.0)
@@ -179,3 +179,99 @@ class TestParallelExecutor:
         assert failed[0][0] == "fail"
         assert isinstance(failed[0][1], ValueError)
 
+
+
+@pytest.mark.unit
+class TestAsyncParallelExecutor:
+    """Test AsyncParallelExecutor class"""
+
+    @pytest.mark.asyncio
+    async def test_as_completed_streams_results(self):
+        """Test tasks are yielded as they finish and dependents do not wait for unrelated stragglers"""
+        import asyncio
+        from src.utils.async_parallel_executor import AsyncParallelExecutor
+
+        executor = AsyncParallelExecutor()
+
+        async def work(value, delay=0):
+            await asyncio.sleep(delay)
+            return value
+
+        executor.add_task("slow", work("slow", 0.2))
+        executor.add_task("a", work("a"))
+        executor.add_task("b", work("b"), dependencies=["a"])
+
+        order = [task_id async for task_id, _ in executor.as_completed()]
+
+        assert order == ["a", "b", "slow"]
+
+    @pytest.mark.asyncio
+    async def test_stopping_early_closes_unstarted_coroutines(self):
+        """Test closing the stream early leaves no never-awaited task coroutines behind"""
+        import asyncio
+        import inspect
+        from src.utils.async_parallel_executor import AsyncParallelExecutor
+
+        executor = AsyncParallelExecutor(max_workers=1)
+
+        async def work(value, delay=0):
+            await asyncio.sleep(delay)
+            return value
+
+        executor.add_task("a", work("a"))
+        executor.add_task("running", work("running", 1))
+        executor.add_task("waiting", work("waiting"))  # Never gets the single worker slot
+        executor.add_task("b", work("b"), dependencies=["a"])
+
+        stream = executor.as_completed()
+        assert (await stream.__anext__())[0] == "a"
+        await stream.aclose()
+        await asyncio.sleep(0)  # Let the cancelled running task unwind
+
+        for task in executor.tasks.values():
+            assert inspect.getcoroutinestate(task.coro) == inspect.CORO_CLOSED
+
+    @pytest.mark.asyncio
+    async def test_failed_dependency_blocks_dependents(self):
+        """Test dependents of a failed task are reported failed without running"""
+        from src.utils.async_parallel_executor import AsyncParallelExecutor, TaskStatus as AsyncTaskStatus
+
+        executor = AsyncParallelExecutor()
+        ran = []
+
+        async def fail():
+            raise ValueError("boom")
+
+        async def dependent():
+            ran.append("dependent")
+
+        executor.add_task("fail", fail())
+        executor.add_task("dependent", dependent(), dependencies=["fail"])
+
+        results = await executor.execute()
+
+        assert results["fail"].status is AsyncTaskStatus.FAILED
+        assert isinstance(results["fail"].error, ValueError)
+        assert results["dependent"].status is AsyncTaskStatus.FAILED
+        assert results["dependent"].value is None
+        assert ran == []
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_task_results(self):
+        """Test execute reports status and value together, even for None results"""
+        from src.utils.async_parallel_executor import AsyncParallelExecutor, TaskStatus as AsyncTaskStatus
+
+        executor = AsyncParallelExecutor()
+
+        async def work(value):
+            return value
+
+        executor.add_task("value", work(42))
+        executor.add_task("none", work(None))
+
+        results = await executor.execute()
+
+        assert results["value"].status is AsyncTaskStatus.COMPLETE
+        assert results["value"].value == 42
+        assert results["none"].status is AsyncTaskStatus.COMPLETE
+        assert results["none"].error is None
@@ -107,4 +107,71 @@ Project constraints.
         
         assert "overall_score" in result
         assert result["weights"] == custom_weights
+    
+    def test_default_weights_not_shared(self):
+        """Test reports get their own copy of the default weights"""
+        from src.quality.quality_checker import DEFAULT_WEIGHTS, QualityChecker
+        
+        result = QualityChecker().check_quality("Some content for the default weights.")
+        result["weights"]["word_count"] = 1.0
+        
+        assert DEFAULT_WEIGHTS["word_count"] == 0.2
+
+
 
+@pytest.mark.unit
+class TestDocumentTypeQualityChecker:
+    """Test DocumentTypeQualityChecker requirement lookups"""
+    
+    def test_requirements_lookup_cached_across_instances(self):
+        """Test requirements are resolved once per type and returned as independent copies"""
+        from src.quality.document_type_quality_checker import DocumentTypeQualityChecker
+        
+        DocumentTypeQualityChecker._lookup_requirements.cache_clear()
+        first = DocumentTypeQualityChecker().get_requirements_for_type("Work Breakdown Structure")
+        first["min_words"] = -1
+        second = DocumentTypeQualityChecker().get_requirements_for_type("Work Breakdown Structure")
+        
+        assert second["min_words"] != -1
+        assert DocumentTypeQualityChecker._lookup_requirements.cache_info().hits == 1
+    
+    def test_checklist_for_agent(self):
+        """Test checklist lookups by AgentType"""
+        from src.context.shared_context import AgentType
+        from src.quality.document_type_quality_checker import DocumentTypeQualityChecker
+        
+        checker = DocumentTypeQualityChecker()
+        checklist = checker.get_checklist_for_agent(AgentType.REQUIREMENTS_ANALYST)
+        
+        assert checklist and all(pattern.startswith("^#+") for pattern in checklist)
+        assert checker.get_checklist_for_agent(AgentType.REQUIREMENTS_ANALYST) is checklist
+    
+    def test_quality_result_cached_by_content(self):
+        """Test unchanged documents reuse their quality report and custom weights bypass the cache"""
+        from unittest.mock import patch
+        from src.quality.document_type_quality_checker import DocumentTypeQualityChecker
+        
+        checker = DocumentTypeQualityChecker()
+        content = "# Project Overview\n\nA small cached document."
+        with patch.object(
+            DocumentTypeQualityChecker, "_run_quality_check", wraps=checker._run_quality_check
+        ) as run_check:
+            first = checker.check_quality_for_type(content, "wbs_cache_test")
+            first["overall_score"] = -1
+            second = DocumentTypeQualityChecker().check_quality_for_type(content, "wbs_cache_test")
+            checker.check_quality_for_type(content + " changed", "wbs_cache_test")
+            checker.check_quality_for_type(content, "wbs_cache_test", weights={"word_count": 0.5, "completeness": 0.5, "readability": 0.0})
+        
+        assert second["overall_score"] != -1
+        assert run_check.call_count == 3
+    
+    def test_content_digest_without_xxhash(self):
+        """Test cache keys fall back to a 128-bit blake2b digest when xxhash is missing"""
+        from unittest.mock import patch
+        from src.quality import document_type_quality_checker as module
+        
+        with patch.object(module, "xxhash", None):
+            digest = module._content_digest("# Doc")
+            assert len(digest) == 16
+            assert digest == module._content_digest("# Doc")
+            assert digest != module._content_digest("# Doc changed")
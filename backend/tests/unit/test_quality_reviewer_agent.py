@@ -2,6 +2,8 @@
 Unit Tests: QualityReviewerAgent
 Fast, isolated tests for quality reviewer agent
 """
+import os
+
 import pytest
 from src.agents.quality_reviewer_agent import QualityReviewerAgent
 
@@ -56,4 +58,190 @@ class TestQualityReviewerAgent:
         
         assert file_path is not None
         assert file_manager.file_exists("review.md")
-
+    
+    def test_generate_reuses_cached_review(self, mock_llm_provider, file_manager):
+        """Test repeated reviews of identical documentation skip the LLM call"""
+        from unittest.mock import patch
+        
+        agent = QualityReviewerAgent(
+            llm_provider=mock_llm_provider,
+            file_manager=file_manager
+        )
+        
+        all_docs = {"requirements.md": "# Project Overview\n\nThis is a test project."}
+        
+        with patch.object(agent, "_call_llm", return_value="# Review") as call_llm:
+            assert agent.generate(all_docs) == "# Review"
+            assert agent.generate(dict(all_docs)) == "# Review"
+            assert call_llm.call_count == 1
+            
+            agent.generate({"requirements.md": "# Changed"})
+            assert call_llm.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_async_structured_feedback_awaits_llm(self, mock_llm_provider, file_manager, monkeypatch):
+        """Test async structured feedback uses the async LLM path without a worker thread"""
+        from unittest.mock import AsyncMock, patch
+        
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        agent = QualityReviewerAgent(
+            llm_provider=mock_llm_provider,
+            file_manager=file_manager
+        )
+        agent.provider_name, agent.model_name = "mock", "mock-model"
+        response = '```json\n{"score": 8.5, "feedback": "Solid", "suggestion": "Add examples"}\n```'
+        
+        with patch.object(agent, "_async_call_llm", AsyncMock(return_value=response)) as async_call, \
+                patch.object(agent, "_call_llm", side_effect=AssertionError("sync LLM call")):
+            feedback = await agent.async_generate_structured_feedback("# Doc", "requirements")
+        
+        assert async_call.await_count == 1
+        assert feedback["score"] == 8.5
+        assert feedback == agent._parse_structured_feedback(response)
+    
+    def test_parse_structured_feedback_fallback_fields(self, mock_llm_provider, file_manager):
+        """Test score and suggestion are recovered from a response that is not valid JSON"""
+        agent = QualityReviewerAgent(
+            llm_provider=mock_llm_provider,
+            file_manager=file_manager
+        )
+        response = 'Review: {"score": 6.5, "suggestion": "Add a risks section", "feedback": unquoted}'
+        
+        feedback = agent._parse_structured_feedback(response)
+        
+        assert feedback["score"] == 6.5
+        assert feedback["suggestion"] == "Add a risks section"
+    
+    @pytest.mark.asyncio
+    async def test_structured_feedback_served_from_response_cache(self, mock_llm_provider, file_manager, monkeypatch):
+        """Test reviewing an unchanged document again does not call the LLM"""
+        from unittest.mock import AsyncMock, patch
+        
+        monkeypatch.delenv("AUTO_REPO_NO_CACHE", raising=False)
+        store = {}
+        fake_cache = type("FakeCache", (), {
+            "get": lambda self, key: store.get(key),
+            "set": lambda self, key, value, model=None: store.__setitem__(key, value),
+        })()
+        agent = QualityReviewerAgent(
+            llm_provider=mock_llm_provider,
+            file_manager=file_manager
+        )
+        agent.provider_name, agent.model_name = "mock", "mock-model"
+        response = '{"score": 7.0, "feedback": "Fine", "suggestion": "None"}'
+        
+        with patch("src.agents.base_agent.get_llm_cache", return_value=fake_cache), \
+                patch.object(agent, "_async_call_llm", AsyncMock(return_value=response)) as async_call:
+            first = await agent.async_generate_structured_feedback("# Doc", "requirements")
+            second = await agent.async_generate_structured_feedback("# Doc", "requirements")
+        
+        assert async_call.await_count == 1
+        assert first == second
+    
+    @pytest.mark.asyncio
+    async def test_structured_feedback_semantic_cache_scoped_by_type(self, mock_llm_provider, file_manager, monkeypatch):
+        """Test near-duplicate documents reuse feedback only within the same document type"""
+        from unittest.mock import AsyncMock, patch
+        
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        
+        class FakeSemanticCache:
+            """Treats texts sharing their first line as near duplicates"""
+            def __init__(self, path, **kwargs):
+                self.path = path
+                self.entries = {}
+            
+            def lookup(self, text, threshold):
+                return self.entries.get(text.splitlines()[0])
+            
+            def add(self, text, document):
+                self.entries[text.splitlines()[0]] = document
+        
+        monkeypatch.setattr("src.agents.quality_reviewer_agent.SemanticCache", FakeSemanticCache)
+        agent = QualityReviewerAgent(
+            llm_provider=mock_llm_provider,
+            file_manager=file_manager,
+            semantic_cache=True
+        )
+        agent.provider_name, agent.model_name = "mock", "mock-model"
+        response = '{"score": 7.0, "feedback": "Fine", "suggestion": "None"}'
+        
+        with patch.object(agent, "_async_call_llm", AsyncMock(return_value=response)) as async_call:
+            first = await agent.async_generate_structured_feedback("# Doc\nDraft one", "Test Plan")
+            second = await agent.async_generate_structured_feedback("# Doc\nDraft two", "Test Plan")
+            assert async_call.await_count == 1
+            await agent.async_generate_structured_feedback("# Doc\nDraft one", "wbs")
+            assert async_call.await_count == 2
+        
+        assert first == second
+        assert agent._feedback_semantic_caches["Test Plan"].path.endswith(
+            os.path.join(".cache", "auto-repo-agents", "review", "test_plan.sqlite")
+        )
+    
+    @pytest.mark.asyncio
+    async def test_structured_feedback_semantic_hit_requires_same_tail_and_scores(
+        self, mock_llm_provider, file_manager, monkeypatch
+    ):
+        """Test a near-duplicate prefix is not enough when the content tail or automated scores differ"""
+        from unittest.mock import AsyncMock, patch
+        
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        
+        class FakeSemanticCache:
+            """Treats every text as a near duplicate of the last one stored"""
+            def __init__(self, path, **kwargs):
+                self.document = None
+            
+            def lookup(self, text, threshold):
+                return self.document
+            
+            def add(self, text, document):
+                self.document = document
+        
+        monkeypatch.setattr("src.agents.quality_reviewer_agent.SemanticCache", FakeSemanticCache)
+        agent = QualityReviewerAgent(
+            llm_provider=mock_llm_provider,
+            file_manager=file_manager,
+            semantic_cache=True
+        )
+        agent.provider_name, agent.model_name = "mock", "mock-model"
+        prefix = "# Doc\n" + "x" * agent.FEEDBACK_SEMANTIC_PREFIX_CHARS
+        response = '{"score": 7.0, "feedback": "Fine", "suggestion": "None"}'
+        
+        with patch.object(agent, "_async_call_llm", AsyncMock(return_value=response)) as async_call:
+            await agent.async_generate_structured_feedback(prefix + "tail one", "wbs", {"overall_score": 80})
+            await agent.async_generate_structured_feedback(prefix + "tail one", "wbs", {"overall_score": 80})
+            assert async_call.await_count == 1
+            await agent.async_generate_structured_feedback(prefix + "tail two", "wbs", {"overall_score": 80})
+            assert async_call.await_count == 2
+            await agent.async_generate_structured_feedback(prefix + "tail two", "wbs", {"overall_score": 40})
+            assert async_call.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_feedback_shares_one_llm_call(self, mock_llm_provider, file_manager, monkeypatch):
+        """Test identical reviews requested at the same time make a single LLM call"""
+        import asyncio
+        from unittest.mock import patch
+        
+        monkeypatch.setenv("AUTO_REPO_NO_CACHE", "1")
+        agent = QualityReviewerAgent(
+            llm_provider=mock_llm_provider,
+            file_manager=file_manager
+        )
+        agent.provider_name, agent.model_name = "mock", "mock-model"
+        calls = []
+        
+        async def slow_llm(prompt, **kwargs):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return '{"score": 8.0, "feedback": "Good", "suggestion": "None"}'
+        
+        with patch.object(agent, "_async_call_llm", side_effect=slow_llm):
+            first, second = await asyncio.gather(
+                agent.async_generate_structured_feedback("# Doc", "requirements"),
+                agent.async_generate_structured_feedback("# Doc", "requirements"),
+            )
+        
+        assert len(calls) == 1
+        assert first == second
+        assert not QualityReviewerAgent._inflight_llm_calls
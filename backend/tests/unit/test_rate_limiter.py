@@ -5,7 +5,7 @@ Fast, isolated tests for rate limiting
 import pytest
 import time
 from unittest.mock import Mock
-from src.rate_limit.queue_manager import RequestQueue
+from src.rate_limit.queue_manager import RequestQueue, TokenBucket, get_token_bucket
 
 
 @pytest.mark.unit
@@ -92,3 +92,98 @@ class TestRequestQueue:
         assert stats["max_rate"] == int(1000 * 0.9)  # 900
         assert stats["original_max_rate"] == 1000
 
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test TokenBucket class"""
+    
+    def test_acquire_within_capacity(self):
+        """Test requests within capacity do not wait"""
+        bucket = TokenBucket(rpm=60, tpm=1000)
+        
+        start = time.monotonic()
+        bucket.acquire(estimated_tokens=100)
+        bucket.acquire(estimated_tokens=100)
+        
+        assert time.monotonic() - start < 0.1
+    
+    def test_reserve_reports_wait_when_exhausted(self):
+        """Test an exhausted token bucket reports a wait time"""
+        bucket = TokenBucket(rpm=60, tpm=600)
+        
+        assert bucket._reserve(600) == 0.0
+        assert bucket._reserve(60) > 0
+    
+    def test_penalize_shrinks_limits(self):
+        """Test rate limit responses shrink the bucket"""
+        bucket = TokenBucket(rpm=100, tpm=1000)
+        bucket.penalize()
+        
+        assert bucket.rpm == pytest.approx(80)
+        assert bucket.tpm == pytest.approx(800)
+    
+    def test_penalized_bucket_recovers(self, monkeypatch):
+        """Test repeated penalties stop at the floor and the limits recover over time"""
+        from src.rate_limit import queue_manager
+        
+        now = [1000.0]
+        monkeypatch.setattr(queue_manager.time, "monotonic", lambda: now[0])
+        bucket = TokenBucket(rpm=100, tpm=1000)
+        for _ in range(20):
+            bucket.penalize()
+        
+        assert bucket.rpm == pytest.approx(100 * TokenBucket.MIN_RATE_FRACTION)
+        
+        now[0] += TokenBucket.RECOVERY_SECONDS / 2
+        bucket._reserve(0)
+        assert 25 < bucket.rpm < 100
+        
+        now[0] += TokenBucket.RECOVERY_SECONDS
+        bucket._reserve(0)
+        assert (bucket.rpm, bucket.tpm) == (100, 1000)
+    
+    def test_get_token_bucket_unknown_model(self):
+        """Test no bucket is created for models without known limits"""
+        assert get_token_bucket("openai", "unknown-model") is None
+        assert get_token_bucket("openai", "gpt-4o") is get_token_bucket("openai", "gpt-4o")
+
+
+@pytest.mark.unit
+class TestProviderSemaphore:
+    """Test per-provider in-flight request caps"""
+    
+    @pytest.mark.asyncio
+    async def test_semaphore_shared_per_provider(self):
+        """Test agents of one provider share a semaphore and other providers get their own"""
+        from src.rate_limit.queue_manager import get_provider_semaphore
+        
+        gemini = get_provider_semaphore("gemini", 2)
+        
+        assert get_provider_semaphore("gemini", 5) is gemini
+        assert get_provider_semaphore("ollama", 2) is not gemini
+        async with gemini:
+            async with gemini:
+                assert gemini.locked()
+    
+    def test_semaphore_not_shared_across_loops(self):
+        """Test each event loop gets its own semaphore"""
+        import asyncio
+        from src.rate_limit.queue_manager import get_provider_semaphore
+        
+        async def lookup():
+            return get_provider_semaphore("gemini", 2)
+        
+        assert asyncio.run(lookup()) is not asyncio.run(lookup())
+    
+    def test_provider_limits_from_settings(self, monkeypatch):
+        """Test per-provider caps default to MAX_CONCURRENT_AGENTS and can be overridden"""
+        from src.config.settings import get_settings
+        
+        monkeypatch.setenv("MAX_CONCURRENT_AGENTS", "6")
+        monkeypatch.setenv("OLLAMA_MAX_CONCURRENT", "1")
+        monkeypatch.delenv("GEMINI_MAX_CONCURRENT", raising=False)
+        settings = get_settings()
+        
+        assert settings.ollama_max_concurrent == 1
+        assert settings.gemini_max_concurrent == 6
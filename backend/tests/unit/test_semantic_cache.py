@@ -0,0 +1,92 @@
+"""
+Unit Tests: SemanticCache
+Fast, isolated tests for semantic cache prompt canonicalization
+"""
+import pytest
+from src.utils.semantic_cache import SemanticCache, canonicalize, semantic_cache_path
+
+
+@pytest.mark.unit
+class TestSemanticCache:
+    """Test semantic cache helpers"""
+    
+    def test_canonicalize_strips_filler(self):
+        """Test filler phrases and casing do not affect the canonical form"""
+        assert canonicalize("Please build a TODO app") == "build a todo app"
+        assert canonicalize("Can you   build a todo app") == "build a todo app"
+    
+    def test_canonicalize_keeps_content_words(self):
+        """Test words inside other words are not stripped"""
+        assert canonicalize("A pleased customer tracker") == "a pleased customer tracker"
+
+    def test_cache_paths_follow_settings(self, temp_dir, monkeypatch):
+        """Test caches live under the user cache directory unless SEMANTIC_CACHE_DIR overrides it"""
+        import os
+
+        monkeypatch.delenv("SEMANTIC_CACHE_DIR", raising=False)
+        default = os.path.expanduser(os.path.join("~", ".cache", "auto-repo-agents", "semantic", "wbs.sqlite"))
+        assert semantic_cache_path("wbs") == default
+
+        monkeypatch.setenv("SEMANTIC_CACHE_DIR", str(temp_dir))
+        assert semantic_cache_path("wbs") == str(temp_dir / "wbs.sqlite")
+        assert str(SemanticCache().path) == str(temp_dir / "ideas.sqlite")
+
+    @pytest.fixture
+    def make_cache(self, temp_dir, monkeypatch):
+        """Create a cache whose embeddings are fixed vectors keyed by text"""
+        np = pytest.importorskip("numpy")
+        vectors = {
+            "todo app": [1.0, 0.0],
+            "todo application": [0.99, 0.141],
+            "chess engine": [0.0, 1.0],
+        }
+
+        def _make(**kwargs):
+            cache = SemanticCache(path=str(temp_dir / "semcache.sqlite"), **kwargs)
+            monkeypatch.setattr(
+                cache, "_embed", lambda text: np.asarray([vectors[text]], dtype=np.float32)
+            )
+            return cache
+        return _make
+
+    def test_lookup_near_duplicate(self, make_cache):
+        """Test a similar idea above the threshold returns the stored document"""
+        cache = make_cache()
+        cache.add("todo app", "# Todo")
+
+        assert cache.lookup("todo application", threshold=0.95) == "# Todo"
+        assert cache.lookup("chess engine", threshold=0.95) is None
+
+    def test_max_entries_evicts_least_recently_used(self, make_cache):
+        """Test the least recently used entry is evicted when the cache is full"""
+        cache = make_cache(max_entries=1)
+        cache.add("todo app", "# Todo")
+        cache.add("chess engine", "# Chess")
+
+        assert cache.lookup("todo app", threshold=0.95) is None
+        assert cache.lookup("chess engine", threshold=0.95) == "# Chess"
+
+    def test_expired_entries_are_ignored(self, make_cache):
+        """Test entries older than the TTL are not returned"""
+        cache = make_cache(ttl=-1)
+        cache.add("todo app", "# Todo")
+
+        assert cache.lookup("todo app", threshold=0.95) is None
+
+    def test_add_after_miss_reuses_embedding(self, make_cache):
+        """Test storing the document for a missed lookup does not embed the text again"""
+        cache = make_cache()
+        embed = cache._embed
+        calls = []
+
+        def counting_embed(text):
+            calls.append(text)
+            return embed(text)
+
+        cache._embed = counting_embed
+
+        assert cache.lookup("todo app", threshold=0.95) is None
+        cache.add("todo app", "# Todo")
+
+        assert calls == ["todo app"]
+        assert cache.lookup("todo application", threshold=0.95) == "# Todo"
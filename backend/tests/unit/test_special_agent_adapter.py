@@ -0,0 +1,55 @@
+"""
+Unit Tests: SpecialAgentAdapter
+Fast, isolated tests for adapting special agents to the coordinator interface
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from src.agents import special_agent_adapter
+from src.agents.special_agent_adapter import SpecialAgentAdapter
+
+
+class DependencyAwareAgent:
+    async_generate = AsyncMock(return_value="# Roadmap")
+
+    def generate(self, user_idea, requirements_summary=None, dependency_documents=None):
+        raise AssertionError("adapter should await async_generate")
+
+
+class IdeaOnlyAgent:
+    async_generate = AsyncMock(return_value="# Plan")
+
+    def generate(self, user_idea):
+        raise AssertionError("adapter should await async_generate")
+
+
+@pytest.mark.unit
+class TestAsyncGenerate:
+    """Test SpecialAgentAdapter.async_generate dispatch"""
+
+    @pytest.mark.asyncio
+    async def test_signature_inspected_once_per_class(self, monkeypatch):
+        """Test the generate signature is read once per agent class and drives the call shape"""
+        special_agent_adapter._accepts_dependency_documents.cache_clear()
+        signature = MagicMock(wraps=special_agent_adapter.inspect.signature)
+        monkeypatch.setattr(special_agent_adapter.inspect, "signature", signature)
+        dependencies = {"project_charter": {"content": "Charter"}}
+
+        for _ in range(2):
+            adapter = SpecialAgentAdapter(DependencyAwareAgent(), MagicMock(), "docs")
+            assert await adapter.async_generate("idea", dependencies) == "# Roadmap"
+            adapter = SpecialAgentAdapter(IdeaOnlyAgent(), MagicMock(), "docs")
+            assert await adapter.async_generate("idea", dependencies) == "# Plan"
+
+        assert signature.call_count == 2
+        kwargs = DependencyAwareAgent.async_generate.await_args.kwargs
+        assert kwargs["project_charter_summary"] == "Charter"
+        assert kwargs["dependency_documents"] is dependencies
+        IdeaOnlyAgent.async_generate.assert_awaited_with("idea")
+
+    @pytest.mark.asyncio
+    async def test_agent_without_generate(self):
+        """Test agents lacking generate are rejected"""
+        adapter = SpecialAgentAdapter(object(), MagicMock(), "docs")
+        with pytest.raises(NotImplementedError):
+            await adapter.async_generate("idea", {})
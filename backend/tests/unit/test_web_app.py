@@ -211,3 +211,33 @@ class TestWebApp:
             }
         )
         assert response.status_code == 422
+
+
+@pytest.mark.unit
+class TestDocumentContentReads:
+    """Test agent-output reads behind the document endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_read_document_contents(self):
+        """Test contents are read per document, by agent type or by document type"""
+        from unittest.mock import MagicMock
+        from src.web.routers.projects import _read_document_contents
+
+        cm = MagicMock()
+        cm.get_agent_output.return_value = MagicMock(content="# Charter")
+        cm.get_document_content_by_type.side_effect = lambda project_id, doc_id: f"# {doc_id}"
+
+        contents = await _read_document_contents(cm, "project_1", ["project_charter", "custom_doc"])
+
+        assert contents == {"project_charter": "# Charter", "custom_doc": "# custom_doc"}
+        cm.get_document_content_by_type.assert_called_once_with("project_1", "custom_doc")
+
+    def test_new_project_id_format(self):
+        """Test project IDs keep the project_<date>_<time>_<8 hex> shape and are unique"""
+        import re
+        from src.web.routers.projects import _new_project_id
+
+        first, second = _new_project_id(), _new_project_id()
+
+        assert re.fullmatch(r"project_\d{8}_\d{6}_[0-9a-f]{8}", first)
+        assert first != second